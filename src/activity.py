@@ -0,0 +1,148 @@
+"""
+Активність користувачів у часі: кількість RSVP у довільному вікні.
+
+RSVP міста (RsvpIndex) один раз сортуються за (користувач, час) і
+розкладаються по сітці меж `origin + k · step` (за замовчуванням — межі
+partition-ів: 2010-01-01 + k · TRAIN_INTERVAL).  Комірки сітки — проміжки
+між межами і самі межі (вікна закриті, [start, end]: подія рівно на межі
+належить обом сусіднім вікнам), тож матриця [members × комірки] int32
+зберігається одразу як префіксні суми `cum`, і вікно з межами на сітці —
+різниця двох стовпців для всіх користувачів разом.  Для інших меж (sweep
+з іншим interval) — `searchsorted` по ключах (користувач, час), як у
+PopularityIndex.
+
+Індекс будується в `main.load_repo` (repo["activity"]) і замінює окремі
+проходи по історіях: вибір top-користувачів вікна, фільтр «має історію у
+train», страти --approx і кількості позитивів тестових користувачів.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+from .partition import TRAIN_INTERVAL
+from .preprocessing import RsvpIndex
+from .records import EventTable
+
+# 2010-01-01 — перший timestamp partition-ів у main / scripts.script
+GRID_ORIGIN = 1_262_304_000
+_TIME_BITS = 32
+
+
+class ActivityIndex:
+    """Префіксні суми RSVP по сітці + відсортовані ключі (користувач, час)."""
+
+    def __init__(
+        self,
+        member_ids: List[str],
+        edges: np.ndarray,
+        cum: np.ndarray,
+        keys: np.ndarray,
+        t0: int,
+    ) -> None:
+        self.member_ids = member_ids
+        self.member_index = {m_id: row for row, m_id in enumerate(member_ids)}
+        self.edges = edges
+        # members × (2·len(edges) + 2): cum[:, c] — RSVP у комірках < c
+        self.cum = cum
+        self.keys = keys
+        self.t0 = t0
+
+    @classmethod
+    def build(
+        cls,
+        rsvps: RsvpIndex,
+        events_info: EventTable,
+        step: int = TRAIN_INTERVAL,
+        origin: int = GRID_ORIGIN,
+    ) -> "ActivityIndex":
+        """RSVP подій, яких нема в events_info, не враховуються."""
+        index = events_info.index
+        event_time = np.fromiter(
+            (events_info.time[index[e_id]] if e_id in index else -1 for e_id in rsvps.event_ids),
+            dtype=np.int64,
+            count=len(rsvps.event_ids),
+        )
+        n_members = len(rsvps.member_ids)
+        members = np.repeat(np.arange(n_members, dtype=np.int64), np.diff(rsvps.member_ptr))
+        times = event_time[rsvps.member_events]
+        known = times >= 0
+        members, times = members[known], times[known]
+
+        if len(times):
+            t0 = int(times.min())
+            first = (t0 - origin) // step
+            last = -(-(int(times.max()) - origin) // step)
+            edges = origin + step * np.arange(first, last + 1, dtype=np.int64)
+        else:
+            t0, edges = 0, np.empty(0, dtype=np.int64)
+
+        # комірка 2k — (edges[k-1], edges[k]), 2k + 1 — рівно edges[k]
+        k = np.searchsorted(edges, times, side="left")
+        on_edge = edges[np.minimum(k, len(edges) - 1)] == times
+        n_cells = 2 * len(edges) + 1
+        counts = np.bincount(members * n_cells + 2 * k + on_edge, minlength=n_members * n_cells)
+        cum = np.zeros((n_members, n_cells + 1), dtype=np.int32)
+        np.cumsum(counts.reshape(n_members, n_cells), axis=1, out=cum[:, 1:])
+
+        keys = np.sort((members << _TIME_BITS) | (times - t0))
+        return cls(list(rsvps.member_ids), edges, cum, keys, t0)
+
+    # ------------------------------------------------------------------ #
+    def rows(self, member_ids: Iterable[str]) -> np.ndarray:
+        """Рядки індексу; -1 для користувачів без RSVP."""
+        return np.fromiter((self.member_index.get(m_id, -1) for m_id in member_ids), dtype=np.int64)
+
+    def _edge(self, ts: int) -> int:
+        pos = int(np.searchsorted(self.edges, ts))
+        return pos if pos < len(self.edges) and self.edges[pos] == ts else -1
+
+    def counts(self, start: int, end: int, rows: np.ndarray | None = None) -> np.ndarray:
+        """
+        RSVP з часом у [start, end] для `rows` (усіх користувачів, якщо None);
+        рядок -1 → 0.
+        """
+        all_rows = rows is None
+        if all_rows:
+            rows = np.arange(len(self.member_ids))
+        known = rows >= 0
+        out = np.zeros(len(rows), dtype=np.int32)
+        if end < start or not known.any():
+            return out
+
+        lo, hi = self._edge(start), self._edge(end)
+        if lo >= 0 and hi >= 0:
+            cum = self.cum if all_rows else self.cum[rows[known]]
+            out[known] = cum[:, 2 * hi + 2] - cum[:, 2 * lo + 1]
+            return out
+
+        if end < self.t0:
+            return out
+        limit = (1 << _TIME_BITS) - 1
+        prefix = rows[known] << _TIME_BITS
+        left = np.searchsorted(self.keys, prefix | np.clip(start - self.t0, 0, limit), "left")
+        right = np.searchsorted(self.keys, prefix | np.clip(end - self.t0, 0, limit), "right")
+        out[known] = right - left
+        return out
+
+    def top(self, start: int, end: int, k: int) -> List[str]:
+        """k найактивніших у [start, end]; рівні — у порядку рядків індексу."""
+        order = np.argsort(-self.counts(start, end), kind="stable")[:k]
+        return [self.member_ids[row] for row in order.tolist()]
+
+    def with_history(self, member_ids: List[str], start: int, end: int) -> List[str]:
+        """Ті з member_ids (у тому ж порядку), що мають RSVP у [start, end]."""
+        active = self.counts(start, end, self.rows(member_ids)) > 0
+        return [m_id for m_id, ok in zip(member_ids, active.tolist()) if ok]
+
+    def active(self, start: int, end: int) -> Tuple[List[str], np.ndarray]:
+        """(усі користувачі з RSVP у [start, end] у порядку індексу, їхні лічильники)."""
+        counts = self.counts(start, end)
+        rows = np.flatnonzero(counts)
+        return [self.member_ids[row] for row in rows.tolist()], counts[rows]
+
+    @property
+    def nbytes(self) -> int:
+        return self.cum.nbytes + self.keys.nbytes + self.edges.nbytes
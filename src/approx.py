@@ -0,0 +1,179 @@
+"""
+Наближене оцінювання (`main --approx`): вибірки замість повних сіток.
+
+• Користувачі — стратифікована вибірка з усіх, хто має історію у train:
+  страти за квантилями активності (кількість train-RSVP з
+  ActivityIndex), розподіл пропорційний розміру страти (≥ 1 на страту);
+  вага користувача — N_h / n_h.  Порядок перемішаний, тож 80/20-розбиття LearningToRank
+  випадкове, а не «найактивніші в train».
+• Події — усі, що мають позитив серед вибраних користувачів, плюс частка
+  `event_fraction` решти; вага стовпця негативу — 1 / event_fraction, тож
+  FP оцінюються без зсуву, а TP / FN не змінюються (усі позитиви на місці).
+• Метрики — зважені лічильники TP / FP / FN по тестових користувачах,
+  обʼєднані по partition-ах; довірчі інтервали — percentile bootstrap по
+  користувачах.  Після кожної partition можна перевірити `converged` і
+  зупинитися, щойно інтервали F1 вужчі за заданий поріг.
+
+Вибірка детермінована для (seed, ts): повторний запуск з тим самим seed
+бере ті самі матриці з кешу score-ів.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Set, Tuple
+
+import numpy as np
+
+METRICS = ("precision", "recall", "f1")
+_LABELS = {"precision": "Precision", "recall": "Recall", "f1": "F1"}
+
+
+# ──────────────────────────────────────────────────────────────
+# 1. Вибірки
+# ──────────────────────────────────────────────────────────────
+class ApproxSampler:
+    def __init__(
+        self,
+        n_members: int = 300,
+        event_fraction: float = 0.25,
+        n_strata: int = 4,
+        seed: int = 0,
+    ) -> None:
+        self.n_members = n_members
+        self.event_fraction = event_fraction
+        self.n_strata = n_strata
+        self.seed = seed
+
+    def _rng(self, ts: int, stage: int) -> np.random.Generator:
+        return np.random.default_rng((self.seed, ts, stage))
+
+    def members(
+        self, ids: List[str], activity: np.ndarray, ts: int
+    ) -> Tuple[List[str], np.ndarray]:
+        """
+        (перемішані користувачі вибірки, їхні ваги N_h / n_h); `activity` —
+        кількість train-RSVP кожного з `ids` (ActivityIndex.active).
+        """
+        if len(ids) <= self.n_members:
+            order = self._rng(ts, 0).permutation(len(ids))
+            return [ids[i] for i in order], np.ones(len(ids))
+
+        edges = np.unique(
+            np.quantile(activity, np.linspace(0, 1, self.n_strata + 1)[1:-1])
+        )
+        strata = np.searchsorted(edges, activity, side="right")
+        sizes = np.bincount(strata)
+        quota = np.maximum(1, np.round(sizes / len(ids) * self.n_members)).astype(np.int64)
+        quota = np.minimum(quota, sizes)
+
+        rng = self._rng(ts, 0)
+        picked, weights = [], []
+        for stratum, (size, n) in enumerate(zip(sizes, quota)):
+            if not n:
+                continue
+            rows = rng.choice(np.flatnonzero(strata == stratum), size=n, replace=False)
+            picked.append(rows)
+            weights.append(np.full(n, size / n))
+        picked_rows = np.concatenate(picked)
+        order = rng.permutation(len(picked_rows))
+        return [ids[i] for i in picked_rows[order]], np.concatenate(weights)[order]
+
+    def events(
+        self, events: List[str], positives: Set[str], ts: int
+    ) -> Tuple[List[str], np.ndarray]:
+        """(події вибірки в початковому порядку, ваги стовпців)."""
+        is_positive = np.fromiter((e in positives for e in events), dtype=bool, count=len(events))
+        keep = is_positive | (self._rng(ts, 1).random(len(events)) < self.event_fraction)
+        rows = np.flatnonzero(keep)
+        weights = np.where(is_positive[rows], 1.0, 1.0 / self.event_fraction)
+        return [events[i] for i in rows], weights
+
+
+# ──────────────────────────────────────────────────────────────
+# 2. Лічильники і bootstrap
+# ──────────────────────────────────────────────────────────────
+def member_counts(
+    members: List[str],
+    events: List[str],
+    rsvp: Dict[str, List[str]],
+    y_pred: np.ndarray,
+    event_weights: np.ndarray,
+    n_positive: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Зважені (TP, FP, FN) на користувача: [members × 3]; `y_pred` — рядки
+    «користувач, подія», як X у LearningToRank.  `n_positive` — кількість
+    RSVP користувача серед `events` (якщо відома, напр. з ActivityIndex;
+    інакше рахується з міток).
+    """
+    event_pos = {e_id: col for col, e_id in enumerate(events)}
+    y_true = np.zeros((len(members), len(events)), dtype=bool)
+    for row, member_id in enumerate(members):
+        cols = [event_pos[e_id] for e_id in rsvp.get(member_id, ()) if e_id in event_pos]
+        y_true[row, cols] = True
+
+    y_pred = y_pred.reshape(len(members), len(events)) == 1
+    tp = (y_pred & y_true).sum(axis=1)
+    if n_positive is None:
+        n_positive = y_true.sum(axis=1)
+    return np.column_stack(
+        (tp, (y_pred & ~y_true) @ event_weights, n_positive - tp)
+    ).astype(np.float64)
+
+
+def _metrics(totals: np.ndarray) -> np.ndarray:
+    """totals [..., 3] (TP, FP, FN) → [..., 3] (precision, recall, f1)."""
+    tp, fp, fn = totals[..., 0], totals[..., 1], totals[..., 2]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pr = np.where(tp + fp > 0, tp / (tp + fp), 0.0)
+        rc = np.where(tp + fn > 0, tp / (tp + fn), 0.0)
+        f1 = np.where(pr + rc > 0, 2 * pr * rc / (pr + rc), 0.0)
+    return np.stack((pr, rc, f1), axis=-1)
+
+
+class BootstrapEstimator:
+    """Обʼєднує лічильники користувачів по partition-ах; CI — percentile bootstrap."""
+
+    def __init__(self, n_boot: int = 200, alpha: float = 0.05, seed: int = 0) -> None:
+        self.n_boot = n_boot
+        self.alpha = alpha
+        self.seed = seed
+        self._counts: Dict[str, List[np.ndarray]] = {}
+
+    def add(self, algo: str, counts: np.ndarray, weights: np.ndarray) -> None:
+        """counts — member_counts(...), weights — ваги страт тих самих користувачів."""
+        self._counts.setdefault(algo, []).append(counts * weights[:, None])
+
+    def intervals(self) -> Dict[str, Dict[str, Tuple[float, float, float]]]:
+        """{algo: {metric: (оцінка, нижня межа, верхня межа)}}."""
+        rng = np.random.default_rng(self.seed)
+        out = {}
+        for algo, parts in self._counts.items():
+            counts = np.concatenate(parts)
+            point = _metrics(counts.sum(axis=0))
+            resample = rng.multinomial(len(counts), np.full(len(counts), 1 / len(counts)), self.n_boot)
+            boot = _metrics(resample @ counts)                     # [n_boot × 3]
+            lo, hi = np.quantile(boot, (self.alpha / 2, 1 - self.alpha / 2), axis=0)
+            out[algo] = {
+                metric: (float(point[i]), float(lo[i]), float(hi[i]))
+                for i, metric in enumerate(METRICS)
+            }
+        return out
+
+    def converged(self, width: float, metrics: Iterable[str] = ("f1",)) -> bool:
+        intervals = self.intervals()
+        return bool(intervals) and all(
+            bounds[metric][2] - bounds[metric][1] <= width
+            for bounds in intervals.values()
+            for metric in metrics
+        )
+
+    def report(self) -> List[str]:
+        return [
+            f"{algo:<12} ≈  "
+            + "  ".join(
+                f"{_LABELS[metric]} {pt:.3f} [{lo:.3f}, {hi:.3f}]"
+                for metric, (pt, lo, hi) in bounds.items()
+            )
+            for algo, bounds in self.intervals().items()
+        ]
@@ -0,0 +1,74 @@
+"""
+Блоковий рушій оцінювання members × candidate-events.
+
+Замість повного декартового добутку (усі користувачі × усі події) сітка
+обходиться блоками `member_block × event_block`: кожен рекомендер рахує
+лише свій блок, з блоків одразу збирається (X, y), яке споживач передає
+в метрики або у `partial_fit`, після чого блок звільняється.  Пікова
+памʼять визначається розміром блоку, а не розміром сітки.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+# (members, events) → float32 [len(members) × len(events)]
+BlockScorer = Callable[[List[str], List[str]], np.ndarray]
+
+
+class BlockEngine:
+    """Обхід сітки блоками для набору навчених рекомендерів."""
+
+    def __init__(
+        self,
+        scorers: Dict[str, BlockScorer],
+        member_block: int = 256,
+        event_block: int = 2048,
+    ) -> None:
+        self.scorers = scorers
+        self.member_block = member_block
+        self.event_block = event_block
+
+    @property
+    def feature_names(self) -> List[str]:
+        return list(self.scorers)
+
+    def blocks(
+        self,
+        members: List[str],
+        events: List[str],
+        rsvp: Dict[str, Iterable[str]],
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Генерує (X, y) по блоках: X — float32 [n_members_blk·n_events_blk × F],
+        y — int8 мітки (1 — користувач відвідав подію).  Рядки впорядковані
+        «користувач, потім подія», як у `LearningToRank._build_matrix`.
+
+        Зовнішній цикл — по блоках подій, тож рекомендери можуть
+        перевикористати підготовлений блок подій (напр. TF-IDF) для всіх
+        блоків користувачів.
+        """
+        for e_start in range(0, len(events), self.event_block):
+            event_blk = events[e_start:e_start + self.event_block]
+            event_pos = {e_id: col for col, e_id in enumerate(event_blk)}
+
+            for m_start in range(0, len(members), self.member_block):
+                member_blk = members[m_start:m_start + self.member_block]
+
+                X = np.empty(
+                    (len(member_blk) * len(event_blk), len(self.scorers)),
+                    dtype=np.float32,
+                )
+                for col, scorer in enumerate(self.scorers.values()):
+                    X[:, col] = scorer(member_blk, event_blk).ravel()
+
+                y = np.zeros((len(member_blk), len(event_blk)), dtype=np.int8)
+                for row, member_id in enumerate(member_blk):
+                    for e_id in rsvp.get(member_id, ()):
+                        col = event_pos.get(e_id)
+                        if col is not None:
+                            y[row, col] = 1
+
+                yield X, y.ravel()
@@ -0,0 +1,136 @@
+"""
+Дисковий кеш матриць sim-score базових рекомендерів.
+
+Для кожної partition і кожного рекомендера зберігається float32-матриця
+[members × candidate-events] у форматі .npz.  Ключ = місто, межі вікна,
+клас рекомендера, його гіперпараметри та «відбиток» вхідних json-файлів,
+тож зміна даних або налаштувань автоматично дає промах.
+
+Кеш обмежений за розміром: найдавніше використані файли видаляються (LRU
+за mtime).  Лічильники hit / miss доступні через `stats()`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+
+
+# ──────────────────────────────────────────────────────────────
+# 1. Ключі та відбитки
+# ──────────────────────────────────────────────────────────────
+def fingerprint_files(paths: Iterable[Path]) -> str:
+    """Дешевий відбиток вхідних даних: імʼя, розмір і mtime кожного файлу."""
+    digest = hashlib.sha1()
+    for path in sorted(Path(p) for p in paths):
+        try:
+            st = path.stat()
+            digest.update(f"{path.name}:{st.st_size}:{st.st_mtime_ns};".encode())
+        except FileNotFoundError:
+            digest.update(f"{path.name}:missing;".encode())
+    return digest.hexdigest()
+
+
+def make_key(
+    city: str,
+    win_start: int,
+    win_end: int,
+    recommender: str,
+    params: Dict[str, Any],
+    fingerprint: str,
+    sample: Any = None,
+) -> str:
+    """
+    Стабільний ключ кешу (sha1 від канонічного json).  `sample` — параметри
+    вибірки --approx (користувачі й події вибірки відрізняються від
+    точного запуску); None — точний запуск, ключ як і раніше.
+    """
+    parts = [city, win_start, win_end, recommender, params, fingerprint]
+    if sample is not None:
+        parts.append({"sample": sample})
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+# ──────────────────────────────────────────────────────────────
+# 2. Сам кеш
+# ──────────────────────────────────────────────────────────────
+class ScoreCache:
+    """Обмежений за розміром LRU-кеш .npz-файлів."""
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 2 * 1024**3) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npz"
+
+    # ------------------------------------------------------------------ #
+    def get(
+        self, key: str, members: List[str], events: List[str]
+    ) -> np.ndarray | None:
+        """
+        Повертає матрицю для `members` × `events` або None.
+        Hit, якщо список подій збігається, а кешовані користувачі
+        покривають усіх запитаних (рядки вибираються з більшої матриці).
+        """
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                cached_events = npz["events"].tolist()
+                cached_members = npz["members"].tolist()
+                if cached_events != events:
+                    raise KeyError("events")
+                index = {m_id: row for row, m_id in enumerate(cached_members)}
+                rows = [index[m_id] for m_id in members]
+                matrix = npz["scores"][rows]
+        except (FileNotFoundError, KeyError, ValueError, OSError):
+            self.misses += 1
+            return None
+
+        os.utime(path)  # LRU: оновлюємо час використання
+        self.hits += 1
+        return matrix
+
+    def put(
+        self,
+        key: str,
+        members: List[str],
+        events: List[str],
+        matrix: np.ndarray,
+    ) -> None:
+        """Атомарний запис (tmp → rename) і, за потреби, витіснення."""
+        path = self._path(key)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as fh:
+            np.savez(
+                fh,
+                scores=matrix.astype(np.float32, copy=False),
+                members=np.asarray(members, dtype=str),
+                events=np.asarray(events, dtype=str),
+            )
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        files = sorted(self.cache_dir.glob("*.npz"), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in files)
+        for path in files:
+            if total <= self.max_bytes:
+                break
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------ #
+    def stats(self) -> str:
+        lookups = self.hits + self.misses
+        ratio = self.hits / lookups * 100.0 if lookups else 0.0
+        return f"score cache: {self.hits} hits, {self.misses} misses ({ratio:.1f} % hit rate)"
@@ -0,0 +1,96 @@
+"""
+Чекпойнти циклу по partition-ах.
+
+Після кожної завершеної partition у каталог чекпойнтів атомарно
+(tmp-файл → os.replace) записується json з метриками та важливістю ознак,
+а за бажанням — .npz з матрицями sim-score.  `manifest.json` фіксує
+відбиток вхідних даних і конфігурацію запуску; `--resume` пропускає
+готові partition лише тоді, коли обидва збігаються.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+
+class CheckpointMismatch(RuntimeError):
+    """Чекпойнт створено з іншими даними або конфігурацією."""
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+class PartitionCheckpoint:
+    """Каталог чекпойнтів одного запуску (місто + конфігурація)."""
+
+    def __init__(
+        self,
+        directory: Path,
+        fingerprint: str,
+        config: Dict[str, Any],
+        resume: bool = False,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # json round-trip, щоб кортежі порівнювалися як списки
+        manifest = {"fingerprint": fingerprint, "config": json.loads(json.dumps(config))}
+        manifest_path = self.directory / "manifest.json"
+
+        if resume and manifest_path.exists():
+            stored = json.loads(manifest_path.read_text(encoding="utf-8"))
+            if stored != manifest:
+                raise CheckpointMismatch(
+                    f"{self.directory}: input data or config changed since the checkpoint"
+                )
+            return
+
+        # новий запуск — старі результати більше не дійсні
+        for path in self.directory.glob("partition_*"):
+            path.unlink()
+        _atomic_write_text(manifest_path, json.dumps(manifest, indent=2))
+
+    def _path(self, part_no: int, suffix: str) -> Path:
+        return self.directory / f"partition_{part_no}{suffix}"
+
+    # ------------------------------------------------------------------ #
+    def load(self, part_no: int, ts: int) -> Dict[str, Any] | None:
+        """Збережений результат partition або None, якщо її ще не завершено."""
+        path = self._path(part_no, ".json")
+        if not path.exists():
+            return None
+        record = json.loads(path.read_text(encoding="utf-8"))
+        return record if record.get("ts") == ts else None
+
+    def save(
+        self,
+        part_no: int,
+        ts: int,
+        metrics: Dict[str, Any],
+        importances: Dict[str, List[float]],
+        scores: Dict[str, np.ndarray] | None = None,
+        members: List[str] | None = None,
+        events: List[str] | None = None,
+    ) -> None:
+        """Спочатку матриці, потім json: json-файл — ознака завершеної partition."""
+        if scores is not None:
+            npz_path = self._path(part_no, ".npz")
+            tmp_path = npz_path.with_suffix(".npz.tmp")
+            with open(tmp_path, "wb") as fh:
+                np.savez(
+                    fh,
+                    members=np.asarray(members or [], dtype=str),
+                    events=np.asarray(events or [], dtype=str),
+                    **{name: m.astype(np.float32, copy=False) for name, m in scores.items()},
+                )
+            os.replace(tmp_path, npz_path)
+
+        record = {"ts": ts, "metrics": metrics, "importances": importances}
+        _atomic_write_text(self._path(part_no, ".json"), json.dumps(record, indent=2))
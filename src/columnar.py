@@ -0,0 +1,166 @@
+"""
+Стовпцевий експорт матриць learning-to-rank по partition-ах.
+
+Для кожної partition пишеться каталог `partition_<n>/`:
+
+    X.npy           float32 [n_rows × n_features], Fortran-порядок
+                    (кожна ознака — суцільний стовпець)
+    y.npy           int8    [n_rows]   1 — користувач відвідав подію
+    member_idx.npy  int32   [n_rows]   позиція в schema["members"]
+    event_idx.npy   int32   [n_rows]   позиція в schema["events"]
+    schema.json     ознаки, dtype / shape / order кожного файлу, id
+                    користувачів і подій, межа train / test (train_rows)
+
+Рядки — «користувач, потім подія», як X у LearningToRank.learn; перші
+`train_rows` рядків — його train-користувачі (80 %).  X пишеться
+стовпцями прямо у файл (`open_memmap`), без повної копії в памʼяті, решта
+— одним `np.save`; каталог зʼявляється атомарно (tmp → os.replace).
+Читання — `np.load(mmap_mode="r")`, без копіювання:
+
+    for part in iter_partitions(Path("matrices/LCHICAGO")):
+        clf.fit(part.X[:part.train_rows], part.y[:part.train_rows])
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import numpy as np
+
+from .recommenders.hybrid_recommender import LearningToRank
+
+FORMAT = "l2r-matrices"
+VERSION = 1
+
+
+def _describe(array: np.ndarray, file_name: str) -> Dict[str, Any]:
+    return {
+        "file": file_name,
+        "dtype": array.dtype.str,
+        "shape": list(array.shape),
+        "order": "F" if array.ndim > 1 and array.flags.f_contiguous else "C",
+    }
+
+
+def write_partition(
+    root: Path,
+    part_no: int,
+    ts: int,
+    members: List[str],
+    events: List[str],
+    simscores: Dict[str, np.ndarray],
+    rsvp: Dict[str, List[str]],
+    train_members: int | None = None,
+    meta: Dict[str, Any] | None = None,
+) -> Path:
+    """
+    Записує X / y / індекси partition з матриць `simscores`
+    ({ознака: [members × events]}); повертає каталог partition.
+    train_members — скільки перших користувачів іде в train
+    (за замовчуванням 80 %, як у LearningToRank.learn).
+    """
+    if train_members is None:
+        train_members = int(0.8 * len(members))
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    out = root / f"partition_{part_no}"
+    tmp = root / f"partition_{part_no}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir()
+
+    n_rows = len(members) * len(events)
+    X = np.lib.format.open_memmap(
+        tmp / "X.npy",
+        mode="w+",
+        dtype=np.float32,
+        shape=(n_rows, len(simscores)),
+        fortran_order=True,
+    )
+    for col, matrix in enumerate(simscores.values()):
+        X[:, col] = matrix.ravel()
+    X.flush()
+
+    columns = {"X": _describe(X, "X.npy")}
+    del X
+    arrays = {
+        "y": LearningToRank._labels(members, events, rsvp, dtype=np.int8).ravel(),
+        "member_idx": np.repeat(np.arange(len(members), dtype=np.int32), len(events)),
+        "event_idx": np.tile(np.arange(len(events), dtype=np.int32), len(members)),
+    }
+    for name, array in arrays.items():
+        np.save(tmp / f"{name}.npy", array)
+        columns[name] = _describe(array, f"{name}.npy")
+
+    schema = {
+        "format": FORMAT,
+        "version": VERSION,
+        "partition": part_no,
+        "ts": ts,
+        "n_rows": n_rows,
+        "train_rows": min(train_members, len(members)) * len(events),
+        "features": list(simscores),
+        "columns": columns,
+        "members": list(members),
+        "events": list(events),
+        **(meta or {}),
+    }
+    (tmp / "schema.json").write_text(json.dumps(schema), encoding="utf-8")
+
+    shutil.rmtree(out, ignore_errors=True)
+    os.replace(tmp, out)
+    return out
+
+
+class PartitionMatrices:
+    """Матриці однієї partition через memmap: `.X`, `.y`, `.member_idx`, `.event_idx`."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.schema: Dict[str, Any] = json.loads(
+            (self.path / "schema.json").read_text(encoding="utf-8")
+        )
+        if self.schema.get("format") != FORMAT or self.schema.get("version") != VERSION:
+            raise ValueError(f"{self.path}: not an {FORMAT} v{VERSION} partition")
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.load(self.path / spec["file"], mmap_mode="r")
+            for name, spec in self.schema["columns"].items()
+        }
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        columns = self.__dict__.get("columns", {})
+        if name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+    def __len__(self) -> int:
+        return self.schema["n_rows"]
+
+    @property
+    def features(self) -> List[str]:
+        return self.schema["features"]
+
+    @property
+    def train_rows(self) -> int:
+        return self.schema["train_rows"]
+
+    @property
+    def members(self) -> List[str]:
+        return self.schema["members"]
+
+    @property
+    def events(self) -> List[str]:
+        return self.schema["events"]
+
+
+def iter_partitions(root: Path) -> Iterator[PartitionMatrices]:
+    """Усі завершені partition каталогу в порядку номерів."""
+    paths = [
+        p for p in Path(root).glob("partition_*")
+        if p.name.split("_")[1].isdigit() and (p / "schema.json").exists()
+    ]
+    for path in sorted(paths, key=lambda p: int(p.name.split("_")[1])):
+        yield PartitionMatrices(path)
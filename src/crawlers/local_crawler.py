@@ -1,9 +1,11 @@
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+import argparse
 import json 
 import logging
 import os
 
+import numpy as np
 import pandas as pd
 
 logging.basicConfig(format='%(asctime)s %(levelname)s: %(message)s', level=logging.INFO)
@@ -26,16 +28,15 @@ default_loc = {
     }
 }
 
-city_groups_dict = defaultdict(lambda: [])
-groups_city_dict = defaultdict(lambda: "")
-group_events_dict = defaultdict(lambda: defaultdict(lambda: []))
-group_members_dict = defaultdict(lambda: defaultdict(lambda: []))
-member_groups_dict = defaultdict(lambda: "")
-event_groups_dict = defaultdict(lambda: "")
-rsvp_event_members_dict = defaultdict(lambda: defaultdict(lambda: []))
-members_info_dict = defaultdict(lambda: defaultdict(lambda: defaultdict(lambda: 0.0)))
-events_info_dict = defaultdict(lambda: defaultdict(lambda: defaultdict(lambda: 0.0)))
-location_lat_lon_dict = defaultdict(lambda: defaultdict(lambda: 0.0))
+# Таблиці-lookup між етапами (замість словників, що наповнювались по рядку):
+# group_id → місто, event_id → місто, member_id → місто, location_id → lat/lon
+groups_city = pd.Series(dtype=str)
+event_city = pd.Series(dtype=str)
+member_city = pd.Series(dtype=str)
+locations = pd.DataFrame(columns=["latitude", "longitude"])
+
+# кількість процесів для розбору шардів (rsvps_*, users_*, events_*)
+workers = os.cpu_count()
 
 
 def main():
@@ -74,194 +75,238 @@ def create_json_file(dictionary, filename):
     with open(filename, "w", encoding="utf-8") as f:
         f.write(json_representation)
 
-    
-def get_groups_from_cities(cities):
-    global city_groups_dict, groups_city_dict
 
-    city_data = pd.read_csv("data/groups.csv")
+def as_str(values):
+    """Векторний str() для колонки: як і str(nan), пропуски стають "nan"."""
+    return values.astype(str).mask(values.isna(), "nan")
 
-    city_list = list(city_data.region)
-    group_list = list(city_data.group_id)
 
-    for i in range(len(city_list)):
-        city_groups_dict[str(city_list[i])].append(str(group_list[i]))
-        groups_city_dict[str(group_list[i])] = (str(city_list[i]))
-        
+def write_city_files(frame, filename, to_dict):
+    """Групування по містах — лише наприкінці, один json на місто."""
+    for city, city_frame in frame.groupby("city", sort=False):
+        city_dir = Path(OUTPUT_DIR) / f"L{city}"
+        city_dir.mkdir(parents=True, exist_ok=True)
+        create_json_file(to_dict(city_frame), city_dir / filename)
 
 
-def get_events_from_groups():
-    global group_events_dict, groups_city_dict, event_groups_dict
+def group_lists(frame, key, value):
+    """{key: [value, …]} у порядку першої появи key, значення — у порядку рядків."""
+    codes, keys = pd.factorize(frame[key])
+    order = np.argsort(codes, kind="stable")
+    bounds = np.cumsum(np.bincount(codes, minlength=len(keys)))[:-1]
+    values = np.split(frame[value].to_numpy()[order], bounds)
+    return dict(zip(keys.tolist(), (part.tolist() for part in values)))
 
-    group_events_data = pd.read_csv("data/group_events.csv")
 
-    group_ids = list(group_events_data.group_id)
-    event_ids = list(group_events_data.event_id)
+def join(frame, key, lookup):
+    """
+    Inner join з lookup (Series, індекс — id): рядки без відповідника
+    відкидаються, порядок рядків зберігається.  Хеш-таблиця індексу
+    будується раз на процес і перевикористовується для всіх шардів.
+    """
+    pos = lookup.index.get_indexer(frame[key])
+    found = pos >= 0
+    return frame[found], pos[found]
 
-    for i in range(len(group_ids)):
-        # group_events_dict[groups_city_dict[str(group_ids[i])]][str(group_ids[i])].append(str(event_ids[i]))
-        # event_groups_dict[str(event_ids[i])] = str(group_ids[i])
-        group_id = str(group_ids[i])
-        event_id = str(event_ids[i])
-        city = groups_city_dict[group_id]
-        group_events_dict[city][group_id].append(event_id)
-        event_groups_dict[event_id] = group_id
 
-    for city in group_events_dict:
-        city_path = os.path.join(OUTPUT_DIR, f"L{city}")
-        if not os.path.isdir(city_path):
-            os.makedirs(city_path)
-        output_file = os.path.join(city_path, "group_events.json")
-        create_json_file(group_events_dict[city], output_file)
+def last_per_key(frame, key):
+    """Як dict-присвоєння по рядках: позиція першої появи, значення останньої."""
+    first_order = frame[key].drop_duplicates()
+    return frame.drop_duplicates(key, keep="last").set_index(key).loc[first_order]
 
 
-def get_members_from_groups():
-    global group_members_dict, groups_city_dict, member_groups_dict
+def city_of_last_group(frame, key):
+    """key → місто його останньої групи (лише для груп з відомим містом)."""
+    last = frame.drop_duplicates(key, keep="last")
+    return last.loc[last["city"] != ""].set_index(key)["city"]
 
-    group_members_data = pd.read_csv("data/group_users.csv")
 
-    group_ids = list(group_members_data.group_id)
-    member_ids = list(group_members_data.user_id)
+def get_groups_from_cities(cities):
+    global groups_city
+
+    city_data = pd.read_csv("data/groups.csv", usecols=["group_id", "region"]).apply(as_str)
+    groups_city = city_data.drop_duplicates("group_id", keep="last").set_index("group_id")["region"]
+
+
+def get_events_from_groups():
+    global event_city
 
-    for i in range(len(group_ids)):
-        group_id = str(group_ids[i])
-        member_id = str(member_ids[i])
-        city = groups_city_dict[group_id]
-        group_members_dict[city][group_id].append(member_id)
-        member_groups_dict[member_id] = group_id
+    group_events_data = pd.read_csv("data/group_events.csv", usecols=["group_id", "event_id"])
+    group_events_data = group_events_data.apply(as_str)
+    # група без відомого міста потрапляє в місто "" (як і раніше)
+    group_events_data["city"] = group_events_data["group_id"].map(groups_city).fillna("")
 
-    for city in group_members_dict:
-        city_path = os.path.join(OUTPUT_DIR, f"L{city}")
-        if not os.path.isdir(city_path):
-            os.makedirs(city_path)
-        output_file = os.path.join(city_path, "group_members.json")
-        create_json_file(group_members_dict[city], output_file)
+    event_city = city_of_last_group(group_events_data, "event_id")
+    write_city_files(
+        group_events_data, "group_events.json", lambda f: group_lists(f, "group_id", "event_id")
+    )
+
+
+def get_members_from_groups():
+    global member_city
+
+    group_members_data = pd.read_csv("data/group_users.csv", usecols=["group_id", "user_id"])
+    group_members_data = group_members_data.apply(as_str)
+    group_members_data["city"] = group_members_data["group_id"].map(groups_city).fillna("")
+
+    member_city = city_of_last_group(group_members_data, "user_id")
+    write_city_files(
+        group_members_data, "group_members.json", lambda f: group_lists(f, "group_id", "user_id")
+    )
+
+
+# --------------------------------------------------------------------------
+# Паралельний розбір шардів
+#
+# Шарди незалежні, тож кожен читається в окремому процесі.  Воркер
+# отримує lookup-таблиці (event → city, member → city, locations) один
+# раз через initializer і повертає вже відфільтрований компактний
+# DataFrame з колонкою city.  Головний процес склеює їх у порядку шардів,
+# тож вихідні json ідентичні послідовному проходу.
+#
+# id перетворюються на str у межах шарду — тип колонки (int / float з NaN)
+# визначається саме шардом, як і у str() по рядку.
+# --------------------------------------------------------------------------
+def shard_paths(prefix, count):
+    return [Path("data") / f"{prefix}_{i}.csv" for i in range(1, count + 1)]
+
+
+def parse_shards(parse_fn, paths, lookups):
+    """Результати parse_fn(path), склеєні в порядку `paths`."""
+    if workers == 1:
+        init_worker(lookups)
+        partials = [parse_fn(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=init_worker, initargs=(lookups,)
+        ) as pool:
+            partials = list(pool.map(parse_fn, paths))
+    return pd.concat(partials, ignore_index=True)
+
+
+def init_worker(lookups):
+    global worker_lookups
+    worker_lookups = lookups
+
+
+def parse_rsvp_shard(file_path):
+    rsvp_data = pd.read_csv(file_path, usecols=["response", "user_id", "event_id"])
+    rsvp_data = rsvp_data[rsvp_data["response"] == "yes"]
+
+    frame = pd.DataFrame(
+        {"event_id": as_str(rsvp_data["event_id"]), "user_id": as_str(rsvp_data["user_id"])}
+    )
+    event_city = worker_lookups["event_city"]
+    frame, pos = join(frame, "event_id", event_city)
+    return frame.assign(city=event_city.to_numpy()[pos])
+
+
+def parse_member_shard(file_path):
+    user_data = pd.read_csv(file_path, usecols=["user_id", "latitude", "longitude"])
+
+    frame = pd.DataFrame(
+        {
+            "user_id": as_str(user_data["user_id"]),
+            "lat": user_data["latitude"].astype(np.float64),
+            "lon": user_data["longitude"].astype(np.float64),
+        }
+    )
+    member_city = worker_lookups["member_city"]
+    frame, pos = join(frame, "user_id", member_city)
+    return frame.assign(city=member_city.to_numpy()[pos])
+
+
+def parse_event_shard(file_path):
+    event_data = pd.read_csv(
+        file_path, usecols=["event_id", "location_id", "time", "fee_price"]
+    )
+
+    desc = event_data["fee_price"]
+    frame = pd.DataFrame(
+        {
+            "event_id": as_str(event_data["event_id"]),
+            "location_id": event_data["location_id"].astype(np.float64),
+            "time": event_data["time"].astype(np.int64),
+            "description": desc.astype(str).where(desc.notna(), ""),
+        }
+    )
+    event_city = worker_lookups["event_city"]
+    frame, pos = join(frame, "event_id", event_city)
+    frame = frame.assign(city=event_city.to_numpy()[pos])
+
+    # location: відомий id → координати, невідомий → 0.0, порожній → центр міста
+    locations = worker_lookups["locations"]
+    loc_pos = locations.index.get_indexer(frame["location_id"])
+    no_location = frame["location_id"].isna().to_numpy()
+    for col, src in (("lat", "latitude"), ("lon", "longitude")):
+        known = np.append(locations[src].to_numpy(), 0.0)[loc_pos]      # -1 → 0.0
+        default = frame["city"].map({city: loc[col] for city, loc in default_loc.items()})
+        frame[col] = np.where(no_location, default.to_numpy(dtype=np.float64), known)
+    return frame[["event_id", "time", "description", "lat", "lon", "city"]]
 
 
 def get_rsvp_from_events():
-    global event_groups_dict, groups_city_dict, rsvp_event_members_dict
-    response_list = []
-    member_list = []
-    event_list = []
-
-    for i in range(1, 18):
-        file_path = Path("data") / f"rsvps_{i}.csv"
-        rsvp_data = pd.read_csv(file_path)
-
-        response_list.extend(rsvp_data["response"])
-        member_list.extend(rsvp_data["user_id"])
-        event_list.extend(rsvp_data["event_id"])
-
-    for response, member_id, event_id in zip(response_list, member_list, event_list):
-        if response == "yes":
-            event_id_str = str(event_id)
-            member_id_str = str(member_id)
-            group_id = event_groups_dict.get(event_id_str)
-
-            if group_id:
-                city = groups_city_dict.get(group_id)
-                if city:
-                    rsvp_event_members_dict[city][event_id_str].append(member_id_str)
-
-    for city, city_rsvp_data in rsvp_event_members_dict.items():
-        city_dir = Path("data/json_data") / f"L{city}"
-        city_dir.mkdir(parents=True, exist_ok=True)
-        output_path = city_dir / "rsvp_events.json"
-        create_json_file(city_rsvp_data, output_path)
+    rsvps = parse_shards(parse_rsvp_shard, shard_paths("rsvps", 17), {"event_city": event_city})
+    write_city_files(rsvps, "rsvp_events.json", lambda f: group_lists(f, "event_id", "user_id"))
 
 
 def get_member_info():
-    global groups_city_dict, members_info_dict, member_groups_dict
-    member_list = []
-    latitude_list = []
-    longitude_list = []
-
-    for i in range(1, 8):
-        file_path = Path("data") / f"users_{i}.csv"
-        user_data = pd.read_csv(file_path)
-        
-        member_list.extend(user_data["user_id"])
-        latitude_list.extend(user_data["latitude"])
-        longitude_list.extend(user_data["longitude"])
-
-    for member_id, lat, lon in zip(member_list, latitude_list, longitude_list):
-        member_id_str = str(member_id)
-        group_id = member_groups_dict.get(member_id_str)
-
-        if group_id:
-            city = groups_city_dict.get(group_id)
-            if city:
-                members_info_dict[city][member_id_str]["lat"] = float(lat)
-                members_info_dict[city][member_id_str]["lon"] = float(lon)
-
-    for city, city_members in members_info_dict.items():
-        city_dir = Path("data/json_data") / f"L{city}"
-        city_dir.mkdir(parents=True, exist_ok=True)
-        output_path = city_dir / "members_info.json"
-        create_json_file(city_members, output_path)
+    members = parse_shards(parse_member_shard, shard_paths("users", 7), {"member_city": member_city})
+    members = last_per_key(members, "user_id")
+
+    def to_dict(frame):
+        return {
+            member_id: {"lat": lat, "lon": lon}
+            for member_id, lat, lon in zip(
+                frame.index.tolist(), frame["lat"].tolist(), frame["lon"].tolist()
+            )
+        }
+
+    write_city_files(members, "members_info.json", to_dict)
 
 
 def get_event_info():
-    global events_info_dict, groups_city_dict, event_groups_dict, location_lat_lon_dict
-
-    event_list = []
-    location_list = []
-    event_time_list = []
-    description_list = []
-
-    file_path = Path("data") / f"locations.csv"
-    location_data = pd.read_csv(file_path)
-    location_id = location_data["location_id"]
-    latitude = location_data["latitude"]
-    longitude = location_data["longitude"]
-
-    for loc_id, lat, lon in zip(location_id, latitude, longitude):
-        if pd.notnull(loc_id):
-            location_lat_lon_dict[loc_id]["lat"] = lat
-            location_lat_lon_dict[loc_id]["lon"] = lon
-
-    for i in range(1, 25):
-        file_path = Path("data") / f"events_{i}.csv"
-        event_data = pd.read_csv(file_path)
-
-        event_list.extend(event_data["event_id"])
-        location_list.extend(event_data["location_id"])
-        event_time_list.extend(event_data["time"])
-        description_list.extend(event_data["fee_price"])
-
-    for event_id, loc_id, evt_time, desc in zip(event_list, location_list, event_time_list, description_list):
-        event_id_str = str(event_id)
-        group_id = event_groups_dict.get(event_id_str)
-
-        if not group_id:
-            continue
-
-        city = groups_city_dict.get(group_id)
-        if not city:
-            continue
-
-        city_dict = events_info_dict[city][event_id_str]
-        city_dict["time"] = int(evt_time)
-        
-        if pd.isnull(desc):
-            city_dict["description"] = ""
-        else:
-            city_dict["description"] = str(desc)
-        
-        if pd.isnull(loc_id):
-            city_dict["lat"] = default_loc[city]["lat"]
-            city_dict["lon"] = default_loc[city]["lon"]
-        else:
-            city_dict["lat"] = float(location_lat_lon_dict[loc_id]["lat"])
-            city_dict["lon"] = float(location_lat_lon_dict[loc_id]["lon"])
-
-    for city, city_event_data in events_info_dict.items():
-        city_dir = Path("data/json_data") / f"L{city}"
-        city_dir.mkdir(parents=True, exist_ok=True)
-        output_path = city_dir / "events_info.json"
-        create_json_file(city_event_data, output_path)
+    global locations
+
+    location_data = pd.read_csv(
+        Path("data") / "locations.csv", usecols=["location_id", "latitude", "longitude"]
+    )
+    location_data = location_data[location_data["location_id"].notna()]
+    locations = (
+        location_data.astype(np.float64)
+        .drop_duplicates("location_id", keep="last")
+        .set_index("location_id")
+    )
+
+    events = parse_shards(
+        parse_event_shard,
+        shard_paths("events", 24),
+        {"event_city": event_city, "locations": locations},
+    )
+    events = last_per_key(events, "event_id")
+
+    def to_dict(frame):
+        return {
+            event_id: {"time": evt_time, "description": desc, "lat": lat, "lon": lon}
+            for event_id, evt_time, desc, lat, lon in zip(
+                frame.index.tolist(),
+                frame["time"].tolist(),
+                frame["description"].tolist(),
+                frame["lat"].tolist(),
+                frame["lon"].tolist(),
+            )
+        }
+
+    write_city_files(events, "events_info.json", to_dict)
 
 
 if __name__ == "__main__":
+    argp = argparse.ArgumentParser("local crawler")
+    argp.add_argument(
+        "--workers", type=int, default=workers, help="Processes for parsing CSV shards"
+    )
+    workers = argp.parse_args().workers
+
     logging.info("------------------ Start Local Crawler ------------------")
     main()
     logging.info("------------------ End Local Crawler ------------------")
\ No newline at end of file
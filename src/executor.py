@@ -0,0 +1,66 @@
+"""
+Виконавець незалежних етапів усередині partition.
+
+Базові рекомендери читають ті самі train / test репозиторії й пишуть у
+різні ознаки, тож їх можна рахувати одночасно.  Кожне завдання повертає
+власний буфер результату (спільного змінюваного `simscores` немає), а
+виконавець додає до нього час виконання.
+
+Режими:
+• "thread"  – пул потоків (за замовчуванням; NumPy / scipy / sklearn
+  відпускають GIL у важких місцях);
+• "process" – пул процесів (аргументи й результати серіалізуються);
+• "serial"  – послідовно, для налагодження.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Tuple
+
+Task = Tuple[Callable[..., Any], Tuple[Any, ...], Dict[str, Any]]   # (fn, args, kwargs)
+
+EXECUTOR_MODES = ("thread", "process", "serial")
+
+
+def _timed(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+class StageExecutor:
+    """Пул, що живе весь запуск; `run` виконує набір незалежних завдань."""
+
+    def __init__(self, mode: str = "thread", max_workers: int | None = None) -> None:
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"Unknown executor mode: {mode}")
+        self.mode = mode
+        self._pool: Executor | None = None
+        if mode == "thread":
+            self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        elif mode == "process":
+            self._pool = ProcessPoolExecutor(max_workers=max_workers)
+
+    def __enter__(self) -> "StageExecutor":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def run(self, tasks: Dict[str, Task]) -> Dict[str, Tuple[Any, float]]:
+        """{назва: (fn, args, kwargs)} → {назва: (результат, секунди)}."""
+        if self._pool is None:
+            return {name: _timed(fn, *args, **kwargs) for name, (fn, args, kwargs) in tasks.items()}
+
+        futures = {
+            name: self._pool.submit(_timed, fn, *args, **kwargs)
+            for name, (fn, args, kwargs) in tasks.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,277 @@
+"""
+Пакетний експорт top-k рекомендацій для всіх активних користувачів міста.
+
+Базові ознаки і мета-модель навчаються один раз для останнього вікна:
+
+    • мета-модель — на попередній partition (ознаки train [ts-2Δ, ts-Δ],
+      мітки — RSVP у [ts-Δ, ts]), як у LearningToRank.learn;
+    • базові ознаки — на train-вікні [ts-Δ, ts];
+    • кандидати — майбутні події [ts, ts+Δ], користувачі — усі, хто має
+      RSVP у train-вікні.
+
+Користувачі оцінюються блоками `member_block × event_block` (памʼять
+обмежена розміром блоку), top-k кожного рядка — `argpartition` і
+сортування лише k елементів.  Результат пишеться потоком у бінарний файл:
+
+    header   <4sIIIQ: magic b"TOPK", версія, n_members, k, n_entries
+    offsets  uint64 [n_members + 1]   – початок записів користувача
+    entries  (event int32, score float32) [n_entries], за спаданням score
+
+Індекси користувачів і подій — позиції у списках json-sidecar
+(`<out>.json`), тож файл читається довільним доступом без repo
+(`TopKFile`).
+
+    python -m src.export --city LCHICAGO --k 10 --out exports/LCHICAGO_top10.bin
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import struct
+import time
+from functools import partial
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from .blocks import BlockScorer
+from .features import FEATURES, feature_matrix, fit_feature, score_ids
+from .main import DATA_DIR, load_repo
+from .partition import TRAIN_INTERVAL, WindowEngine, get_timestamps
+from .recommenders.hybrid_recommender import MODELS, LearningToRank, make_model
+
+MAGIC = b"TOPK"
+VERSION = 1
+HEADER = struct.Struct("<4sIIIQ")
+ENTRY = np.dtype([("event", "<i4"), ("score", "<f4")])
+
+
+# ──────────────────────────────────────────────────────────────
+# 1. Формат файлу
+# ──────────────────────────────────────────────────────────────
+class TopKWriter:
+    """Потоковий запис: місце під offsets резервується, заповнюється в close()."""
+
+    def __init__(self, path: Path, n_members: int, k: int) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = open(path, "wb")
+        self.n_members = n_members
+        self.k = k
+        self.offsets = np.zeros(n_members + 1, dtype=np.uint64)
+        self._row = 0
+        self._fh.seek(HEADER.size + self.offsets.nbytes)
+
+    def __enter__(self) -> "TopKWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, events: np.ndarray, scores: np.ndarray) -> None:
+        """Top-k блоку: events / scores [n_rows × k'] (рядки — наступні користувачі)."""
+        entries = np.empty(events.shape, dtype=ENTRY)
+        entries["event"] = events
+        entries["score"] = scores
+        self._fh.write(entries.tobytes())
+        n_rows, width = events.shape
+        start = self.offsets[self._row]
+        self.offsets[self._row + 1:self._row + n_rows + 1] = (
+            start + width * np.arange(1, n_rows + 1, dtype=np.uint64)
+        )
+        self._row += n_rows
+
+    def close(self) -> None:
+        if self._fh.closed:
+            return
+        self._fh.seek(0)
+        self._fh.write(
+            HEADER.pack(MAGIC, VERSION, self.n_members, self.k, int(self.offsets[self._row]))
+        )
+        self._fh.write(self.offsets.tobytes())
+        self._fh.close()
+
+
+class TopKFile:
+    """Читання експорту через memmap: `topk[member_id] → [(event_id, score), …]`."""
+
+    def __init__(self, path: Path) -> None:
+        path = Path(path)
+        with open(path, "rb") as fh:
+            magic, version, n_members, self.k, n_entries = HEADER.unpack(fh.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a top-k export (v{VERSION})")
+
+        self.offsets = np.memmap(
+            path, dtype=np.uint64, mode="r", offset=HEADER.size, shape=(n_members + 1,)
+        )
+        self.entries = np.memmap(
+            path,
+            dtype=ENTRY,
+            mode="r",
+            offset=HEADER.size + self.offsets.nbytes,
+            shape=(n_entries,),
+        )
+        meta = json.loads(sidecar_path(path).read_text(encoding="utf-8"))
+        self.members: List[str] = meta["members"]
+        self.events: List[str] = meta["events"]
+        self.member_index = {m_id: row for row, m_id in enumerate(self.members)}
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def row(self, member_row: int) -> np.ndarray:
+        start, end = self.offsets[member_row], self.offsets[member_row + 1]
+        return self.entries[int(start):int(end)]
+
+    def __getitem__(self, member_id: str) -> List[Tuple[str, float]]:
+        entries = self.row(self.member_index[member_id])
+        return [
+            (self.events[e], float(s))
+            for e, s in zip(entries["event"].tolist(), entries["score"].tolist())
+        ]
+
+
+def sidecar_path(path: Path) -> Path:
+    return path.with_suffix(path.suffix + ".json")
+
+
+# ──────────────────────────────────────────────────────────────
+# 2. Навчання
+# ──────────────────────────────────────────────────────────────
+def fit_meta_model(
+    windows: WindowEngine, ts: int, algo: str, n_members: int
+):
+    """Мета-модель на попередній partition (ts - Δ) для top-`n_members` користувачів."""
+    repo = windows.repo
+    prev_ts = ts - TRAIN_INTERVAL
+    train_repo, test_repo = windows.partition(prev_ts)
+    activity = repo["activity"]
+    members = activity.with_history(
+        activity.top(prev_ts - TRAIN_INTERVAL, prev_ts + TRAIN_INTERVAL, n_members),
+        prev_ts - TRAIN_INTERVAL,
+        prev_ts,
+    )
+    events = list(test_repo["events_info"])
+    simscores = {
+        name: feature_matrix(name, train_repo, test_repo, members, events)
+        for name in FEATURES
+    }
+    X, y = LearningToRank._build_matrix(members, events, simscores, test_repo["members_events"])
+    clf = make_model(algo)
+    fit_params = {"group_size": len(events)} if hasattr(clf, "group_size") else {}
+    clf.fit(X, y, **fit_params)
+    return clf
+
+
+def rank_scores(clf, X: np.ndarray) -> np.ndarray:
+    """Неперервний score мета-моделі для ранжування (не 0 / 1 predict)."""
+    if hasattr(clf, "decision_function"):
+        return np.asarray(clf.decision_function(X), dtype=np.float32)
+    return clf.predict_proba(X)[:, 1].astype(np.float32)
+
+
+# ──────────────────────────────────────────────────────────────
+# 3. Оцінювання блоками і top-k
+# ──────────────────────────────────────────────────────────────
+def top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Індекси й значення k найбільших у кожному рядку, за спаданням."""
+    k = min(k, scores.shape[1])
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind="stable")
+    return np.take_along_axis(part, order, axis=1), np.take_along_axis(part_scores, order, axis=1)
+
+
+def score_blocks(
+    scorers: Dict[str, BlockScorer],
+    clf,
+    members: List[str],
+    events: List[str],
+    k: int,
+    member_block: int,
+    event_block: int,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Для кожного блоку користувачів — top-k (індекси в `events`, score-и).
+    Події обходяться блоками; поточний top-k блоку користувачів зливається
+    з кожним новим блоком подій, тож повний рядок [1 × events] не потрібен.
+    """
+    for m_start in range(0, len(members), member_block):
+        member_blk = members[m_start:m_start + member_block]
+        best_idx = np.empty((len(member_blk), 0), dtype=np.int64)
+        best = np.empty((len(member_blk), 0), dtype=np.float32)
+
+        for e_start in range(0, len(events), event_block):
+            event_blk = events[e_start:e_start + event_block]
+            X = np.empty((len(member_blk) * len(event_blk), len(scorers)), dtype=np.float32)
+            for col, scorer in enumerate(scorers.values()):
+                X[:, col] = scorer(member_blk, event_blk).ravel()
+            block = rank_scores(clf, X).reshape(len(member_blk), len(event_blk))
+
+            cand_idx = np.hstack(
+                (best_idx, np.broadcast_to(np.arange(e_start, e_start + len(event_blk)), block.shape))
+            )
+            pos, best = top_k(np.hstack((best, block)), k)
+            best_idx = np.take_along_axis(cand_idx, pos, axis=1)
+
+        yield best_idx.astype(np.int32), best
+
+
+# ──────────────────────────────────────────────────────────────
+# 4. CLI
+# ──────────────────────────────────────────────────────────────
+def main() -> None:
+    argp = argparse.ArgumentParser("Event recommender — bulk top-k export")
+    argp.add_argument("--city", required=True, help="LCHICAGO | LSAN JOSE | LPHOENIX")
+    argp.add_argument("--k", type=int, default=10, help="Recommendations per member")
+    argp.add_argument("--out", type=Path, default=None, help="Output .bin (default exports/<city>_top<k>.bin)")
+    argp.add_argument("--algo", choices=MODELS, default="gbm", help="Meta-model")
+    argp.add_argument(
+        "--ts", type=int, default=None, help="Window boundary (default: latest partition)"
+    )
+    argp.add_argument("--fit-members", type=int, default=100, help="Members to fit the meta-model")
+    argp.add_argument("--block-members", type=int, default=1024, help="Members per block")
+    argp.add_argument("--block-events", type=int, default=2048, help="Events per block")
+    args = argp.parse_args()
+
+    out = args.out or Path("exports") / f"{args.city}_top{args.k}.bin"
+    ts = args.ts or max(get_timestamps(1_262_304_000, 1_388_534_400))
+
+    start = time.perf_counter()
+    repo = load_repo(DATA_DIR / args.city)
+    windows = WindowEngine(repo)
+    clf = fit_meta_model(windows, ts, args.algo, args.fit_members)
+
+    train_repo, cand_repo = windows.partition(ts)
+    catalog = repo["catalog"]
+    scorers = {
+        name: partial(score_ids, fit_feature(name, train_repo), catalog) for name in FEATURES
+    }
+    members = list(train_repo["members_events"])
+    events = list(cand_repo["events_info"])
+    fitted = time.perf_counter()
+    print(f"fit: {fitted - start:.2f} s  ({len(members):,} members × {len(events):,} events)")
+
+    with TopKWriter(out, len(members), args.k) as writer:
+        for best_idx, best in score_blocks(
+            scorers, clf, members, events, args.k, args.block_members, args.block_events
+        ):
+            writer.write(best_idx, best)
+    sidecar_path(out).write_text(
+        json.dumps(
+            {"city": args.city, "ts": ts, "k": args.k, "algo": args.algo,
+             "members": members, "events": events}
+        ),
+        encoding="utf-8",
+    )
+
+    seconds = time.perf_counter() - fitted
+    rate = len(members) / seconds if seconds > 0 else float("inf")
+    print(f"scored {len(members):,} members in {seconds:.2f} s  ({rate:,.0f} members/s)")
+    print(f"written {out} ({out.stat().st_size / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Зворотний fan-out: нова подія → top-N користувачів, яким її варто показати.
+
+Пайплайн оцінює з боку користувача (усі кандидат-події кожного
+користувача).  Тут навпаки: для однієї події shortlist користувачів
+збирається з трьох інвертованих індексів, побудованих на train-вікні:
+
+    • група      → члени групи (group_members), за активністю у train;
+    • гео-клітинка → користувачі з домашніми координатами в ній
+                   (members_info); подія дивиться у свою клітинку і 8 сусідніх;
+    • терм       → користувачі, для яких він серед `n_terms` домінантних
+                   TF-IDF термів профілю, за вагою терма.
+
+Кожен список обрізаний до `max_postings`, тож shortlist не більший за
+(1 + 9 + n_terms) · max_postings незалежно від кількості користувачів
+міста.  Повні ознаки (FEATURES) і мета-модель рахуються лише для нього.
+
+    python -m src.fanout --city LCHICAGO --n 20 --events 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .export import fit_meta_model, rank_scores, top_k
+from .features import FEATURES, Catalog, Recommender, fit_feature
+from .main import DATA_DIR, load_repo
+from .partition import WindowEngine, get_timestamps
+from .recommenders.hybrid_recommender import MODELS
+
+Postings = Dict[int, np.ndarray]
+
+_NEIGHBOURS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+
+def _postings(keys: np.ndarray, rows: np.ndarray, rank: np.ndarray, limit: int) -> Postings:
+    """
+    keys / rows / rank — паралельні масиви; для кожного ключа — не більше
+    `limit` рядків з найбільшим rank.
+    """
+    if not len(keys):
+        return {}
+    order = np.lexsort((-rank, keys))
+    keys, rows = keys[order], rows[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(keys)]
+    return {
+        int(keys[start]): rows[start:min(end, start + limit)]
+        for start, end in zip(starts.tolist(), ends.tolist())
+    }
+
+
+# ──────────────────────────────────────────────────────────────
+# 1. Інвертовані індекси
+# ──────────────────────────────────────────────────────────────
+class FanoutIndex:
+    """група / гео-клітинка / терм → рядки Catalog користувачів."""
+
+    def __init__(
+        self,
+        catalog: Catalog,
+        max_postings: int = 50,
+        cell_deg: float = 0.05,
+        n_terms: int = 5,
+    ) -> None:
+        self.catalog = catalog
+        self.max_postings = max_postings
+        self.cell_deg = cell_deg
+        self.n_terms = n_terms
+        self.group_index: Dict[str, int] = {}
+        self.by_group: Postings = {}
+        self.by_cell: Postings = {}
+        self.by_term: Postings = {}
+        self.content: Recommender | None = None
+        self._repo: Dict = {}
+
+    def _cells(self, coords: np.ndarray) -> np.ndarray:
+        """[n × 2] (lat, lon) → [n × 2] номери клітинок."""
+        return np.floor((coords + (90.0, 180.0)) / self.cell_deg).astype(np.int64)
+
+    @staticmethod
+    def _cell_keys(cells: np.ndarray) -> np.ndarray:
+        return (cells[:, 0] << 32) | cells[:, 1]
+
+    def build(self, train_repo: Dict, content: Recommender) -> "FanoutIndex":
+        """`content` — навчена ознака "content" (потрібні member_vectors / transform_events)."""
+        catalog, limit = self.catalog, self.max_postings
+        members_events = train_repo["members_events"]
+        active = list(members_events)
+        active_rows = catalog.member_rows(active)
+        activity = np.zeros(len(catalog.member_ids), dtype=np.float64)
+        activity[active_rows] = [len(members_events[m_id]) for m_id in active]
+
+        # група → члени
+        keys, rows = [], []
+        for g_id, member_ids in train_repo["group_members"].items():
+            col = self.group_index.setdefault(g_id, len(self.group_index))
+            member_rows = catalog.member_rows(member_ids)
+            keys.append(np.full(len(member_rows), col, dtype=np.int64))
+            rows.append(member_rows)
+        if rows:
+            rows = np.concatenate(rows)
+            self.by_group = _postings(np.concatenate(keys), rows, activity[rows], limit)
+
+        # гео-клітинка → користувачі (домашні координати)
+        members_info = train_repo["members_info"]
+        rows = catalog.member_rows(members_info.ids)
+        cells = self._cell_keys(self._cells(members_info.coords(np.arange(len(members_info)))))
+        self.by_cell = _postings(cells, rows, activity[rows], limit)
+
+        # терм → користувачі, для яких він серед n_terms найважчих у профілі
+        self.content = content
+        self._repo = {"tokens": train_repo.get("tokens"), "events_info": catalog.events}
+        if active:
+            profiles = content.member_vectors(active)
+            keys, rows, weights = [], [], []
+            for row in range(profiles.shape[0]):
+                start, end = profiles.indptr[row], profiles.indptr[row + 1]
+                top = np.argsort(-profiles.data[start:end], kind="stable")[:self.n_terms]
+                keys.append(profiles.indices[start:end][top])
+                weights.append(profiles.data[start:end][top])
+                rows.append(np.full(len(top), active_rows[row], dtype=np.int64))
+            self.by_term = _postings(
+                np.concatenate(keys).astype(np.int64),
+                np.concatenate(rows),
+                np.concatenate(weights),
+                limit,
+            )
+        return self
+
+    # ------------------------------------------------------------------ #
+    def event_terms(self, event_id: str) -> np.ndarray:
+        vec = self.content.transform_events([event_id], self._repo).tocsr()
+        top = np.argsort(-vec.data, kind="stable")[:self.n_terms]
+        return vec.indices[top]
+
+    def candidates(self, event_id: str) -> np.ndarray:
+        """Shortlist події: унікальні рядки Catalog користувачів."""
+        catalog = self.catalog
+        row = catalog.event_rows([event_id])
+        lists = []
+
+        g_id = catalog.event_group.get(event_id)
+        if g_id in self.group_index:
+            lists.append(self.by_group.get(self.group_index[g_id], ()))
+
+        cell = self._cells(catalog.events.coords(row))[0]
+        neighbours = self._cell_keys(cell + np.array(_NEIGHBOURS, dtype=np.int64))
+        lists.extend(self.by_cell.get(key, ()) for key in neighbours.tolist())
+
+        lists.extend(self.by_term.get(term, ()) for term in self.event_terms(event_id).tolist())
+        lists = [np.asarray(rows, dtype=np.int64) for rows in lists if len(rows)]
+        return np.unique(np.concatenate(lists)) if lists else np.empty(0, dtype=np.int64)
+
+
+# ──────────────────────────────────────────────────────────────
+# 2. Повне оцінювання shortlist
+# ──────────────────────────────────────────────────────────────
+class FanoutScorer:
+    """Ознаки FEATURES + мета-модель для shortlist однієї події."""
+
+    def __init__(self, index: FanoutIndex, recommenders: Dict[str, Recommender], clf) -> None:
+        self.index = index
+        self.recommenders = recommenders
+        self.clf = clf
+
+    def score_rows(self, member_rows: np.ndarray, event_id: str) -> np.ndarray:
+        """score мета-моделі [len(member_rows)] для однієї події."""
+        event_idx = self.index.catalog.event_rows([event_id])
+        X = np.empty((len(member_rows), len(self.recommenders)), dtype=np.float32)
+        for col, rec in enumerate(self.recommenders.values()):
+            X[:, col] = rec.score_matrix(member_rows, event_idx)[:, 0]
+        return rank_scores(self.clf, X) if len(member_rows) else np.empty(0, dtype=np.float32)
+
+    def top_members(
+        self, event_id: str, n: int, rows: np.ndarray | None = None
+    ) -> List[Tuple[str, float]]:
+        """
+        top-n (member_id, score) серед shortlist, за спаданням score;
+        `rows` — уже побудований shortlist (інакше index.candidates).
+        """
+        if rows is None:
+            rows = self.index.candidates(event_id)
+        if not len(rows):
+            return []
+        scores = self.score_rows(rows, event_id)
+        pos, best = top_k(scores[None, :], n)
+        return list(zip(self.index.catalog.members(rows[pos[0]]), best[0].tolist()))
+
+
+# ──────────────────────────────────────────────────────────────
+# 3. CLI: затримка на подію і якість shortlist
+# ──────────────────────────────────────────────────────────────
+def main() -> None:
+    argp = argparse.ArgumentParser("Event recommender — event → members fan-out")
+    argp.add_argument("--city", required=True, help="LCHICAGO | LSAN JOSE | LPHOENIX")
+    argp.add_argument("--n", type=int, default=20, help="Members per event")
+    argp.add_argument("--events", type=int, default=200, help="New events to fan out")
+    argp.add_argument("--algo", choices=MODELS, default="gbm", help="Meta-model")
+    argp.add_argument(
+        "--ts", type=int, default=None, help="Window boundary (default: latest partition)"
+    )
+    argp.add_argument("--fit-members", type=int, default=100, help="Members to fit the meta-model")
+    argp.add_argument("--max-postings", type=int, default=50, help="Members per index key")
+    argp.add_argument("--cell", type=float, default=0.05, help="Geo cell size, degrees")
+    argp.add_argument("--terms", type=int, default=5, help="Dominant terms per member / event")
+    argp.add_argument(
+        "--exact", action="store_true", help="Also score all members to measure shortlist recall"
+    )
+    args = argp.parse_args()
+
+    ts = args.ts or max(get_timestamps(1_262_304_000, 1_388_534_400))
+    repo = load_repo(DATA_DIR / args.city)
+    windows = WindowEngine(repo)
+    catalog = repo["catalog"]
+
+    start = time.perf_counter()
+    clf = fit_meta_model(windows, ts, args.algo, args.fit_members)
+    train_repo, new_repo = windows.partition(ts)
+    recommenders = {name: fit_feature(name, train_repo) for name in FEATURES}
+    index = FanoutIndex(catalog, args.max_postings, args.cell, args.terms).build(
+        train_repo, recommenders["content"]
+    )
+    scorer = FanoutScorer(index, recommenders, clf)
+    print(
+        f"fit: {time.perf_counter() - start:.2f} s  ({len(catalog.member_ids):,} members; "
+        f"{len(index.by_group):,} groups, {len(index.by_cell):,} cells, {len(index.by_term):,} terms)"
+    )
+
+    events = list(new_repo["events_info"])
+    events = [events[i] for i in np.random.default_rng(0).permutation(len(events))[:args.events]]
+    attendees: Dict[str, set] = {}
+    for m_id, event_ids in new_repo["members_events"].items():
+        for e_id in event_ids:
+            attendees.setdefault(e_id, set()).add(m_id)
+
+    latency, shortlist, covered, positives, overlap = [], [], 0, 0, []
+    all_rows = np.arange(len(catalog.member_ids))
+    for e_id in events:
+        start = time.perf_counter()
+        rows = index.candidates(e_id)
+        top = scorer.top_members(e_id, args.n, rows)
+        latency.append(time.perf_counter() - start)
+        shortlist.append(len(rows))
+
+        actual = attendees.get(e_id, set())
+        covered += len(actual & set(catalog.members(rows)))
+        positives += len(actual)
+        if args.exact:
+            pos, _ = top_k(scorer.score_rows(all_rows, e_id)[None, :], args.n)
+            exact = set(catalog.members(all_rows[pos[0]]))
+            overlap.append(len(exact & {m_id for m_id, _ in top}) / max(len(exact), 1))
+
+    latency_ms = np.array(latency) * 1000
+    print(
+        f"{len(events):,} events: latency {latency_ms.mean():.1f} ms mean, "
+        f"{np.percentile(latency_ms, 95):.1f} ms p95;  shortlist {np.mean(shortlist):.0f} mean, "
+        f"bound {(10 + args.terms) * args.max_postings:,}"
+    )
+    print(f"RSVPs covered by shortlist: {covered:,} / {positives:,}")
+    if overlap:
+        print(f"top-{args.n} overlap with exhaustive scoring: {np.mean(overlap):.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Спільний інтерфейс базових ознак (рекомендерів) і їхній реєстр.
+
+Кожен рекомендер реалізує два методи:
+
+    fit(train_view)                      – навчання на train-репозиторії вікна;
+    score_matrix(member_idx, event_idx)  – float32 [len(member_idx) × len(event_idx)].
+
+Індекси — номери рядків `Catalog` міста (repo["catalog"]): нумерація
+користувачів і подій спільна для всіх вікон, тож пайплайн (виконавець,
+кеш, блоковий рушій) працює з будь-якою ознакою однаково, а рекомендер
+векторизує свій блок сам.  Старі per-member методи (`score`,
+`score_candidates`) лишилися тонкими адаптерами над score_matrix.
+
+Нова ознака — клас з цими двома методами + рядок `register_feature(...)`;
+порядок реєстрації = порядок стовпців X у LearningToRank.
+"""
+
+from __future__ import annotations
+
+import importlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Protocol
+
+import numpy as np
+
+from .records import EventTable
+
+
+class Recommender(Protocol):
+    def fit(self, train_view: Dict) -> None: ...
+
+    def score_matrix(self, member_idx: np.ndarray, event_idx: np.ndarray) -> np.ndarray: ...
+
+
+# ──────────────────────────────────────────────────────────────
+# 1. Нумерація користувачів і подій міста
+# ──────────────────────────────────────────────────────────────
+class Catalog:
+    """
+    member_idx / event_idx для score_matrix.  Події — рядки міської
+    EventTable (вікна — її підтаблиці), користувачі — усі відомі місту id
+    (RSVP, профілі, членство в групах).  Будується раз у `main.load_repo`
+    і без змін передається у вікна.
+    """
+
+    def __init__(
+        self,
+        events: EventTable,
+        member_ids: Iterable[str],
+        event_group: Dict[str, str],
+    ) -> None:
+        self.events = events
+        self.member_ids: List[str] = list(dict.fromkeys(member_ids))
+        self.member_index = {m_id: row for row, m_id in enumerate(self.member_ids)}
+        self.event_group = event_group
+
+    def member_rows(self, member_ids: Iterable[str]) -> np.ndarray:
+        index = self.member_index
+        return np.fromiter((index[m_id] for m_id in member_ids), dtype=np.int64)
+
+    def event_rows(self, event_ids: Iterable[str]) -> np.ndarray:
+        return self.events.rows(event_ids)
+
+    def members(self, member_idx: np.ndarray) -> List[str]:
+        ids = self.member_ids
+        return [ids[row] for row in member_idx.tolist()]
+
+    def event_ids(self, event_idx: np.ndarray) -> List[str]:
+        ids = self.events.ids
+        return [ids[row] for row in event_idx.tolist()]
+
+    def event_groups(self, event_idx: np.ndarray) -> List[str | None]:
+        """Група кожної події (None — невідома)."""
+        return [self.event_group.get(e_id) for e_id in self.event_ids(event_idx)]
+
+
+# ──────────────────────────────────────────────────────────────
+# 2. Реєстр ознак
+# ──────────────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class FeatureSpec:
+    name: str
+    # "модуль:клас" (лінивий імпорт, як MODELS у hybrid_recommender) або фабрика
+    target: str | Callable[..., Recommender]
+    # імʼя у ключі кешу score-матриць; змінюється разом зі значеннями ознаки
+    cache_name: str
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+FEATURES: Dict[str, FeatureSpec] = {}
+
+
+def register_feature(
+    name: str,
+    target: str | Callable[..., Recommender],
+    cache_name: str,
+    params: Dict[str, Any] | None = None,
+) -> FeatureSpec:
+    spec = FeatureSpec(name, target, cache_name, dict(params or {}))
+    FEATURES[name] = spec
+    return spec
+
+
+def make_recommender(name: str, params: Dict[str, Any] | None = None) -> Recommender:
+    """Створює рекомендер ознаки з параметрами за замовчуванням + `params`."""
+    spec = FEATURES[name]
+    factory = spec.target
+    if isinstance(factory, str):
+        module, _, cls_name = factory.partition(":")
+        factory = getattr(importlib.import_module(module, __package__), cls_name)
+    return factory(**{**spec.params, **(params or {})})
+
+
+def content_recommender(backend: str = "tfidf", **params: Any) -> Recommender:
+    """content.backend: "tfidf" — словник per-window, "hashed" — фіксована памʼять."""
+    if backend == "hashed":
+        from .recommenders.hashed_content_recommender import HashedContentRecommender
+
+        return HashedContentRecommender(**params)
+    if backend != "tfidf":
+        raise ValueError(f"Unknown content backend: {backend}")
+    from .recommenders.content_recommender import ContentRecommender
+
+    return ContentRecommender(**params)
+
+
+def location_recommender(backend: str = "kde", kernel: str = "gaussian", **params: Any) -> Recommender:
+    """location.backend: "kde" — точне KDE на користувача, "rff" — ознаки Фурʼє (лише gaussian)."""
+    if backend == "rff":
+        if kernel != "gaussian":
+            raise ValueError(f"RFF location backend supports only the gaussian kernel, got {kernel}")
+        from .recommenders.rff_location_recommender import RFFLocationRecommender
+
+        return RFFLocationRecommender(**params)
+    if backend != "kde":
+        raise ValueError(f"Unknown location backend: {backend}")
+    from .recommenders.location_recommender import LocationRecommender
+
+    return LocationRecommender(kernel=kernel, **params)
+
+
+# профілі float32; {"profile_dtype": "int8" | "float16"} — компактніше, score-и змінюються
+register_feature("content", content_recommender, "ContentRecommender", {"ngram_range": (1, 1)})
+# @2: точки користувача в порядку рядків Catalog (потік == refit)
+register_feature(
+    "location",
+    location_recommender,
+    "LocationRecommender@2",
+    {"kernel": "gaussian", "bandwidth": "scott"},
+)
+# @2: частки рахуються по train-історії (раніше — перетин з подіями test-вікна)
+# @3: частка — цілі лічильники / довжина історії (потік == refit)
+register_feature(
+    "group",
+    ".recommenders.grp_freq_recommender:GroupFrequencyRecommender",
+    "GroupFrequencyRecommender@3",
+)
+register_feature(
+    "coattend",
+    ".recommenders.coattendance_recommender:CoAttendanceRecommender",
+    "CoAttendanceRecommender",
+    {"top_k": 20},
+)
+register_feature(
+    "membership",
+    ".recommenders.membership_recommender:GroupMembershipRecommender",
+    "GroupMembershipRecommender",
+)
+register_feature(
+    "popularity",
+    ".recommenders.popularity_recommender:PopularityRecommender",
+    "PopularityRecommender",
+    {"kind": "count"},
+)
+register_feature(
+    "trend",
+    ".recommenders.popularity_recommender:PopularityRecommender",
+    "PopularityRecommender",
+    {"kind": "trend"},
+)
+
+
+# ──────────────────────────────────────────────────────────────
+# 3. Виклики з пайплайна
+# ──────────────────────────────────────────────────────────────
+def fit_feature(name: str, train_repo: Dict, **params: Any) -> Recommender:
+    rec = make_recommender(name, params)
+    rec.fit(train_repo)
+    return rec
+
+
+def score_ids(
+    rec: Recommender, catalog: Catalog, members: List[str], events: List[str]
+) -> np.ndarray:
+    """score_matrix для списків id (BlockScorer після functools.partial)."""
+    return rec.score_matrix(catalog.member_rows(members), catalog.event_rows(events))
+
+
+def feature_matrix(
+    name: str,
+    train_repo: Dict,
+    test_repo: Dict,
+    members: List[str],
+    events: List[str] | None = None,
+    **params: Any,
+) -> np.ndarray:
+    """
+    Навчає ознаку на train-вікні й повертає float32 [members × events];
+    events за замовчуванням — усі події test-вікна.
+    """
+    if events is None:
+        events = list(test_repo["events_info"])
+    rec = fit_feature(name, train_repo, **params)
+    return score_ids(rec, test_repo["catalog"], members, events)
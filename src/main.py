@@ -2,35 +2,45 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import itertools
 import subprocess
 import sys
 import time
-from collections import defaultdict
+from contextlib import nullcontext
+from functools import partial
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict
 
+import numpy as np
+
+from .blocks import BlockEngine, BlockScorer
+from .cache import ScoreCache, fingerprint_files, make_key
+from .checkpoint import CheckpointMismatch, PartitionCheckpoint
+from .executor import EXECUTOR_MODES, StageExecutor
+from .features import FEATURES, Catalog, feature_matrix, fit_feature, score_ids
 from .measurements import recommendation_measurement               # noqa: F401
-from .partition import TRAIN_INTERVAL, get_timestamps, get_partitioned_repo_wrapper
+from .partition import TRAIN_INTERVAL, WindowEngine, get_timestamps
 from .preprocessing import (
+    RsvpIndex,
     load_events,
     load_groups,
     load_members,
-    load_rsvps,
-)
-from .recommenders.content_recommender import ContentRecommender
-from .recommenders.grp_freq_recommender import (
-    GroupFrequencyRecommender,
 )
-from .recommenders.location_recommender import LocationRecommender   # noqa: F401
+from .plots import PlotWorker
 from .recommenders.hybrid_recommender import LearningToRank                 # noqa: F401
 
+# Рекомендери (sklearn / scipy) імпортуються реєстром ознак лише тоді,
+# коли їхній етап справді виконується (--help, --resume без роботи тощо
+# не платять за імпорт).
+
 # ────────────────────────────────────────────────────────────────────
 # 1. Базові шляхи
 # ────────────────────────────────────────────────────────────────────
 SRC_DIR = Path(__file__).resolve().parent
 DATA_DIR = SRC_DIR / "data" / "json_data"
 CRAWLER_DIR = SRC_DIR / "crawlers"
-SCRIPTS_DIR = SRC_DIR / "scripts"
+CACHE_DIR = SRC_DIR.parent / ".cache" / "scores"
+CHECKPOINT_DIR = SRC_DIR.parent / ".cache" / "checkpoints"
 
 # ────────────────────────────────────────────────────────────────────
 # 2. Допоміжні утиліти
@@ -48,63 +58,55 @@ def run_local_crawler() -> None:
         )
 
 
-def run_best_user_script(n_members: int) -> None:
-    """Створює TXT-файли з топ-користувачами."""
-    subprocess.run(
-        [
-            sys.executable,
-            "-m", "src.scripts.script",   # ← головна зміна
-            "--number", str(n_members),
-        ],
-        check=True,
+def load_repo(city_dir: Path) -> Dict:
+    """
+    Зчитує json-файли міста у спільний repo-словник; RSVP — потоково
+    в RsvpIndex без проміжного {event: [member, …]}.
+    """
+    from .activity import ActivityIndex
+    from .membership import MembershipIndex
+    from .popularity import PopularityIndex
+    from .recommenders.content_recommender import TokenCache
+
+    group_members, group_events, event_group = load_groups(
+        city_dir / "group_members.json", city_dir / "group_events.json"
     )
+    events_info = load_events(city_dir / "events_info.json")
+    members_info = load_members(city_dir / "members_info.json")
+    rsvp_index = RsvpIndex.from_json(city_dir / "rsvp_events.json")
+
+    members_events = rsvp_index.members_events()
+    membership = MembershipIndex.from_group_members(group_members)
+    return {
+        "events_info": events_info,
+        "members_info": members_info,
+        "members_events": members_events,
+        "group_events": group_events,
+        "group_members": group_members,
+        "membership": membership,
+        "event_group": event_group,
+        "rsvps": rsvp_index,
+        "activity": ActivityIndex.build(rsvp_index, events_info),
+        "tokens": TokenCache(),
+        "catalog": Catalog(
+            events_info,
+            itertools.chain(members_events, members_info.ids, membership.member_index),
+            event_group,
+        ),
+        "popularity": PopularityIndex.build(events_info, members_events, event_group),
+    }
 
 
 # ────────────────────────────────────────────────────────────────────
-# 3. Класифікатори-обгортки (однотипні)
+# 3. Базові ознаки (реєстр — src/features.py)
 # ────────────────────────────────────────────────────────────────────
-def run_content(
-    train_repo: Dict,
-    test_repo: Dict,
-    simscores: Dict,
-    members: List[str],
-) -> None:
-    rec = ContentRecommender()
-    rec.fit(train_repo["members_events"], train_repo)
-
-    cand_events = list(test_repo["events_info"])
-    cand_vecs = rec.transform_events(cand_events, test_repo)
-
-    for m in members:
-        rec.score(m, cand_events, cand_vecs, simscores)
-
-
-def run_location(
-    train_repo: Dict,
-    test_repo: Dict,
-    simscores: Dict,
-    members: List[str],
-) -> None:
-    rec = LocationRecommender()
-    rec.fit(train_repo["members_events"], train_repo)
-
-    cand_events = list(test_repo["events_info"])
-    for m in members:
-        rec.score_candidates(m, cand_events, test_repo, simscores)
-
-
-def run_group_freq(
-    train_repo: Dict,
-    test_repo: Dict,
-    simscores: Dict,
-    members: List[str],
-) -> None:
-    rec = GroupFrequencyRecommender()
-    rec.fit(train_repo["members_events"])
-
-    cand_events = list(test_repo["events_info"])
-    for m in members:
-        rec.score_candidates(m, cand_events, test_repo, simscores)
+def block_scorers(train_repo: Dict, test_repo: Dict) -> Dict[str, BlockScorer]:
+    """Навчені рекомендери FEATURES як (members, events) → матриця блоку."""
+    catalog = test_repo["catalog"]
+    return {
+        name: partial(score_ids, fit_feature(name, train_repo), catalog)
+        for name in FEATURES
+    }
 
 
 # ────────────────────────────────────────────────────────────────────
@@ -119,76 +121,281 @@ def main() -> None:
         "--algo",
         nargs="+",
         default=["svm", "rf"],
-        help="l2r: svm mlp nb rf (space-separated)",
+        help="l2r: svm mlp nb rf gbm (space-separated)",
     )
     argp.add_argument("--members", type=int, default=100, help="Top-N members to test")
+    argp.add_argument(
+        "--cache-dir", type=Path, default=CACHE_DIR, help="Score-matrix cache directory"
+    )
+    argp.add_argument(
+        "--cache-size-mb", type=int, default=2048, help="Score-matrix cache size limit"
+    )
+    argp.add_argument("--no-cache", action="store_true", help="Disable score-matrix cache")
+    argp.add_argument(
+        "--checkpoint-dir", type=Path, default=CHECKPOINT_DIR, help="Per-partition checkpoints"
+    )
+    argp.add_argument(
+        "--resume", action="store_true", help="Skip partitions finished by a previous run"
+    )
+    argp.add_argument(
+        "--executor",
+        choices=EXECUTOR_MODES,
+        default="thread",
+        help="How to run the base recommenders of a partition",
+    )
+    argp.add_argument("--workers", type=int, default=None, help="Executor pool size")
+    argp.add_argument(
+        "--block-members",
+        type=int,
+        default=None,
+        help="Block-wise scoring with this many members per block (bounded memory)",
+    )
+    argp.add_argument("--block-events", type=int, default=2048, help="Events per block")
+    argp.add_argument(
+        "--epochs", type=int, default=1, help="partial_fit passes in block mode"
+    )
+    argp.add_argument(
+        "--checkpoint-scores", action="store_true", help="Also checkpoint score matrices"
+    )
+    argp.add_argument(
+        "--no-plots", action="store_true", help="Headless: skip feature-importance figures"
+    )
+    argp.add_argument(
+        "--approx",
+        action="store_true",
+        help="Sampled evaluation: stratified members, sampled events, bootstrap CIs",
+    )
+    argp.add_argument(
+        "--approx-members", type=int, default=300, help="Members sampled per partition"
+    )
+    argp.add_argument(
+        "--approx-events", type=float, default=0.25, help="Fraction of negative events kept"
+    )
+    argp.add_argument(
+        "--ci-width", type=float, default=0.05, help="Stop once every F1 CI is this narrow"
+    )
+    argp.add_argument(
+        "--min-partitions", type=int, default=2, help="Partitions before early stopping"
+    )
+    argp.add_argument("--bootstrap", type=int, default=200, help="Bootstrap resamples")
+    argp.add_argument("--seed", type=int, default=0, help="Sampling seed for --approx")
+    argp.add_argument(
+        "--export-matrices",
+        type=Path,
+        default=None,
+        metavar="DIR",
+        help="Write each partition's X / y / index columns (.npy + schema.json) to DIR/<city>",
+    )
     args = argp.parse_args()
+    if args.approx and args.block_members:
+        argp.error("--approx and --block-members are mutually exclusive")
+    if args.export_matrices and args.block_members:
+        argp.error("--export-matrices needs full matrices: drop --block-members")
 
     city = args.city
     algo_list = args.algo
     n_members = args.members
 
-    print("Generating files with TOP users …")
-    run_best_user_script(n_members)
-    print("Done.\n")
+    # --approx: вибірки замість top-N, метрики з bootstrap-інтервалами
+    sampler = estimator = None
+    if args.approx:
+        from .approx import ApproxSampler, BootstrapEstimator, member_counts
+
+        sampler = ApproxSampler(args.approx_members, args.approx_events, seed=args.seed)
+        estimator = BootstrapEstimator(args.bootstrap, seed=args.seed)
 
     # ── зчитування json ───────────────────────────────────────────
     city_dir = DATA_DIR / city
-    group_members, group_events, event_group = load_groups(
-        city_dir / "group_members.json",
-        city_dir / "group_events.json",
-    )
-    repo = {
-        "events_info": load_events(city_dir / "events_info.json"),
-        "members_info": load_members(city_dir / "members_info.json"),
-        "members_events": load_rsvps(city_dir / "rsvp_events.json"),
-        "group_events": group_events,
-        "group_members": group_members,
-        "event_group": event_group,
-    }
+    repo = load_repo(city_dir)
+    activity = repo["activity"]
 
-    # ── контейнер для всіх sim-score ──────────────────────────────
-    simscores_all: Dict[str, Dict[str, Dict[str, float]]] = defaultdict(
-        lambda: defaultdict(dict)
+    # ── кеш матриць score-ів ───────────────────────────────────────
+    cache = None if args.no_cache else ScoreCache(
+        args.cache_dir, max_bytes=args.cache_size_mb * 1024**2
     )
+    fingerprint = fingerprint_files(city_dir.glob("*.json"))
+
+    # ── score-матриці поточної partition: фіча → [members × events] ─
+    simscores_all: Dict[str, np.ndarray] = {}
+    cache_keys: Dict[str, str] = {}
+
+    # ── чекпойнти partition-ів ─────────────────────────────────────
+    config = {
+        "city": city,
+        "algo": algo_list,
+        "members": n_members,
+        "block_members": args.block_members,
+        "approx": [args.approx_members, args.approx_events, args.seed] if args.approx else None,
+        "features": [[name, spec.params] for name, spec in FEATURES.items()],
+    }
+    if args.block_members:
+        # блоки подій і кількість проходів partial_fit змінюють навчені моделі
+        config.update(block_events=args.block_events, epochs=args.epochs)
+
+    # у --approx лічильники bootstrap живуть лише в памʼяті: без чекпойнтів,
+    # і каталог точного запуску (з його manifest) лишається недоторканим
+    checkpoint = None
+    if sampler is None:
+        try:
+            checkpoint = PartitionCheckpoint(
+                args.checkpoint_dir / city, fingerprint, config, resume=args.resume
+            )
+        except CheckpointMismatch as exc:
+            argp.error(f"{exc}; run without --resume to start over")
 
     # ── часові «partition» -и ──────────────────────────────────────
+    windows = WindowEngine(repo)
     ts_start, ts_end = 1_262_304_000, 1_388_534_400        # 2010-01-01 .. 2014-01-01
-    for part_no, ts in enumerate(sorted(get_timestamps(ts_start, ts_end), reverse=True), 1):
-        win_start, win_end = ts - TRAIN_INTERVAL, ts + TRAIN_INTERVAL
-
-        # TOP-користувачів для цього вікна читаємо з готового .txt
-        best_file = (
-            SCRIPTS_DIR
-            / f"{city}_best_users_{win_start}_{win_end}.txt"
-        )
-        test_members = best_file.read_text(encoding="utf-8").split()[:n_members]
-
-        # train / test репозиторії
-        train_repo, test_repo = get_partitioned_repo_wrapper(ts, repo)
-
-        # залишаємо лише тих test-користувачів, що мають історію у train-часі
-        test_members = list(set(test_members) & set(train_repo["members_events"]))
-
-        print(f"\n▁▁ Partition #{part_no}: {dt.datetime.utcfromtimestamp(ts)!s} ▔▔")
-
-        # базові рекомендації
-        run_content(train_repo, test_repo, simscores_all["content"], test_members)
-        run_location(train_repo, test_repo, simscores_all["location"], test_members)
-        run_group_freq(train_repo, test_repo, simscores_all["group"], test_members)
-
-        # learning-to-rank
-        l2r = LearningToRank()
-        l2r.learn(
-            simscores=simscores_all,
-            test_events=list(test_repo["events_info"]),
-            all_members_rsvp=test_repo["members_events"],
-            test_members=test_members,
-            log_fh=open("results.log", "a", encoding="utf-8"),
-            algo_list=algo_list,
-            n_members=n_members,
-            partition_number=part_no,
-        )
+    with (
+        open("results.log", "a", encoding="utf-8") as log_fh,
+        StageExecutor(args.executor, args.workers) as executor,
+        PlotWorker() if not args.no_plots else nullcontext() as plots,
+    ):
+        for part_no, ts in enumerate(sorted(get_timestamps(ts_start, ts_end), reverse=True), 1):
+            win_start, win_end = ts - TRAIN_INTERVAL, ts + TRAIN_INTERVAL
+            print(f"\n▁▁ Partition #{part_no}: {dt.datetime.utcfromtimestamp(ts)!s} ▔▔")
+
+            done = checkpoint.load(part_no, ts) if checkpoint is not None else None
+            if done is not None:
+                for algo, (pr, rc, f1) in done["metrics"].items():
+                    print(f"{algo:<12} →  Precision {pr:.3f}  Recall {rc:.3f}  F1 {f1:.3f}  (checkpoint)")
+                continue
+
+            # train / test репозиторії (test-вікно попередньої partition = цей train)
+            train_repo, test_repo = windows.partition(ts)
+            test_events = list(test_repo["events_info"])
+
+            if sampler is not None:
+                # стратифікована вибірка з усіх користувачів з історією у train;
+                # події — усі з позитивами вибірки + частка решти
+                test_members, member_weights = sampler.members(*activity.active(win_start, ts), ts)
+                positives = {
+                    e_id for m in test_members for e_id in test_repo["members_events"].get(m, ())
+                }
+                test_events, event_weights = sampler.events(test_events, positives, ts)
+                n_members = len(test_members)
+            else:
+                # TOP-користувачі вікна (як у scripts.script) — з індексу активності
+                test_members = activity.top(win_start, win_end, n_members)
+
+                # залишаємо лише тих test-користувачів, що мають історію у train-часі
+                # (у порядку активності — розбиття 80/20 відтворюване між запусками)
+                test_members = activity.with_history(test_members, win_start, ts)
+
+            l2r = LearningToRank(plotter=plots)
+
+            if args.block_members:
+                # блоковий режим: без повних матриць, без кешу score-ів
+                engine = BlockEngine(
+                    block_scorers(train_repo, test_repo),
+                    member_block=args.block_members,
+                    event_block=args.block_events,
+                )
+                metrics = l2r.learn_blocks(
+                    engine,
+                    test_events=test_events,
+                    all_members_rsvp=test_repo["members_events"],
+                    test_members=test_members,
+                    log_fh=log_fh,
+                    algo_list=algo_list,
+                    n_members=n_members,
+                    partition_number=part_no,
+                    plot=not args.no_plots,
+                    epochs=args.epochs,
+                )
+                checkpoint.save(part_no, ts, metrics, l2r.importances)
+                continue
+
+            # базові рекомендації: з кешу або паралельно у виконавці
+            tasks = {}
+            for name, spec in FEATURES.items():
+                key = make_key(
+                    city, win_start, win_end, spec.cache_name, spec.params, fingerprint,
+                    sample=config["approx"],
+                )
+                matrix = cache.get(key, test_members, test_events) if cache else None
+                if matrix is not None:
+                    simscores_all[name] = matrix
+                    continue
+                tasks[name] = (
+                    feature_matrix,
+                    (name, train_repo, test_repo, test_members, test_events),
+                    {},
+                )
+                cache_keys[name] = key
+
+            for name, (scores, seconds) in executor.run(tasks).items():
+                simscores_all[name] = scores
+                print(f"  {name:<12} {seconds:7.2f} s")
+                if cache is not None:
+                    cache.put(cache_keys[name], test_members, test_events, scores)
+            # порядок ознак (стовпців X) — як у FEATURES
+            simscores_all = {name: simscores_all[name] for name in FEATURES}
+
+            if args.export_matrices is not None:
+                from .columnar import write_partition
+
+                write_partition(
+                    args.export_matrices / city,
+                    part_no,
+                    ts,
+                    test_members,
+                    test_events,
+                    simscores_all,
+                    test_repo["members_events"],
+                    train_members=int(0.8 * n_members),
+                    meta={"city": city, "window": [win_start, win_end]},
+                )
+
+            # learning-to-rank
+            metrics = l2r.learn(
+                simscores=simscores_all,
+                test_events=test_events,
+                all_members_rsvp=test_repo["members_events"],
+                test_members=test_members,
+                log_fh=log_fh,
+                algo_list=algo_list,
+                n_members=n_members,
+                partition_number=part_no,
+                plot=not args.no_plots,
+            )
+
+            if estimator is not None:
+                split = int(0.8 * n_members)
+                # позитиви тестових користувачів: у вибірці подій є всі їхні RSVP вікна
+                n_positive = activity.counts(ts, win_end, activity.rows(test_members[split:]))
+                for algo, preds in l2r.predictions.items():
+                    estimator.add(
+                        algo,
+                        member_counts(
+                            test_members[split:],
+                            test_events,
+                            test_repo["members_events"],
+                            preds,
+                            event_weights,
+                            n_positive,
+                        ),
+                        member_weights[split:],
+                    )
+                print("\n".join(estimator.report()))
+                if part_no >= args.min_partitions and estimator.converged(args.ci_width):
+                    print(f"F1 CI width ≤ {args.ci_width}: stopping after {part_no} partitions")
+                    break
+                continue
+
+            checkpoint.save(
+                part_no,
+                ts,
+                metrics,
+                l2r.importances,
+                scores=simscores_all if args.checkpoint_scores else None,
+                members=test_members,
+                events=test_events,
+            )
+
+    print(f"windows: {windows.built} built, {windows.reused} reused")
+    if cache is not None:
+        print(cache.stats())
 
 
 if __name__ == "__main__":
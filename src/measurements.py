@@ -1,6 +1,6 @@
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple
+from typing import Dict, List, Sequence, Tuple
 
 
 @dataclass
@@ -27,19 +27,22 @@ def recommendation_measurement(
     test_members_sorted_events: Dict[str, List[Tuple[str, float]]],
     all_members_rsvpd_events: Dict[str, List[str]],
     test_members: List[str],
+    rsvp_counts: Sequence[int] | None = None,
 ) -> None:
     """
     Оцінює точність рекомендацій:
     - test_members_sorted_events: {member_id: [(event_id, score), …]} (відсортовано за score)
     - all_members_rsvpd_events:  {member_id: [event_id, …]}  (факт «yes» RSVP)
     - test_members:              список member_id, для яких міряємо точність
+    - rsvp_counts:               кількість RSVP кожного з test_members у тестовому
+                                 інтервалі (ActivityIndex.counts); None — len(…)
     """
-    for member_id in test_members:
+    for pos, member_id in enumerate(test_members):
         accuracy = member_feature_accuracy[member_id]
 
         # Скільки подій користувач реально відвідав у тестовому інтервалі
         rsvpd_events = all_members_rsvpd_events.get(member_id, [])
-        union_size = len(rsvpd_events)
+        union_size = len(rsvpd_events) if rsvp_counts is None else int(rsvp_counts[pos])
 
         # Топ-N рекомендацій, де N = |RSVP|
         top_events = test_members_sorted_events.get(member_id, [])[-union_size:]
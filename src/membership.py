@@ -0,0 +1,95 @@
+"""
+Індекс членства користувачів у групах.
+
+`group_members.json` ({group_id: [member_id, …]}) перетворюється на
+розріджену бінарну матрицю member × group у CSR-вигляді (відсортовані
+індекси в кожному рядку), тож:
+
+• «чи є користувач у групі» — пошук у короткому відсортованому рядку;
+• «членство для members × candidate-групи» — одна векторизована вибірка.
+
+Індекс будується один раз на місто (у `main.load_repo`) і без змін
+передається в train / test репозиторії.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List
+
+import numpy as np
+import scipy.sparse as sp
+
+
+class MembershipIndex:
+    """Бінарна CSR-матриця member × group + словники id → рядок / стовпець."""
+
+    def __init__(
+        self,
+        member_index: Dict[str, int],
+        group_index: Dict[str, int],
+        matrix: sp.csr_matrix,
+    ) -> None:
+        self.member_index = member_index
+        self.group_index = group_index
+        self.matrix = matrix
+
+    @classmethod
+    def from_group_members(
+        cls, group_members: Dict[str, List[str]]
+    ) -> "MembershipIndex":
+        member_index: Dict[str, int] = {}
+        group_index: Dict[str, int] = {}
+        rows, cols = [], []
+        for g_id, members in group_members.items():
+            g_col = group_index.setdefault(g_id, len(group_index))
+            for m_id in members:
+                rows.append(member_index.setdefault(m_id, len(member_index)))
+                cols.append(g_col)
+
+        matrix = sp.csr_matrix(
+            (np.ones(len(rows), dtype=bool), (rows, cols)),
+            shape=(len(member_index), len(group_index)),
+        )
+        matrix.sum_duplicates()      # дублікати в json → одна одиниця
+        matrix.sort_indices()
+        return cls(member_index, group_index, matrix)
+
+    # ------------------------------------------------------------------ #
+    def member_rows(self, member_ids: Iterable[str]) -> np.ndarray:
+        """Рядки користувачів; -1 для невідомих."""
+        return np.fromiter(
+            (self.member_index.get(m_id, -1) for m_id in member_ids), dtype=np.int64
+        )
+
+    def group_cols(self, group_ids: Iterable[str | None]) -> np.ndarray:
+        """Стовпці груп; -1 для невідомих / None."""
+        return np.fromiter(
+            (self.group_index.get(g_id, -1) for g_id in group_ids), dtype=np.int64
+        )
+
+    def is_member(self, member_id: str, group_id: str) -> bool:
+        m_row = self.member_index.get(member_id)
+        g_col = self.group_index.get(group_id)
+        if m_row is None or g_col is None:
+            return False
+        start, end = self.matrix.indptr[m_row], self.matrix.indptr[m_row + 1]
+        row = self.matrix.indices[start:end]
+        pos = np.searchsorted(row, g_col)
+        return bool(pos < len(row) and row[pos] == g_col)
+
+    def lookup(self, member_rows: np.ndarray, group_cols: np.ndarray) -> np.ndarray:
+        """Булева матриця [len(member_rows) × len(group_cols)]; -1 → False."""
+        out = np.zeros((len(member_rows), len(group_cols)), dtype=bool)
+        known_m = member_rows >= 0
+        known_g = group_cols >= 0
+        if known_m.any() and known_g.any():
+            block = self.matrix[member_rows[known_m]][:, group_cols[known_g]]
+            out[np.ix_(known_m, known_g)] = block.toarray()
+        return out
+
+    def groups_of(self, member_id: str) -> np.ndarray:
+        """Стовпці груп, у яких складається користувач."""
+        m_row = self.member_index.get(member_id)
+        if m_row is None:
+            return np.empty(0, dtype=self.matrix.indices.dtype)
+        return self.matrix.indices[self.matrix.indptr[m_row]:self.matrix.indptr[m_row + 1]]
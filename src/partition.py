@@ -1,6 +1,8 @@
-import bisect
-from collections import defaultdict
-from typing import Dict, List, Tuple
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Set, Tuple
+
+from .records import EventTable, MemberTable
 
 # ──────────────────────────────────────────────────────────────
 # 1. Допоміжні утиліти
@@ -20,13 +22,13 @@ TRAIN_INTERVAL = seconds_in_days(182)
 # ──────────────────────────────────────────────────────────────
 # 2. Генерація «контрольних» timestamp-ів
 # ──────────────────────────────────────────────────────────────
-def get_timestamps(start: int, end: int) -> List[int]:
+def get_timestamps(start: int, end: int, interval: int = TRAIN_INTERVAL) -> List[int]:
     """
     Генерує послідовність timestamp-ів:
-    start, start+Δ, start+2Δ, …  <  end-2Δ, де Δ = TRAIN_INTERVAL.
+    start, start+Δ, start+2Δ, …  <  end-2Δ, де Δ = interval (TRAIN_INTERVAL).
     """
     return list(
-        range(start, end - 2 * TRAIN_INTERVAL, TRAIN_INTERVAL)
+        range(start, end - 2 * interval, interval)
     )
 
 
@@ -36,41 +38,80 @@ def get_timestamps(start: int, end: int) -> List[int]:
 Repo = Dict[str, Dict]  # умовний тип для стислості
 
 
-def get_partitioned_repo_wrapper(ts: int, repo: Repo) -> Tuple[Repo, Repo]:
+def get_partitioned_repo_wrapper(
+    ts: int, repo: Repo, interval: int = TRAIN_INTERVAL
+) -> Tuple[Repo, Repo]:
     """Обгортка, що формує train- та test-репозиторії навколо `ts`."""
-    train_repo = _partition_repo(repo, ts - TRAIN_INTERVAL, ts)
-    test_repo = _partition_repo(repo, ts, ts + TRAIN_INTERVAL)
+    train_repo = _partition_repo(repo, ts - interval, ts)
+    test_repo = _partition_repo(repo, ts, ts + interval)
     return train_repo, test_repo
 
 
+class WindowEngine:
+    """
+    Переносить побудовані вікна між сусідніми partition-ами.
+
+    Partition `ts` має train [ts-Δ, ts] і test [ts, ts+Δ], тож test-вікно
+    однієї partition — це train-вікно наступної (і навпаки при зворотному
+    порядку).  Готові вікна (події, історії користувачів, групи) тримаються
+    в LRU-кеші, і кожне вікно розбивається лише раз.  Похідні дані, що не
+    залежать від вікна (токени описів, індекс членства, нумерація Catalog,
+    лічильники популярності), спільні через repo.
+    """
+
+    def __init__(self, repo: Repo, capacity: int | None = 3) -> None:
+        self.repo = repo
+        # пара вікон поточної partition + нове вікно наступної, доки спільне
+        # ще не витіснено; None — без обмеження (sweep)
+        self.capacity = capacity
+        self._windows: "OrderedDict[Tuple[int, int], Repo]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.built = 0
+        self.reused = 0
+
+    def window(self, start: int, end: int) -> Repo:
+        with self._lock:
+            key = (start, end)
+            if key in self._windows:
+                self._windows.move_to_end(key)
+                self.reused += 1
+                return self._windows[key]
+
+            window = _partition_repo(self.repo, start, end)
+            self.built += 1
+            self._windows[key] = window
+            if self.capacity is not None and len(self._windows) > self.capacity:
+                self._windows.popitem(last=False)
+            return window
+
+    def partition(self, ts: int, interval: int = TRAIN_INTERVAL) -> Tuple[Repo, Repo]:
+        """Те саме, що get_partitioned_repo_wrapper, але з перевикористанням вікон."""
+        return self.window(ts - interval, ts), self.window(ts, ts + interval)
+
+
 def _partition_repo(repo: Repo, start: int, end: int) -> Repo:
     """
     Витягує підмножини подій, учасників і груп,
     що потрапляють у часовий проміжок [start, end].
     """
-    # 1) Події у діапазоні
-    events_info_all: Dict[str, Dict] = repo["events_info"]
-    events_info = {
-        e_id: info
-        for e_id, info in events_info_all.items()
-        if start <= info["time"] <= end
-    }
-    event_ids: List[str] = sorted(events_info.keys())
+    # 1) Події у діапазоні (векторизоване порівняння колонки time)
+    events_info: EventTable = repo["events_info"].window(start, end)
+    in_window: Set[str] = set(events_info.ids)
 
     # 2) Членство користувачів (member → [event_id, …])
     member_events_all: Dict[str, List[str]] = repo["members_events"]
     members_events = {
-        m_id: _intersect_sorted(event_ids, evt_list)
+        m_id: new
         for m_id, evt_list in member_events_all.items()
-        if (new := _intersect_sorted(event_ids, evt_list))
+        if (new := [e_id for e_id in evt_list if e_id in in_window])
     }
 
     # 3) Події груп (group → [event_id, …])
     group_events_all: Dict[str, List[str]] = repo["group_events"]
     group_events = {
-        g_id: _intersect_sorted(event_ids, evt_list)
+        g_id: new
         for g_id, evt_list in group_events_all.items()
-        if (new := _intersect_sorted(event_ids, evt_list))
+        if (new := [e_id for e_id in evt_list if e_id in in_window])
     }
 
     # 4) Зворотна відповідність event → group
@@ -82,17 +123,22 @@ def _partition_repo(repo: Repo, start: int, end: int) -> Repo:
     }
 
     # 5) Інформація про користувачів
-    members_info_all: Dict[str, Dict] = repo["members_info"]
-    members_info = {
-        m_id: members_info_all[m_id] for m_id in members_events
-    }
+    members_info_all: MemberTable = repo["members_info"]
+    members_info = members_info_all.take(members_info_all.rows(members_events))
 
+    # 6) Членство в групах не залежить від часу — передаємо як є
     return {
         "events_info": events_info,
         "members_events": defaultdict(list, members_events),
         "members_info": members_info,
         "group_events": group_events,
+        "group_members": repo["group_members"],
+        "membership": repo["membership"],
         "event_group": event_group,
+        "tokens": repo.get("tokens"),
+        "catalog": repo["catalog"],
+        "popularity": repo["popularity"],
+        "window": (start, end),
     }
 
 
@@ -112,20 +158,7 @@ def get_member_events_dict_in_range(
 def _filter_events_by_time(
     repo: Repo, events: List[str], start: int, end: int
 ) -> List[str]:
-    events_info = repo["events_info"]
-    return [
-        e_id
-        for e_id in events
-        if start <= events_info[e_id]["time"] <= end
-    ]
-
-
-def _intersect_sorted(big: List[str], small: List[str]) -> List[str]:
-    """Швидке перетинання: big має бути відсортованим."""
-    return [x for x in small if _binary_search(big, x)]
-
-
-def _binary_search(lst: List[str], item: str) -> bool:
-    """Замінено на bisect: O(log n)."""
-    idx = bisect.bisect_left(lst, item)
-    return idx < len(lst) and lst[idx] == item
+    events_info: EventTable = repo["events_info"]
+    times = events_info.time[events_info.rows(events)]
+    keep = (times >= start) & (times <= end)
+    return [e_id for e_id, ok in zip(events, keep) if ok]
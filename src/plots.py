@@ -0,0 +1,81 @@
+"""
+Графіки важливості ознак поза критичним шляхом partition.
+
+LearningToRank лише збирає панелі (підпис, важливості, назви ознак,
+subplot) — малі списки чисел.  Рендер і запис PNG робить один фоновий
+потік `PlotWorker`: matplotlib імпортується лише в ньому, а кожен графік
+будується на власному `Figure` (без глобального стану pyplot), тож цикл
+partition не чекає на savefig.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from pathlib import Path
+from typing import Any, List, Tuple
+
+FIGURES_DIR = Path("figures/feature_importance")
+
+# (підпис моделі, важливості ознак, назви ознак, код subplot)
+Panel = Tuple[str, List[float], List[str], int]
+
+
+def figure_path(partition_number: int) -> Path:
+    return FIGURES_DIR / f"{partition_number}_partition.png"
+
+
+def render_importances(path: Path, panels: List[Panel]) -> None:
+    """Bar-chart важливості ознак: одна панель на модель."""
+    import numpy as np
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    for name, importances, feature_names, subplot_pos in panels:
+        ax = fig.add_subplot(subplot_pos)
+        ax.set_title(f"{name} – feature importance")
+        bars = ax.bar(
+            np.arange(len(importances)),
+            importances,
+            color="steelblue",
+        )
+        ax.set_xticks(np.arange(len(importances)))
+        ax.set_xticklabels(feature_names, rotation=60, ha="right")
+        ax.bar_label(bars, fmt="%.2f")
+
+    fig.tight_layout()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(path)
+
+
+class PlotWorker:
+    """Фоновий потік, що рендерить графіки з черги у порядку надходження."""
+
+    def __init__(self) -> None:
+        self._queue: "queue.Queue[Tuple[Path, List[Panel]] | None]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="plots", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "PlotWorker":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def submit(self, path: Path, panels: List[Panel]) -> None:
+        self._queue.put((path, panels))
+
+    def close(self) -> None:
+        """Дочекатися всіх графіків і зупинити потік."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self) -> None:
+        while (item := self._queue.get()) is not None:
+            path, panels = item
+            try:
+                render_importances(path, panels)
+            except Exception:                       # графік не має зупиняти пайплайн
+                logging.exception("Failed to render %s", path)
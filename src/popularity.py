@@ -0,0 +1,89 @@
+"""
+Кумулятивні лічильники RSVP по групах у часі.
+
+Події кожної групи впорядковані за часом, і для всіх груп разом зберігається
+один масив префіксних сум RSVP.  Ключ сортування — (група, час) у одному
+int64 (група у старших 32 бітах), тож «RSVP подій групи g з часом у
+[start, end]» — два `searchsorted` і різниця префіксних сум, векторизовано
+для будь-якого набору груп і будь-якої межі вікна.
+
+Індекс будується один раз на місто (у `main.load_repo`) і без змін
+передається в train / test репозиторії.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from .records import EventTable
+
+_TIME_BITS = 32
+
+
+class PopularityIndex:
+    """Відсортовані ключі (група, час) + префіксні суми RSVP."""
+
+    def __init__(
+        self,
+        group_index: Dict[str, int],
+        keys: np.ndarray,
+        cum_rsvps: np.ndarray,
+        t0: int,
+    ) -> None:
+        self.group_index = group_index
+        self.keys = keys
+        self.cum_rsvps = cum_rsvps      # len(keys) + 1, cum_rsvps[0] = 0
+        self.t0 = t0
+
+    @classmethod
+    def build(
+        cls,
+        events_info: EventTable,
+        members_events: Dict[str, List[str]],
+        event_group: Dict[str, str],
+    ) -> "PopularityIndex":
+        rsvps = np.bincount(
+            events_info.rows(
+                (e_id for events in members_events.values() for e_id in events),
+                skip_missing=True,
+            ),
+            minlength=len(events_info),
+        )
+
+        group_index: Dict[str, int] = {}
+        groups = np.fromiter(
+            (
+                group_index.setdefault(g_id, len(group_index)) if g_id else -1
+                for g_id in (event_group.get(e_id) for e_id in events_info.ids)
+            ),
+            dtype=np.int64,
+            count=len(events_info),
+        )
+        rows = np.flatnonzero(groups >= 0)
+        t0 = int(events_info.time.min()) if len(events_info) else 0
+
+        keys = (groups[rows] << _TIME_BITS) | (events_info.time[rows] - t0)
+        order = np.argsort(keys, kind="stable")
+        cum_rsvps = np.concatenate(([0], np.cumsum(rsvps[rows][order])))
+        return cls(group_index, keys[order], cum_rsvps, t0)
+
+    # ------------------------------------------------------------------ #
+    def group_cols(self, group_ids: Iterable[str | None]) -> np.ndarray:
+        """Номери груп; -1 для невідомих / None."""
+        return np.fromiter(
+            (self.group_index.get(g_id, -1) for g_id in group_ids), dtype=np.int64
+        )
+
+    def _bound(self, group_cols: np.ndarray, ts: int, side: str) -> np.ndarray:
+        offset = np.clip(ts - self.t0, 0, (1 << _TIME_BITS) - 1)
+        return np.searchsorted(self.keys, (group_cols << _TIME_BITS) | offset, side=side)
+
+    def rsvps(self, group_cols: np.ndarray, start: int, end: int) -> np.ndarray:
+        """RSVP подій кожної групи з часом у [start, end] (порожнє вікно → 0)."""
+        if end < self.t0 or end < start:
+            return np.zeros(len(group_cols), dtype=np.int64)
+        lo = self._bound(group_cols, start, "left")
+        hi = self._bound(group_cols, end, "right")
+        return self.cum_rsvps[hi] - self.cum_rsvps[lo]
@@ -1,7 +1,16 @@
 import json
+import re
+from array import array
 from collections import defaultdict
+from itertools import count
 from pathlib import Path
-from typing import Any, DefaultDict, Dict, List, Tuple
+from typing import Any, DefaultDict, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from .records import EventTable, MemberTable
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
 
 
 def read_json(path: Path) -> Dict[str, Any]:
@@ -16,6 +25,76 @@ def read_json(path: Path) -> Dict[str, Any]:
         return {}
 
 
+def iter_json_object(path: Path, chunk_size: int = 1 << 20) -> Iterator[Tuple[str, Any]]:
+    """
+    Пари (ключ, значення) json-обʼєкта верхнього рівня по одній: файл
+    читається шматками по `chunk_size` символів, у памʼяті — лише поточний
+    шматок і поточне значення.  Значення, що не вмістилося в буфер,
+    декодується заново після дочитування, тож буфер щоразу щонайменше
+    подвоюється — сумарна робота лінійна за розміром значення.
+    Відсутній файл → порожньо; зламаний json → json.JSONDecodeError.
+    """
+    decoder = json.JSONDecoder()
+    try:
+        fh = open(path, encoding="utf-8")
+    except FileNotFoundError:
+        return
+
+    with fh:
+        buf, pos, eof = "", 0, False
+
+        def fill(grow: bool = False) -> None:
+            """Дочитує шматок; `grow` — не менше, ніж уже є в буфері від pos."""
+            nonlocal buf, pos, eof
+            chunk = fh.read(max(chunk_size, len(buf) - pos) if grow else chunk_size)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+
+        def next_char() -> str:
+            """Перший непробільний символ (без зсуву pos); "" — кінець файлу."""
+            nonlocal pos
+            while True:
+                pos = _WHITESPACE.match(buf, pos).end()
+                if pos < len(buf) or eof:
+                    return buf[pos:pos + 1]
+                fill()
+
+        def expect(chars: str) -> str:
+            nonlocal pos
+            char = next_char()
+            if not char or char not in chars:
+                raise json.JSONDecodeError(f"Expecting one of {chars!r}", buf, pos)
+            pos += 1
+            return char
+
+        def value() -> Any:
+            nonlocal pos
+            next_char()
+            while True:
+                try:
+                    obj, end = decoder.raw_decode(buf, pos)
+                    # значення, що впирається в кінець шматка, могло обірватися
+                    if end < len(buf) or eof:
+                        pos = end
+                        return obj
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                fill(grow=True)
+
+        if next_char() == "":
+            return
+        expect("{")
+        if next_char() == "}":
+            return
+        while True:
+            key = value()
+            expect(":")
+            yield key, value()
+            if expect(",}") == "}":
+                return
+
+
 def load_groups(
     group_members_path: Path,
     group_events_path: Path,
@@ -41,29 +120,94 @@ def load_groups(
     return group_members, group_events, event_to_group
 
 
-def load_events(events_info_path: Path) -> Dict[str, Any]:
-    """Зчитує інформацію про події."""
-    return read_json(events_info_path)
+def load_events(events_info_path: Path) -> EventTable:
+    """Зчитує інформацію про події у компактну колонкову таблицю."""
+    return EventTable.from_dict(read_json(events_info_path))
 
 
-def load_members(members_info_path: Path) -> Dict[str, Any]:
+def load_members(members_info_path: Path) -> MemberTable:
     """Зчитує координати / профілі користувачів."""
-    return read_json(members_info_path)
+    return MemberTable.from_dict(read_json(members_info_path))
 
 
-def load_rsvps(rsvp_path: Path) -> Dict[str, List[str]]:
+class RsvpIndex:
     """
-    Перетворює структуру {event_id: [member_id, …]}
-    на {member_id: [event_id, …]}
+    RSVP міста в обох напрямках як CSR-масиви int32:
+
+    • event → members: event_ptr / event_members (порядок файлу);
+    • member → events: member_ptr / member_events (події в порядку файлу).
+
+    Будується одним потоковим проходом по rsvp_events.json: рядкові id
+    зберігаються лише раз (списки member_ids / event_ids), а проміжного
+    dict {event_id: [member_id, …]} немає.
     """
-    event_to_members: Dict[str, List[str]] = read_json(rsvp_path)
 
-    member_to_events: DefaultDict[str, List[str]] = defaultdict(list)
-    for event_id, member_ids in event_to_members.items():
-        for member_id in member_ids:
-            member_to_events[member_id].append(event_id)
+    def __init__(
+        self,
+        member_ids: List[str],
+        event_ids: List[str],
+        event_ptr: np.ndarray,
+        event_members: np.ndarray,
+    ) -> None:
+        self.member_ids = member_ids
+        self.event_ids = event_ids
+        self.event_ptr = event_ptr
+        self.event_members = event_members
+
+        # транспонування: стабільне сортування записів за користувачем
+        entry_event = np.repeat(
+            np.arange(len(event_ids), dtype=np.int32), np.diff(event_ptr)
+        )
+        order = np.argsort(event_members, kind="stable")
+        self.member_events = entry_event[order]
+        self.member_ptr = np.zeros(len(member_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(event_members, minlength=len(member_ids)), out=self.member_ptr[1:])
+
+    @classmethod
+    def from_json(cls, rsvp_path: Path) -> "RsvpIndex":
+        """Один потоковий прохід; невалідний json → порожній індекс (як read_json)."""
+        # новий member_id отримує наступний номер при першому зверненні
+        member_index: DefaultDict[str, int] = defaultdict(count().__next__)
+        event_ids: List[str] = []
+        event_ptr = array("q", [0])
+        event_members = array("i")
+        try:
+            for event_id, member_ids in iter_json_object(rsvp_path):
+                event_ids.append(event_id)
+                event_members.extend(map(member_index.__getitem__, member_ids))
+                event_ptr.append(len(event_members))
+        except json.JSONDecodeError:
+            member_index, event_ids = {}, []
+            event_ptr, event_members = array("q", [0]), array("i")
+
+        return cls(
+            list(member_index),
+            event_ids,
+            np.frombuffer(event_ptr, dtype=np.int64),
+            np.frombuffer(event_members, dtype=np.int32),
+        )
+
+    @property
+    def rsvp_counts(self) -> np.ndarray:
+        """Кількість RSVP кожної події (у порядку event_ids)."""
+        return np.diff(self.event_ptr)
+
+    def members_events(self) -> DefaultDict[str, List[str]]:
+        """{member_id: [event_id, …]} — та сама структура, що й раніше давав load_rsvps."""
+        event_ids, ptr = self.event_ids, self.member_ptr.tolist()
+        events = self.member_events.tolist()
+        member_to_events: DefaultDict[str, List[str]] = defaultdict(list)
+        for row, member_id in enumerate(self.member_ids):
+            member_to_events[member_id] = [event_ids[e] for e in events[ptr[row]:ptr[row + 1]]]
+        return member_to_events
+
 
-    return member_to_events
+def load_rsvps(rsvp_path: Path) -> Dict[str, List[str]]:
+    """
+    Перетворює структуру {event_id: [member_id, …]}
+    на {member_id: [event_id, …]} (потоково, через RsvpIndex)
+    """
+    return RsvpIndex.from_json(rsvp_path).members_events()
 
 
 # приклад використання
@@ -0,0 +1,120 @@
+"""
+Компактне зберігання навченого стану рекомендерів.
+
+• QuantizedRows — рядки профілів (TF-IDF користувачів) однією CSR:
+  indices int32, значення float16 або int8 з float32-масштабом рядка
+  (max |x| / 127).  `rows(idx)` повертає float32 CSR лише вибраних рядків,
+  тож оцінювання працює з блоком, не розпаковуючи всю матрицю.
+• RaggedArray — масиви змінної довжини (координати подій користувача)
+  одним float32 [n × d] + offsets.
+
+Обидва зберігають рядки в порядку додавання; відповідність id → рядок
+тримає власник (member_index).
+"""
+
+from __future__ import annotations
+
+from typing import List, Literal
+
+import numpy as np
+import scipy.sparse as sp
+
+ProfileDType = Literal["float32", "float16", "int8"]
+
+
+def _gather(indptr: np.ndarray, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(позиції ненульових елементів вибраних рядків, новий indptr)."""
+    starts, ends = indptr[rows], indptr[rows + 1]
+    lengths = ends - starts
+    new_indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=new_indptr[1:])
+    positions = np.arange(new_indptr[-1], dtype=np.int64) + np.repeat(
+        starts - new_indptr[:-1], lengths
+    )
+    return positions, new_indptr
+
+
+class QuantizedRows:
+    """CSR [n_rows × n_cols] з квантованими значеннями."""
+
+    def __init__(
+        self,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        data: np.ndarray,
+        scale: np.ndarray | None,
+        n_cols: int,
+    ) -> None:
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.scale = scale              # int8: float32 масштаб рядка, інакше None
+        self.n_cols = n_cols
+
+    @classmethod
+    def from_csr(cls, matrix: sp.spmatrix, dtype: ProfileDType = "float32") -> "QuantizedRows":
+        matrix = sp.csr_matrix(matrix)
+        matrix.sort_indices()
+        indptr = matrix.indptr.astype(np.int64)
+        data = matrix.data.astype(np.float32)
+        scale = None
+        if dtype == "int8":
+            lengths = np.diff(indptr)
+            row_max = np.zeros(matrix.shape[0], dtype=np.float32)
+            nonempty = lengths > 0
+            row_max[nonempty] = np.maximum.reduceat(np.abs(data), indptr[:-1][nonempty])
+            scale = np.where(row_max > 0, row_max / 127.0, 1.0).astype(np.float32)
+            data = np.rint(data / np.repeat(scale, lengths)).astype(np.int8)
+        elif dtype in ("float16", "float32"):
+            data = data.astype(dtype)
+        else:
+            raise ValueError(f"Unknown profile dtype: {dtype}")
+        return cls(indptr, matrix.indices.astype(np.int32), data, scale, matrix.shape[1])
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def rows(self, rows: np.ndarray) -> sp.csr_matrix:
+        """float32 CSR [len(rows) × n_cols]."""
+        rows = np.asarray(rows, dtype=np.int64)
+        positions, indptr = _gather(self.indptr, rows)
+        data = self.data[positions].astype(np.float32)
+        if self.scale is not None:
+            data *= np.repeat(self.scale[rows], np.diff(indptr))
+        return sp.csr_matrix(
+            (data, self.indices[positions], indptr), shape=(len(rows), self.n_cols)
+        )
+
+    @property
+    def nbytes(self) -> int:
+        scale = self.scale.nbytes if self.scale is not None else 0
+        return self.indptr.nbytes + self.indices.nbytes + self.data.nbytes + scale
+
+
+class RaggedArray:
+    """Рядки змінної довжини: values [total × d] + offsets [n + 1]."""
+
+    def __init__(self, values: np.ndarray, offsets: np.ndarray) -> None:
+        self.values = values
+        self.offsets = offsets
+
+    @classmethod
+    def from_arrays(cls, arrays: List[np.ndarray], dim: int, dtype=np.float32) -> "RaggedArray":
+        offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+        np.cumsum([len(a) for a in arrays], out=offsets[1:])
+        values = (
+            np.concatenate(arrays).astype(dtype, copy=False)
+            if arrays
+            else np.empty((0, dim), dtype=dtype)
+        )
+        return cls(values, offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row: int) -> np.ndarray:
+        return self.values[self.offsets[row]:self.offsets[row + 1]]
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.offsets.nbytes
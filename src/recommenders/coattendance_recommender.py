@@ -0,0 +1,163 @@
+from typing import Dict, List
+
+import numpy as np
+import scipy.sparse as sp
+
+# комірок у щільному блоці рядків при відборі top-k сусідів
+_BLOCK_CELLS = 1 << 22
+
+
+class CoAttendanceRecommender:
+    """
+    Колаборативна ознака на основі спільних RSVP.
+
+    Для train-вікна будується розріджена матриця event × member; події
+    згортаються до своїх груп (group × member), а схожість груп — кількість
+    спільних учасників, нормована як cosine.  Для кожної групи лишаються
+    лише top-k сусідів, тож памʼять лінійна за кількістю груп.
+
+    Candidate-події з test-вікна ще не мають RSVP (це мітки), тому
+    «сусідство» рахується між групами: score події = сума ваг сусідства
+    між її групою та групами, які користувач відвідував у train.
+    """
+
+    def __init__(self, top_k: int = 20) -> None:
+        self.top_k = top_k
+        self.group_index: Dict[str, int] = {}
+        self.member_index: Dict[str, int] = {}
+        # groups × groups, ≤ top_k ненульових у рядку
+        self.neighbors: sp.csr_matrix | None = None
+        # members × groups, частка подій користувача в кожній групі
+        self.profiles: sp.csr_matrix | None = None
+        self.catalog = None
+
+    # ------------------------------------------------------------------ #
+    # 1. Навчання: co-RSVP матриця → top-k сусідів
+    # ------------------------------------------------------------------ #
+    def fit(self, train_view: Dict) -> None:
+        member_events: Dict[str, List[str]] = train_view["members_events"]
+        event_group: Dict[str, str] = train_view["event_group"]
+        self.catalog = train_view["catalog"]
+
+        self.member_index = {m_id: i for i, m_id in enumerate(member_events)}
+        event_index: Dict[str, int] = {}
+        rows, cols = [], []
+        for m_id, events in member_events.items():
+            m_row = self.member_index[m_id]
+            for e_id in events:
+                if e_id in event_group:
+                    rows.append(event_index.setdefault(e_id, len(event_index)))
+                    cols.append(m_row)
+
+        # event × member (бінарна)
+        attend = sp.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(len(event_index), len(self.member_index)),
+        )
+
+        # group × event (індикатор належності події групі)
+        self.group_index = {}
+        ev_groups = np.fromiter(
+            (
+                self.group_index.setdefault(event_group[e_id], len(self.group_index))
+                for e_id in event_index
+            ),
+            dtype=np.int64,
+            count=len(event_index),
+        )
+        membership = sp.csr_matrix(
+            (np.ones(len(ev_groups), dtype=np.float32), (ev_groups, np.arange(len(ev_groups)))),
+            shape=(len(self.group_index), len(event_index)),
+        )
+
+        group_counts = (membership @ attend).tocsr()         # group × member (лічильники)
+        group_members = group_counts.copy()
+        group_members.data[:] = 1.0                          # бінаризуємо
+
+        co_rsvp = (group_members @ group_members.T).tocsr()  # спільні учасники
+        norms = np.sqrt(co_rsvp.diagonal())
+        co_rsvp.setdiag(0.0)
+        co_rsvp.eliminate_zeros()
+        co_rsvp = sp.diags(1.0 / np.maximum(norms, 1.0)) @ co_rsvp @ sp.diags(
+            1.0 / np.maximum(norms, 1.0)
+        )
+        self.neighbors = _top_k_per_row(co_rsvp.tocsr(), self.top_k)
+
+        member_groups = group_counts.T.tocsr()               # member × group
+        totals = np.asarray(member_groups.sum(axis=1)).ravel()
+        self.profiles = (
+            sp.diags(1.0 / np.maximum(totals, 1.0)) @ member_groups
+        ).tocsr().astype(np.float32)
+
+    # ------------------------------------------------------------------ #
+    # 2. Інференс
+    # ------------------------------------------------------------------ #
+    def score_matrix(self, member_idx: np.ndarray, event_idx: np.ndarray) -> np.ndarray:
+        """float32 [members × events]: один sparse-добуток profiles @ neighbors."""
+        cand_groups = np.fromiter(
+            (self.group_index.get(g_id, -1) for g_id in self.catalog.event_groups(event_idx)),
+            dtype=np.int64,
+            count=len(event_idx),
+        )
+        member_rows = np.fromiter(
+            (self.member_index.get(m_id, -1) for m_id in self.catalog.members(member_idx)),
+            dtype=np.int64,
+            count=len(member_idx),
+        )
+
+        scores = np.zeros((len(member_idx), len(event_idx)), dtype=np.float32)
+        known_m = np.flatnonzero(member_rows >= 0)
+        known_e = np.flatnonzero(cand_groups >= 0)
+        if len(known_m) and len(known_e):
+            group_scores = (self.profiles[member_rows[known_m]] @ self.neighbors).toarray()
+            scores[np.ix_(known_m, known_e)] = group_scores[:, cand_groups[known_e]]
+        return scores
+
+    def score_candidates(
+        self,
+        member_id: str,
+        candidate_events: List[str],
+        repo: Dict[str, Dict],
+        sim_scores: Dict[str, Dict[str, float]],
+    ) -> None:
+        """Записує co-attendance score у sim_scores[member_id][event_id]."""
+        if member_id not in self.member_index:
+            return
+
+        scores = self.score_matrix(
+            self.catalog.member_rows([member_id]), self.catalog.event_rows(candidate_events)
+        )[0]
+        user_dict = sim_scores.setdefault(member_id, {})
+        for e_id, score in zip(candidate_events, scores):
+            user_dict[e_id] = float(score)
+
+
+def _top_k_per_row(matrix: sp.csr_matrix, k: int) -> sp.csr_matrix:
+    """
+    Лишає у кожному рядку CSR-матриці не більше k найбільших значень.
+    Рядки довші за k обробляються блоками: значення блоку вирівнюються в
+    щільний масив [рядки × найдовший рядок] (доповнення −inf), і top-k —
+    один `argpartition` по осі рядка, як `export.top_k`.
+    """
+    indptr, indices, data = matrix.indptr, matrix.indices, matrix.data
+    lengths = np.diff(indptr)
+    row_ids = np.repeat(np.arange(matrix.shape[0]), lengths)
+    keep = lengths[row_ids] <= k if k > 0 else np.zeros(len(data), dtype=bool)
+
+    long_rows = np.flatnonzero(lengths > k) if k > 0 else np.empty(0, dtype=np.int64)
+    if len(long_rows):
+        block = max(1, _BLOCK_CELLS // int(lengths[long_rows].max()))
+        for start in range(0, len(long_rows), block):
+            rows = long_rows[start:start + block]
+            width = np.arange(lengths[rows].max())
+            pos = indptr[rows][:, None] + width
+            values = np.where(
+                width < lengths[rows][:, None], data[np.minimum(pos, len(data) - 1)], -np.inf
+            )
+            top = np.argpartition(-values, k - 1, axis=1)[:, :k]
+            keep[np.take_along_axis(pos, top, axis=1).ravel()] = True
+
+    return sp.csr_matrix(
+        (data[keep].astype(np.float32), (row_ids[keep], indices[keep])),
+        shape=matrix.shape,
+    )
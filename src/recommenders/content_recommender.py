@@ -1,56 +1,134 @@
-from collections import defaultdict
 from typing import Dict, List
 
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+from ..quantize import ProfileDType, QuantizedRows
+from ..records import EventTable
+
+
+class TokenCache:
+    """
+    Базові токени описів (lowercase + token_pattern TfidfVectorizer),
+    ключ — індекс опису в спільному пулі EventTable.  Токени не залежать
+    від вікна чи ngram_range, тож кеш живе весь час роботи з містом
+    (передається у train / test репозиторії як repo["tokens"]), і кожен
+    опис токенізується лише раз на всі partition.
+    """
+
+    def __init__(self) -> None:
+        base = TfidfVectorizer()
+        self._preprocess = base.build_preprocessor()
+        self._tokenize = base.build_tokenizer()
+        self._by_desc: Dict[int, List[str]] = {}
+
+    def event_tokens(self, event_ids: List[str], events_info: EventTable) -> List[List[str]]:
+        cache = self._by_desc
+        out = []
+        for desc in events_info.desc_idx[events_info.rows(event_ids)].tolist():
+            tokens = cache.get(desc)
+            if tokens is None:
+                tokens = self._tokenize(self._preprocess(events_info.descriptions[desc]))
+                cache[desc] = tokens
+            out.append(tokens)
+        return out
+
+
+def _identity(doc: List[str]) -> List[str]:
+    """Аналізатор для вже підготовлених списків термів."""
+    return doc
+
+
+def analyze_tokens(
+    tokens: List[str],
+    ngram_range: tuple[int, int] = (1, 1),
+    stop_words: frozenset = ENGLISH_STOP_WORDS,
+) -> List[str]:
+    """Stop words + n-грами над кешованими токенами (як `_word_ngrams` у sklearn)."""
+    tokens = [t for t in tokens if t not in stop_words]
+    min_n, max_n = ngram_range
+    if max_n == 1:
+        return tokens
+
+    terms = list(tokens) if min_n == 1 else []
+    for n in range(max(min_n, 2), min(max_n + 1, len(tokens) + 1)):
+        for i in range(len(tokens) - n + 1):
+            terms.append(" ".join(tokens[i:i + n]))
+    return terms
+
 
 class ContentRecommender:
     """
     Формує TF-IDF простір за описами подій і обчислює
     подібність (cosine similarity) між користувачем та подіями.
+
+    Профілі користувачів — одна CSR (`profile_dtype`: float32 за
+    замовчуванням; float16 або int8 з масштабом рядка — компактніше, але
+    змінює score-и, тож вмикається явно через параметри ознаки).
     """
 
-    def __init__(self, ngram_range: tuple[int, int] = (1, 1)) -> None:
+    def __init__(
+        self,
+        ngram_range: tuple[int, int] = (1, 1),
+        profile_dtype: ProfileDType = "float32",
+    ) -> None:
+        # stop words і n-грами застосовуються у `_analyze` над кешованими
+        # токенами — результат той самий, що й analyzer="word" у TfidfVectorizer
+        self.ngram_range = ngram_range
+        self.stop_words = ENGLISH_STOP_WORDS
         self.vectorizer = TfidfVectorizer(
-            ngram_range=ngram_range,
-            analyzer="word",
+            analyzer=_identity,
             sublinear_tf=True,
             max_df=0.5,
-            stop_words="english",
             norm="l2",
         )
-        # member_id -> вектор користувача
-        self.training_vecs: Dict[str, np.ndarray] = {}
+        self.profile_dtype = profile_dtype
+        # member_id -> рядок профілю
+        self.member_index: Dict[str, int] = {}
+        self.profiles: QuantizedRows | None = None
+        self.catalog = None
+        self.tokens: TokenCache | None = None
+        # останній блок candidate-подій для score_matrix
+        self._block_idx: np.ndarray | None = None
+        self._block_vecs = None
 
     # --------------------------------------------------------------------- #
     # 1. Підготовка даних (корпус + вектори користувачів)
     # --------------------------------------------------------------------- #
-    @staticmethod
-    def _events_to_text(event_ids: List[str], events_info: Dict[str, Dict]) -> str:
-        """Об'єднує описи кількох подій в один текст."""
-        return " ".join(events_info[e_id]["description"] for e_id in event_ids)
+    def _analyze(self, tokens: List[str]) -> List[str]:
+        return analyze_tokens(tokens, self.ngram_range, self.stop_words)
 
-    def fit(self, member_events: Dict[str, List[str]], repo: Dict) -> None:
+    def fit(self, train_view: Dict) -> None:
         """
-        Створює словник TF-IDF і вектори користувачів.
-        `member_events` ‒ {member_id: [event_id, …]} для train-періоду.
+        Створює словник TF-IDF і вектори користувачів за
+        train_view["members_events"] ({member_id: [event_id, …]}).
         """
-        events_info = repo["events_info"]
+        member_events = train_view["members_events"]
+        events_info = train_view["events_info"]
+        self.catalog = train_view["catalog"]
+        self.tokens = token_cache = train_view.get("tokens") or TokenCache()
 
         # --- 1) формуємо «корпус» з усіх описів подій ---
+        member_tokens = {
+            member_id: token_cache.event_tokens(events, events_info)
+            for member_id, events in member_events.items()
+        }
         corpus = [
-            events_info[event_id]["description"]
-            for events in member_events.values()
-            for event_id in events
+            self._analyze(tokens)
+            for event_tokens in member_tokens.values()
+            for tokens in event_tokens
         ]
         self.vectorizer.fit(corpus)
 
-        # --- 2) вектор користувача = сума/конкатенація його подій ---
-        for member_id, events in member_events.items():
-            text = self._events_to_text(events, events_info)
-            self.training_vecs[member_id] = self.vectorizer.transform([text])
+        # --- 2) вектор користувача = конкатенація текстів його подій ---
+        docs = [
+            self._analyze([t for tokens in event_tokens for t in tokens])
+            for event_tokens in member_tokens.values()
+        ]
+        self.member_index = {member_id: row for row, member_id in enumerate(member_tokens)}
+        self.profiles = QuantizedRows.from_csr(self.vectorizer.transform(docs), self.profile_dtype)
 
     # --------------------------------------------------------------------- #
     # 2. Векторизація кандидат-подій
@@ -59,9 +137,16 @@ class ContentRecommender:
         self, event_ids: List[str], repo: Dict
     ) -> np.ndarray:
         """Повертає TF-IDF-матрицю для списку event_id."""
-        events_info = repo["events_info"]
-        texts = [events_info[e_id]["description"] for e_id in event_ids]
-        return self.vectorizer.transform(texts)
+        token_cache: TokenCache = repo.get("tokens") or TokenCache()
+        return self._vectorize(token_cache.event_tokens(event_ids, repo["events_info"]))
+
+    def _vectorize(self, event_tokens: List[List[str]]) -> np.ndarray:
+        return self.vectorizer.transform([self._analyze(tokens) for tokens in event_tokens])
+
+    def member_vectors(self, member_ids: List[str]) -> sp.csr_matrix:
+        """TF-IDF профілі користувачів (float32, з історії train)."""
+        index = self.member_index
+        return self.profiles.rows(np.fromiter((index[m_id] for m_id in member_ids), dtype=np.int64))
 
     # --------------------------------------------------------------------- #
     # 3. Обчислення score-ів / оновлення словника sim-scores
@@ -77,9 +162,29 @@ class ContentRecommender:
         Записує cosine-similarity для кожної події кандидата у `sim_scores`.
         `sim_scores` — зовнішній контейнер {member_id: {event_id: score}}.
         """
-        user_vec = self.training_vecs[member_id]          # (1  ×  d)
+        user_vec = self.member_vectors([member_id])      # (1  ×  d)
         scores = cosine_similarity(user_vec, candidate_vecs).flatten()
 
         user_dict = sim_scores.setdefault(member_id, {})
         for e_id, score in zip(candidate_events, scores):
             user_dict[e_id] = float(score)
+
+    def score_matrix(self, member_idx: np.ndarray, event_idx: np.ndarray) -> np.ndarray:
+        """
+        float32 [members × events]; користувачі без історії → 0.
+        TF-IDF блоку подій запамʼятовується, поки той самий блок подій
+        приходить з різними блоками користувачів.
+        """
+        if self._block_idx is None or not np.array_equal(event_idx, self._block_idx):
+            self._block_idx = event_idx
+            self._block_vecs = self._vectorize(
+                self.tokens.event_tokens(self.catalog.event_ids(event_idx), self.catalog.events)
+            )
+
+        member_ids = self.catalog.members(member_idx)
+        scores = np.zeros((len(member_ids), len(event_idx)), dtype=np.float32)
+        known = [row for row, m_id in enumerate(member_ids) if m_id in self.member_index]
+        if known:
+            user_vecs = self.member_vectors([member_ids[row] for row in known])
+            scores[known] = cosine_similarity(user_vecs, self._block_vecs)
+        return scores
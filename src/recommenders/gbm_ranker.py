@@ -0,0 +1,177 @@
+"""
+Gradient boosting на гістограмах ознак як мета-модель L2R.
+
+• float32-ознаки біняться (≤ 255 бінів) — навчання лінійне за кількістю
+  рядків і значно швидше за RF / MLP на великих матрицях members × events;
+• early stopping на відкладеній частині train;
+• `feature_importances_` — нормований сумарний gain сплітів по ознаці
+  (для графіку важливості, як у RF); якщо внутрішня структура дерев sklearn
+  недоступна — permutation_importance на підвибірці train;
+• `rank_by_member=True` — рядки групуються по користувачу (запит = member,
+  документи = candidate-події) і модель оптимізує ранжування (LambdaRank у
+  LightGBM, якщо його встановлено).  Клас 1 отримують top-k подій кожного
+  користувача, k — середня кількість RSVP на користувача в train.
+"""
+
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.inspection import permutation_importance
+
+# рядків train для permutation_importance (якщо gain сплітів недоступний)
+_PERMUTATION_ROWS = 20_000
+
+
+def _split_gains(model: HistGradientBoostingClassifier, n_features: int) -> np.ndarray | None:
+    """
+    Сумарний gain сплітів по ознаці з дерев моделі.  Дерева — внутрішні
+    атрибути sklearn (`_predictors`, `nodes`), тож за будь-якої зміни їхньої
+    структури повертається None.
+    """
+    gains = np.zeros(n_features)
+    try:
+        for iteration in model._predictors:
+            for tree in iteration:
+                nodes = tree.nodes[~tree.nodes["is_leaf"].astype(bool)]
+                np.add.at(gains, nodes["feature_idx"], nodes["gain"])
+    except (AttributeError, KeyError, IndexError, TypeError, ValueError):
+        return None
+    return gains
+
+
+class GBMRanker:
+    """Обгортка з інтерфейсом класифікатора (fit / predict / feature_importances_)."""
+
+    def __init__(
+        self,
+        rank_by_member: bool = False,
+        max_iter: int = 200,
+        learning_rate: float = 0.1,
+        max_leaf_nodes: int = 31,
+        n_iter_no_change: int = 10,
+        validation_fraction: float = 0.1,
+        class_weight: str | None = None,
+        random_state: int = 42,
+    ) -> None:
+        self.rank_by_member = rank_by_member
+        self.max_iter = max_iter
+        self.learning_rate = learning_rate
+        self.max_leaf_nodes = max_leaf_nodes
+        self.n_iter_no_change = n_iter_no_change
+        self.validation_fraction = validation_fraction
+        self.class_weight = class_weight
+        self.random_state = random_state
+
+        self.model = None
+        self.backend = ""
+        self.group_size = 0
+        self.top_k = 1
+        self.feature_importances_: np.ndarray | None = None
+
+    # ------------------------------------------------------------------ #
+    # навчання
+    # ------------------------------------------------------------------ #
+    def fit(self, X: np.ndarray, y: np.ndarray, group_size: int | None = None) -> "GBMRanker":
+        """
+        `group_size` — кількість candidate-подій на користувача (рядки X
+        впорядковані «користувач, потім подія»); потрібен для rank_by_member.
+        """
+        X = np.asarray(X, dtype=np.float32)
+        y = np.asarray(y)
+
+        if self.rank_by_member and group_size:
+            self.group_size = group_size
+            n_groups = len(y) // group_size
+            self.top_k = max(1, int(round(y.sum() / max(n_groups, 1))))
+            try:
+                self._fit_lambdarank(X, y, n_groups)
+                return self
+            except ImportError:
+                logging.info("lightgbm is not installed: ranking by pointwise scores")
+
+        self._fit_pointwise(X, y)
+        return self
+
+    def _fit_pointwise(self, X: np.ndarray, y: np.ndarray) -> None:
+        self.backend = "hist"
+        self.model = HistGradientBoostingClassifier(
+            max_iter=self.max_iter,
+            learning_rate=self.learning_rate,
+            max_leaf_nodes=self.max_leaf_nodes,
+            early_stopping=True,
+            n_iter_no_change=self.n_iter_no_change,
+            validation_fraction=self.validation_fraction,
+            class_weight=self.class_weight,
+            random_state=self.random_state,
+        )
+        self.model.fit(X, y)
+
+        gains = _split_gains(self.model, X.shape[1])
+        if gains is None:
+            logging.info("HistGradientBoosting internals changed: permutation importances")
+            gains = self._permutation_gains(X, y)
+        self.feature_importances_ = gains / gains.sum() if gains.sum() else gains
+
+    def _permutation_gains(self, X: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Падіння balanced accuracy при перемішуванні ознаки (≤ 0 → 0)."""
+        rng = np.random.default_rng(self.random_state)
+        rows = rng.choice(len(y), size=min(len(y), _PERMUTATION_ROWS), replace=False)
+        result = permutation_importance(
+            self.model, X[rows], y[rows], scoring="balanced_accuracy",
+            n_repeats=3, random_state=self.random_state,
+        )
+        return np.clip(result.importances_mean, 0.0, None)
+
+    def _fit_lambdarank(self, X: np.ndarray, y: np.ndarray, n_groups: int) -> None:
+        import lightgbm
+
+        # останні validation_fraction користувачів — для early stopping
+        n_valid = max(1, int(n_groups * self.validation_fraction)) if n_groups > 1 else 0
+        split = (n_groups - n_valid) * self.group_size
+
+        self.backend = "lambdarank"
+        self.model = lightgbm.LGBMRanker(
+            n_estimators=self.max_iter,
+            learning_rate=self.learning_rate,
+            num_leaves=self.max_leaf_nodes,
+            random_state=self.random_state,
+            verbose=-1,
+        )
+        eval_kwargs = {}
+        if n_valid:
+            eval_kwargs = {
+                "eval_set": [(X[split:], y[split:])],
+                "eval_group": [[self.group_size] * n_valid],
+                "eval_at": [self.top_k],
+                "callbacks": [lightgbm.early_stopping(self.n_iter_no_change, verbose=False)],
+            }
+        self.model.fit(
+            X[:split], y[:split], group=[self.group_size] * (n_groups - n_valid), **eval_kwargs
+        )
+
+        gains = self.model.booster_.feature_importance(importance_type="gain")
+        self.feature_importances_ = gains / gains.sum() if gains.sum() else gains
+
+    # ------------------------------------------------------------------ #
+    # передбачення
+    # ------------------------------------------------------------------ #
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float32)
+        if self.backend == "lambdarank":
+            return self.model.predict(X)
+        return self.model.predict_proba(X)[:, 1]
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        if not self.group_size:
+            return self.model.predict(np.asarray(X, dtype=np.float32))
+
+        # ранжування: top-k подій кожного користувача → 1
+        scores = self.decision_function(X).reshape(-1, self.group_size)
+        k = min(self.top_k, self.group_size)
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        labels = np.zeros_like(scores, dtype=np.int64)
+        np.put_along_axis(labels, top, 1, axis=1)
+        return labels.ravel()
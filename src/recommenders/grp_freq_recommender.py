@@ -1,30 +1,157 @@
-from typing import Dict, List, Set
+from array import array
+from collections import defaultdict
+from typing import DefaultDict, Dict, List, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+# дельти, після яких буфер зливається з матрицею навіть без оцінювання
+_MIN_COMPACT = 4096
 
 
 class GroupFrequencyRecommender:
     """
     Оцінює «близькість» події користувачу як частку вже відвіданих
     ним подій усередині тієї ж групи.
+
+    Стан — цілі лічильники: `counts` (members × groups, CSR int32) і
+    довжина історії кожного користувача (різні події).  RSVP додаються й
+    вилучаються по одному (`add_rsvp` / `expire_rsvp`, амортизовано O(1)):
+    зміни лічильників накопичуються в буфері й зливаються з CSR перед
+    оцінюванням.  `fit` проходить той самий шлях, тож потоковий стан дає
+    ті самі score, що й fit на тому ж вікні.
     """
 
     def __init__(self) -> None:
-        # member_id → set(event_id)
-        self.user_history: Dict[str, Set[str]] = {}
+        self.catalog = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self.member_index: Dict[str, int] = {}
+        self.group_index: Dict[str, int] = {}
+        # members × groups: кількість різних подій користувача в групі
+        self.counts = sp.csr_matrix((0, 0), dtype=np.int32)
+        # кількість різних подій в історії користувача
+        self.history_len = np.zeros(0, dtype=np.int64)
+        # (member row, event_id) → кількість RSVP (історія — множина подій)
+        self._rsvps: DefaultDict[Tuple[int, str], int] = defaultdict(int)
+        # буфер змін counts: (row, col, ±1)
+        self._delta_rows = array("q")
+        self._delta_cols = array("q")
+        self._delta_vals = array("i")
 
     # ------------------------------------------------------------------ #
-    # 1. «Навчання» – просто запамʼятати історію участі
+    # 1. Потокові оновлення історії
     # ------------------------------------------------------------------ #
-    def fit(
-        self,
-        member_events: Dict[str, List[str]],
-    ) -> None:
-        self.user_history = {
-            m_id: set(evt_ids) for m_id, evt_ids in member_events.items()
-        }
+    def _member_row(self, member_id: str) -> int:
+        row = self.member_index.setdefault(member_id, len(self.member_index))
+        if row == len(self.history_len):
+            self.history_len = np.resize(self.history_len, max(16, 2 * row))
+            self.history_len[row:] = 0
+        return row
+
+    def _update(self, row: int, event_id: str, sign: int) -> None:
+        self.history_len[row] += sign
+        g_id = self.catalog.event_group.get(event_id)
+        if g_id:
+            self._delta_rows.append(row)
+            self._delta_cols.append(self.group_index.setdefault(g_id, len(self.group_index)))
+            self._delta_vals.append(sign)
+            if len(self._delta_vals) >= max(_MIN_COMPACT, self.counts.nnz):
+                self._compact()
+
+    def add_rsvp(self, member_id: str, event_id: str) -> None:
+        """Додає подію до історії користувача (повторний RSVP історію не змінює)."""
+        row = self._member_row(member_id)
+        key = (row, event_id)
+        self._rsvps[key] += 1
+        if self._rsvps[key] == 1:
+            self._update(row, event_id, +1)
+
+    def expire_rsvp(self, member_id: str, event_id: str) -> None:
+        """Вилучає RSVP, що випав з вікна; невідомі RSVP пропускаються."""
+        row = self.member_index.get(member_id)
+        key = (row, event_id)
+        if row is None or key not in self._rsvps:
+            return
+        self._rsvps[key] -= 1
+        if not self._rsvps[key]:
+            del self._rsvps[key]
+            self._update(row, event_id, -1)
+
+    def flush(self) -> None:
+        """Зливає накопичені оновлення зараз (score_matrix робить це сам)."""
+        self._compact()
+
+    def _compact(self) -> None:
+        """Зливає буфер змін з CSR (і розширює її під нових користувачів / групи)."""
+        shape = (len(self.member_index), len(self.group_index))
+        if not self._delta_vals and self.counts.shape == shape:
+            return
+        delta = sp.csr_matrix(
+            (
+                np.frombuffer(self._delta_vals, dtype=np.int32),
+                (np.frombuffer(self._delta_rows, dtype=np.int64),
+                 np.frombuffer(self._delta_cols, dtype=np.int64)),
+            ),
+            shape=shape,
+        )
+        counts = self.counts.copy()
+        counts.resize(shape)
+        self.counts = (counts + delta).astype(np.int32)
+        self.counts.eliminate_zeros()
+        self._delta_rows, self._delta_cols, self._delta_vals = array("q"), array("q"), array("i")
 
     # ------------------------------------------------------------------ #
-    # 2. Інференс – рахунок для кожної candidate-події
+    # 2. «Навчання» – частки груп в історії участі
     # ------------------------------------------------------------------ #
+    def fit(self, train_view: Dict) -> None:
+        """
+        score(member, group) = |відвідано у цій групі| / |усіх відвіданих|
+        по train-історії; подія без групи враховується лише в знаменнику.
+        Рівнозначно add_rsvp для кожного RSVP вікна.
+        """
+        member_events: Dict[str, List[str]] = train_view["members_events"]
+        self.catalog = train_view["catalog"]
+        self._reset()
+        for m_id, events in member_events.items():
+            for e_id in events:
+                self.add_rsvp(m_id, e_id)
+        self._compact()
+
+    # ------------------------------------------------------------------ #
+    # 3. Інференс – рахунок для кожної candidate-події
+    # ------------------------------------------------------------------ #
+    def _history_rows(self, member_ids: List[str]) -> np.ndarray:
+        """Рядки стану; -1 — користувач без історії."""
+        rows = np.fromiter(
+            (self.member_index.get(m_id, -1) for m_id in member_ids),
+            dtype=np.int64,
+            count=len(member_ids),
+        )
+        known = rows >= 0
+        rows[known] = np.where(self.history_len[rows[known]] > 0, rows[known], -1)
+        return rows
+
+    def score_matrix(self, member_idx: np.ndarray, event_idx: np.ndarray) -> np.ndarray:
+        """float32 [members × events]; користувачі без історії → 0."""
+        self._compact()
+        member_rows = self._history_rows(self.catalog.members(member_idx))
+        group_cols = np.fromiter(
+            (self.group_index.get(g_id, -1) for g_id in self.catalog.event_groups(event_idx)),
+            dtype=np.int64,
+            count=len(event_idx),
+        )
+
+        scores = np.zeros((len(member_idx), len(event_idx)), dtype=np.float32)
+        known_m = np.flatnonzero(member_rows >= 0)
+        known_e = np.flatnonzero(group_cols >= 0)
+        if len(known_m) and len(known_e):
+            rows = member_rows[known_m]
+            block = self.counts[rows][:, group_cols[known_e]].toarray()
+            scores[np.ix_(known_m, known_e)] = block / self.history_len[rows][:, None]
+        return scores
+
     def score_candidates(
         self,
         member_id: str,
@@ -32,28 +159,13 @@ class GroupFrequencyRecommender:
         repo: Dict[str, Dict],
         sim_scores: Dict[str, Dict[str, float]],
     ) -> None:
-        """
-        Записує score = |відвідано у цій групі| / |усіх відвіданих|
-        у словник sim_scores[member_id][event_id].
-        """
-        user_events = self.user_history.get(member_id, set())
-        if not user_events:                         # ⬅ якщо історії нема – ігноруємо
+        """Записує частку групи події у sim_scores[member_id][event_id]."""
+        if self._history_rows([member_id])[0] < 0:     # ⬅ якщо історії нема – ігноруємо
             return
 
-        # зручні посилання
-        event_to_group: Dict[str, str] = repo["event_group"]
-        group_to_events: Dict[str, List[str]] = repo["group_events"]
-
+        scores = self.score_matrix(
+            self.catalog.member_rows([member_id]), self.catalog.event_rows(candidate_events)
+        )[0]
         user_scores = sim_scores.setdefault(member_id, {})
-
-        for event_id in candidate_events:
-            group_id = event_to_group.get(event_id)
-            if not group_id:
-                user_scores[event_id] = 0.0
-                continue
-
-            group_events = set(group_to_events[group_id])
-            overlap = user_events & group_events
-
-            score = len(overlap) / len(user_events)
-            user_scores[event_id] = float(score)
+        for e_id, score in zip(candidate_events, scores):
+            user_scores[e_id] = float(score)
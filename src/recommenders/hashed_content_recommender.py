@@ -0,0 +1,260 @@
+from array import array
+from typing import Dict, Iterable, List
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
+
+from .content_recommender import TokenCache, _identity, analyze_tokens
+
+# RSVP у буфері, після яких він зливається з профілями навіть без оцінювання
+_MIN_COMPACT = 4096
+
+
+class HashedContentRecommender:
+    """
+    Потоковий варіант ContentRecommender з фіксованою памʼяттю.
+
+    Терми хешуються у простір розмірності `n_features` (словника немає),
+    document frequency — лічильники int32 того ж розміру, які можна
+    збільшувати для нових подій і зменшувати для застарілих.  Лічильники
+    подій і профілі — по одній CSR-матриці на бік, рядки — рядки Catalog
+    (як QuantizedRows), тож памʼять залежить від nnz, а не від кількості
+    Python-обʼєктів.  Профіль користувача — сума «сирих» лічильників термів
+    його подій; нові RSVP буферизуються й додаються до профілів одним
+    sparse-добутком.  TF-IDF вага
+    (sublinear tf × idf, l2-норма, max_df) застосовується лише під час
+    оцінювання, за поточними DF — профілі не треба перераховувати після
+    зміни корпусу.
+
+    DF рахується по різних подіях вікна (у ContentRecommender — по подіях
+    з повтором для кожного учасника), а колізії хешів злегка змішують терми;
+    обидва ефекти видно в `scripts/benchmarks.py content-stream`.
+    """
+
+    def __init__(
+        self,
+        ngram_range: tuple[int, int] = (1, 1),
+        n_features: int = 2 ** 18,
+        max_df: float = 0.5,
+    ) -> None:
+        self.ngram_range = ngram_range
+        self.n_features = n_features
+        self.max_df = max_df
+        self.hasher = HashingVectorizer(
+            analyzer=_identity,
+            n_features=n_features,
+            alternate_sign=False,
+            norm=None,
+            dtype=np.float32,
+        )
+        self.tokens = TokenCache()          # якщо repo без "tokens"
+        self.catalog = None
+        self._reset()
+        # останній блок candidate-подій для score_matrix
+        self._block_idx: np.ndarray | None = None
+        self._block_vecs = None
+
+    def _reset(self) -> None:
+        # document frequency по хешованих термах + кількість документів
+        self.df = np.zeros(self.n_features, dtype=np.int32)
+        self.n_docs = 0
+        # рядки Catalog: лічильники термів живих подій (решта рядків порожні)
+        self.event_counts = sp.csr_matrix((0, self.n_features), dtype=np.float32)
+        self.live = np.zeros(0, dtype=bool)
+        # рядки Catalog: сума лічильників термів подій користувача
+        self.profiles = sp.csr_matrix((0, self.n_features), dtype=np.float32)
+        # RSVP, уже враховані в profiles: (рядок користувача, рядок події)
+        self._rsvp_members = np.empty(0, dtype=np.int64)
+        self._rsvp_events = np.empty(0, dtype=np.int64)
+        # буфер RSVP, ще не доданих до profiles
+        self._pending_members = array("q")
+        self._pending_events = array("q")
+        self._idf: np.ndarray | None = None
+
+    def _grow(self) -> None:
+        """Розширює матриці під розміри Catalog (він спільний для всіх вікон міста)."""
+        n_events, n_members = len(self.catalog.events), len(self.catalog.member_ids)
+        if self.event_counts.shape[0] < n_events:
+            self.event_counts.resize((n_events, self.n_features))
+            self.live = np.concatenate((self.live, np.zeros(n_events - len(self.live), dtype=bool)))
+        if self.profiles.shape[0] < n_members:
+            self.profiles.resize((n_members, self.n_features))
+
+    # ------------------------------------------------------------------ #
+    # 1. Потокові оновлення корпусу та профілів
+    # ------------------------------------------------------------------ #
+    def _hash(self, event_ids: List[str], repo: Dict) -> sp.csr_matrix:
+        token_cache: TokenCache = repo.get("tokens") or self.tokens
+        docs = [
+            analyze_tokens(tokens, self.ngram_range)
+            for tokens in token_cache.event_tokens(event_ids, repo["events_info"])
+        ]
+        return self.hasher.transform(docs)
+
+    def _scatter(self, rows: np.ndarray, cols: np.ndarray, shape: tuple[int, int]) -> sp.csr_matrix:
+        """Індикаторна матриця (дублікати сумуються)."""
+        return sp.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=shape)
+
+    def add_events(self, event_ids: Iterable[str], repo: Dict) -> None:
+        """Додає нові події до корпусу (DF); вже відомі пропускаються."""
+        # нумерація та токени міста
+        self.catalog = repo.get("catalog", self.catalog)
+        self.tokens = repo.get("tokens") or self.tokens
+        self._grow()
+        ids = list(dict.fromkeys(event_ids))
+        rows = self.catalog.event_rows(ids)
+        new = np.flatnonzero(~self.live[rows])
+        if not len(new):
+            return
+        rows = rows[new]
+        counts = self._hash([ids[i] for i in new.tolist()], repo)
+        self.df += np.bincount(counts.indices, minlength=self.n_features).astype(np.int32)
+        self.n_docs += len(rows)
+        # один прохід по nnz: нові рядки вставляються у спільну CSR
+        placed = self._scatter(rows, np.arange(len(rows)), (self.event_counts.shape[0], len(rows)))
+        self.event_counts = (self.event_counts + placed @ counts).tocsr()
+        self.live[rows] = True
+        self._idf = None
+
+    def expire_events(self, event_ids: Iterable[str]) -> None:
+        """Вилучає події з корпусу та з профілів їхніх учасників."""
+        index = self.catalog.events.index if self.catalog is not None else {}
+        rows = np.fromiter((index[e_id] for e_id in event_ids if e_id in index), dtype=np.int64)
+        rows = np.unique(rows[self.live[rows]])
+        if not len(rows):
+            return
+        self._compact()
+        expired = np.zeros(self.event_counts.shape[0], dtype=bool)
+        expired[rows] = True
+
+        hit = expired[self._rsvp_events]
+        removed = self._scatter(
+            self._rsvp_members[hit], self._rsvp_events[hit], (self.profiles.shape[0], len(expired))
+        )
+        self.profiles = (self.profiles - removed @ self.event_counts).tocsr()
+        self.profiles.eliminate_zeros()
+        self._rsvp_members = self._rsvp_members[~hit]
+        self._rsvp_events = self._rsvp_events[~hit]
+
+        self.df -= np.bincount(
+            self.event_counts[rows].indices, minlength=self.n_features
+        ).astype(np.int32)
+        self.n_docs -= len(rows)
+        self.event_counts = (sp.diags((~expired).astype(np.float32)) @ self.event_counts).tocsr()
+        self.event_counts.eliminate_zeros()
+        self.live[rows] = False
+        self._idf = None
+
+    def add_rsvp(self, member_id: str, event_id: str) -> None:
+        """
+        Додає подію (вже в корпусі) до профілю користувача; RSVP буферизуються
+        й додаються до profiles одним sparse-добутком (амортизовано O(nnz події)).
+        """
+        e_row = self.catalog.events.index[event_id]
+        if not self.live[e_row]:
+            raise KeyError(event_id)
+        self._pending_members.append(self.catalog.member_index[member_id])
+        self._pending_events.append(e_row)
+        if len(self._pending_events) >= max(_MIN_COMPACT, len(self._rsvp_events)):
+            self._compact()
+
+    def _compact(self) -> None:
+        """profiles += (RSVP буфера як індикатор members × events) @ event_counts."""
+        if not self._pending_events:
+            return
+        members = np.frombuffer(self._pending_members, dtype=np.int64)
+        events = np.frombuffer(self._pending_events, dtype=np.int64)
+        added = self._scatter(members, events, (self.profiles.shape[0], self.event_counts.shape[0]))
+        self.profiles = (self.profiles + added @ self.event_counts).tocsr()
+        self._rsvp_members = np.concatenate((self._rsvp_members, members))
+        self._rsvp_events = np.concatenate((self._rsvp_events, events))
+        self._pending_members, self._pending_events = array("q"), array("q")
+
+    def fit(self, train_view: Dict) -> None:
+        """Будує стан з нуля для train-вікна (рівнозначно add_events + add_rsvp)."""
+        member_events = train_view["members_events"]
+        self._reset()
+        self.add_events(
+            (e_id for events in member_events.values() for e_id in events), train_view
+        )
+        for member_id, events in member_events.items():
+            for e_id in events:
+                self.add_rsvp(member_id, e_id)
+        self._compact()
+
+    def _has_profile(self, member_idx: np.ndarray) -> np.ndarray:
+        self._compact()
+        lengths = np.diff(self.profiles.indptr)
+        known = member_idx < len(lengths)
+        known[known] = lengths[member_idx[known]] > 0
+        return known
+
+    @property
+    def n_profiles(self) -> int:
+        """Кількість непорожніх профілів."""
+        self._compact()
+        return int(np.count_nonzero(np.diff(self.profiles.indptr)))
+
+    # ------------------------------------------------------------------ #
+    # 2. TF-IDF за поточними DF
+    # ------------------------------------------------------------------ #
+    def _weights(self) -> np.ndarray:
+        """Smooth idf як у TfidfTransformer; терми з df > max_df·n → 0."""
+        if self._idf is None:
+            df = self.df.astype(np.float64)
+            idf = np.log((1.0 + self.n_docs) / (1.0 + df)) + 1.0
+            idf[df > self.max_df * self.n_docs] = 0.0
+            self._idf = idf.astype(np.float32)
+        return self._idf
+
+    def _tfidf(self, counts: sp.csr_matrix) -> sp.csr_matrix:
+        vecs = counts.astype(np.float32, copy=True)
+        vecs.data = (1.0 + np.log(vecs.data)) * self._weights()[vecs.indices]
+        vecs.eliminate_zeros()
+        return normalize(vecs, norm="l2", copy=False)
+
+    def transform_events(self, event_ids: List[str], repo: Dict) -> sp.csr_matrix:
+        """TF-IDF-матриця для списку event_id (corpus не змінюється)."""
+        return self._tfidf(self._hash(event_ids, repo))
+
+    def member_vectors(self, member_ids: List[str]) -> sp.csr_matrix:
+        self._compact()
+        return self._tfidf(self.profiles[self.catalog.member_rows(member_ids)])
+
+    # ------------------------------------------------------------------ #
+    # 3. Обчислення score-ів
+    # ------------------------------------------------------------------ #
+    def score(
+        self,
+        member_id: str,
+        candidate_events: List[str],
+        candidate_vecs: sp.csr_matrix,
+        sim_scores: Dict[str, Dict[str, float]],
+    ) -> None:
+        """Як ContentRecommender.score; користувач без профілю → 0."""
+        if self._has_profile(self.catalog.member_rows([member_id]))[0]:
+            scores = cosine_similarity(self.member_vectors([member_id]), candidate_vecs).ravel()
+        else:
+            scores = np.zeros(len(candidate_events))
+
+        user_dict = sim_scores.setdefault(member_id, {})
+        for e_id, score in zip(candidate_events, scores):
+            user_dict[e_id] = float(score)
+
+    def score_matrix(self, member_idx: np.ndarray, event_idx: np.ndarray) -> np.ndarray:
+        """float32 [members × events]; користувачі без профілю → 0."""
+        if self._block_idx is None or not np.array_equal(event_idx, self._block_idx):
+            self._block_idx = event_idx
+            self._block_vecs = self.transform_events(
+                self.catalog.event_ids(event_idx), {"events_info": self.catalog.events}
+            )
+
+        scores = np.zeros((len(member_idx), len(event_idx)), dtype=np.float32)
+        known = np.flatnonzero(self._has_profile(member_idx))
+        if len(known):
+            user_vecs = self._tfidf(self.profiles[member_idx[known]])
+            scores[known] = cosine_similarity(user_vecs, self._block_vecs)
+        return scores
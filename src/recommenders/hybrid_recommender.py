@@ -1,50 +1,97 @@
 """
 Learning-to-Rank модуль (Python 3.10)
 
-• підтримує декілька алгоритмів («svm», «mlp», «nb», «rf»);
-• будує матриці ознак на основі словника simscores_across_features;
+• підтримує декілька алгоритмів («svm», «mlp», «nb», «rf», «gbm»);
+• будує матриці ознак зі score-матриць базових ознак [members × events];
 • зберігає граф важливості ознак у figures/feature_importance/{partition}.png
+
+sklearn імпортується лише тоді, коли модель справді навчається.
 """
 
-import os
-from pathlib import Path
-from typing import Dict, List, Tuple
+import importlib
+from typing import Any, Dict, List, Tuple
 
-import matplotlib.pyplot as plt
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import precision_recall_fscore_support
-from sklearn.naive_bayes import GaussianNB
-from sklearn.neural_network import MLPClassifier
-from sklearn.svm import LinearSVC
+
+from ..plots import Panel, PlotWorker, figure_path, render_importances
+
+
+# algo → ("модуль:клас", параметри за замовчуванням, підпис, рядок на графіку важливості)
+MODELS: Dict[str, Tuple[str, Dict[str, Any], str, int | None]] = {
+    "svm": ("sklearn.svm:LinearSVC", {}, "SVM", 1),
+    "mlp": ("sklearn.neural_network:MLPClassifier", {"max_iter": 500, "random_state": 42}, "MLP", None),
+    "nb": ("sklearn.naive_bayes:GaussianNB", {}, "Naive Bayes", None),
+    "rf": (
+        "sklearn.ensemble:RandomForestClassifier",
+        {"n_estimators": 50, "n_jobs": -1, "random_state": 15325},
+        "Random Forest",
+        2,
+    ),
+    # позитивів ~1 %: без ваг класів модель майже не передбачає 1;
+    # {"gbm": {"rank_by_member": True}} — ранжування в межах користувача
+    "gbm": (".gbm_ranker:GBMRanker", {"class_weight": "balanced"}, "Hist GBM", 3),
+}
+
+# те саме для блокового режиму: лише моделі з partial_fit
+# (LinearSVC його не має → лінійний SVM через SGD з hinge-loss)
+INCREMENTAL_MODELS: Dict[str, Tuple[str, Dict[str, Any], str, int | None]] = {
+    "svm": ("sklearn.linear_model:SGDClassifier", {"loss": "hinge", "random_state": 42}, "SVM (SGD)", 1),
+    "mlp": ("sklearn.neural_network:MLPClassifier", {"random_state": 42}, "MLP", None),
+    "nb": ("sklearn.naive_bayes:GaussianNB", {}, "Naive Bayes", None),
+}
+
+CLASSES = np.array([0, 1])
+
+
+def make_model(
+    algo: str,
+    params: Dict[str, Any] | None = None,
+    table: Dict[str, Tuple[str, Dict[str, Any], str, int | None]] = MODELS,
+):
+    """Імпортує клас моделі з таблиці та створює її з параметрами за замовчуванням + `params`."""
+    spec, defaults, _, _ = table[algo]
+    module, _, cls_name = spec.partition(":")
+    clf_cls = getattr(importlib.import_module(module, __package__), cls_name)
+    return clf_cls(**{**defaults, **(params or {})})
 
 
 class LearningToRank:
     """Об’єднує кілька «базових» фіч у мета-класіфікатор (L2R)."""
 
-    def __init__(self) -> None:
-        # ── каталог для графіків
-        Path("figures/feature_importance").mkdir(parents=True, exist_ok=True)
+    def __init__(self, plotter: PlotWorker | None = None) -> None:
+        # фоновий рендер графіків; None — рендер одразу в learn()
+        self.plotter = plotter
+        # algo → важливість ознак останнього learn() (для чекпойнтів)
+        self.importances: Dict[str, List[float]] = {}
+        # algo → передбачення на тестових рядках останнього learn() (для --approx)
+        self.predictions: Dict[str, np.ndarray] = {}
 
     # ------------------------------------------------------------------ #
     #  основний пайплайн: train / test та оцінка
     # ------------------------------------------------------------------ #
     def learn(
         self,
-        simscores: Dict[str, Dict[str, Dict[str, float]]],
+        simscores: Dict[str, np.ndarray],
         test_events: List[str],
         all_members_rsvp: Dict[str, List[str]],
         test_members: List[str],
-        log_fh,  # відкритий файл-хендл для логів
+        log_fh,  # відкритий файл-хендл для логів (або None)
         algo_list: List[str],
         n_members: int,
         partition_number: int,
-    ) -> None:
+        model_params: Dict[str, Dict[str, Any]] | None = None,
+        plot: bool = True,
+    ) -> Dict[str, Tuple[float, float, float]]:
         """
         • Формує матрицю ознак X і ціль y (1 – відвідав, 0 – ні);
+          `simscores` — {ознака: float32 [test_members × test_events]};
         • 80 % користувачів → train, 20 % → test;
         • Навчає обрані алгоритми, друкує Precision/Recall/F-score;
-        • Будує bar-chart важливості ознак (RF / LinearSVC).
+        • Будує bar-chart важливості ознак (RF / LinearSVC / GBM).
+
+        `model_params` перекриває параметри моделей ({"rf": {"n_estimators": 100}}),
+        `plot=False` вимикає графіки.
+        Повертає {algo: (precision, recall, f1)} для класу 1.
         """
 
         # -------------------- 1. побудова X_train, y_train --------------------
@@ -54,77 +101,119 @@ class LearningToRank:
         X_train, y_train = self._build_matrix(
             test_members[:train_size],
             test_events,
-            simscores,
+            {f: m[:train_size] for f, m in simscores.items()},
             all_members_rsvp,
         )
         X_test, y_test = self._build_matrix(
             test_members[train_size:],
             test_events,
-            simscores,
+            {f: m[train_size:] for f, m in simscores.items()},
             all_members_rsvp,
         )
 
         # -------------------- 2. тренування / оцінка --------------------------
-        if "svm" in algo_list:
-            self._run_classifier(
-                clf=LinearSVC(),
-                name="SVM",
+        model_params = model_params or {}
+        metrics: Dict[str, Tuple[float, float, float]] = {}
+        panels: List[Panel] = []
+        for algo, (_, _, name, row) in MODELS.items():
+            if algo not in algo_list:
+                continue
+            clf = make_model(algo, model_params.get(algo))
+            # GBMRanker групує рядки по користувачу: len(test_events) подій на кожного
+            fit_params = {"group_size": len(test_events)} if hasattr(clf, "group_size") else {}
+            metrics[algo], self.predictions[algo] = self._run_classifier(
+                clf=clf,
+                name=name,
                 X_train=X_train,
                 y_train=y_train,
                 X_test=X_test,
                 y_test=y_test,
-                feature_names=feature_names,
-                partition_number=partition_number,
-                subplot_pos=211,
                 log_fh=log_fh,
+                fit_params=fit_params,
             )
+            importances = self._feature_importances(clf)
+            if importances is not None:
+                self.importances[algo] = importances.tolist()
+                if plot and partition_number and row:
+                    panels.append(
+                        (name, self.importances[algo], feature_names, self._subplot(row, algo_list))
+                    )
 
-        if "mlp" in algo_list:
-            self._run_classifier(
-                clf=MLPClassifier(max_iter=500, random_state=42),
-                name="MLP",
-                X_train=X_train,
-                y_train=y_train,
-                X_test=X_test,
-                y_test=y_test,
-                log_fh=log_fh,
-            )
+        # -------------------- 3. збереження графіку --------------------------
+        self._save_figure(partition_number, panels)
+        return metrics
 
-        if "nb" in algo_list:
-            self._run_classifier(
-                clf=GaussianNB(),
-                name="Naive Bayes",
-                X_train=X_train,
-                y_train=y_train,
-                X_test=X_test,
-                y_test=y_test,
-                log_fh=log_fh,
-            )
+    def learn_blocks(
+        self,
+        engine,  # BlockEngine з навченими рекомендерами
+        test_events: List[str],
+        all_members_rsvp: Dict[str, List[str]],
+        test_members: List[str],
+        log_fh,
+        algo_list: List[str],
+        n_members: int,
+        partition_number: int,
+        model_params: Dict[str, Dict[str, Any]] | None = None,
+        plot: bool = True,
+        epochs: int = 1,
+    ) -> Dict[str, Tuple[float, float, float]]:
+        """
+        Те саме, що `learn`, але без повної матриці X: моделі вчаться
+        через `partial_fit` на блоках від `engine`, а Precision / Recall / F1
+        накопичуються з лічильників TP / FP / FN по тестових блоках.
+        Моделі без partial_fit (RF) у цьому режимі пропускаються.
+        """
+        model_params = model_params or {}
+        train_size = int(0.8 * n_members)
+        train_members, eval_members = test_members[:train_size], test_members[train_size:]
+        if not train_members or not eval_members:
+            return {}
 
-        if "rf" in algo_list:
-            self._run_classifier(
-                clf=RandomForestClassifier(
-                    n_estimators=50, n_jobs=-1, random_state=15325
-                ),
-                name="Random Forest",
-                X_train=X_train,
-                y_train=y_train,
-                X_test=X_test,
-                y_test=y_test,
-                feature_names=feature_names,
-                partition_number=partition_number,
-                subplot_pos=212,
-                log_fh=log_fh,
-            )
+        models = {}
+        for algo in algo_list:
+            if algo not in INCREMENTAL_MODELS:
+                print(f"{algo:<12} →  no partial_fit, skipped in block mode")
+                continue
+            models[algo] = make_model(algo, model_params.get(algo), INCREMENTAL_MODELS)
 
-        # -------------------- 3. збереження графіку --------------------------
-        if any(algo in algo_list for algo in ("svm", "rf")):
-            plt.tight_layout()
-            out_path = (
-                f"figures/feature_importance/{partition_number}_partition.png"
-            )
-            plt.savefig(out_path)
-            plt.close()
+        # -------------------- 1. інкрементне навчання ------------------------
+        for _ in range(epochs):
+            for X, y in engine.blocks(train_members, test_events, all_members_rsvp):
+                for clf in models.values():
+                    clf.partial_fit(X, y, classes=CLASSES)
+
+        # -------------------- 2. оцінка по блоках ----------------------------
+        counts = {algo: np.zeros(3, dtype=np.int64) for algo in models}  # TP, FP, FN
+        for X, y in engine.blocks(eval_members, test_events, all_members_rsvp):
+            positive = y == 1
+            for algo, clf in models.items():
+                predicted = clf.predict(X) == 1
+                counts[algo] += (
+                    np.count_nonzero(predicted & positive),
+                    np.count_nonzero(predicted & ~positive),
+                    np.count_nonzero(~predicted & positive),
+                )
+
+        metrics: Dict[str, Tuple[float, float, float]] = {}
+        panels: List[Panel] = []
+        for algo, clf in models.items():
+            _, _, name, row = INCREMENTAL_MODELS[algo]
+            tp, fp, fn = counts[algo]
+            pr = tp / (tp + fp) if tp + fp else 0.0
+            rc = tp / (tp + fn) if tp + fn else 0.0
+            f1 = 2 * pr * rc / (pr + rc) if pr + rc else 0.0
+            metrics[algo] = self._report(name, pr, rc, f1, log_fh)
+
+            importances = self._feature_importances(clf)
+            if importances is not None:
+                self.importances[algo] = importances.tolist()
+                if plot and row:
+                    panels.append(
+                        (name, self.importances[algo], engine.feature_names, self._subplot(row, algo_list))
+                    )
+
+        self._save_figure(partition_number, panels)
+        return metrics
 
     # ====================================================================== #
     # ↓↓↓ допоміжні функції ↓↓↓
@@ -133,28 +222,50 @@ class LearningToRank:
     def _build_matrix(
         members: List[str],
         events: List[str],
-        simscores: Dict[str, Dict[str, Dict[str, float]]],
+        simscores: Dict[str, np.ndarray],
         rsvp: Dict[str, List[str]],
     ) -> Tuple[np.ndarray, np.ndarray]:
-        """Створює X, y для заданого підмножини користувачів."""
-        features = []
-        labels = []
-        for feature in simscores:  # по кожній базовій моделі
-            col = [
-                simscores[feature][member][event]
-                for member in members
-                for event in events
-            ]
-            features.append(col)
-
-        for member in members:
-            labels.extend(
-                1 if event in rsvp.get(member, []) else 0 for event in events
-            )
+        """
+        Створює X, y для заданої підмножини користувачів; `simscores` —
+        матриці [members × events] саме для цих користувачів.  Рядки X
+        впорядковані «користувач, потім подія».
+        """
+        X = np.empty((len(members) * len(events), len(simscores)), dtype=np.float32)
+        for col, matrix in enumerate(simscores.values()):  # по кожній базовій моделі
+            X[:, col] = matrix.ravel()
+        return X, LearningToRank._labels(members, events, rsvp).ravel()
+
+    @staticmethod
+    def _labels(
+        members: List[str],
+        events: List[str],
+        rsvp: Dict[str, List[str]],
+        dtype=np.int64,
+    ) -> np.ndarray:
+        """y [members × events]: 1 — користувач відвідав подію."""
+        event_pos = {e_id: col for col, e_id in enumerate(events)}
+        y = np.zeros((len(members), len(events)), dtype=dtype)
+        for row, member in enumerate(members):
+            cols = [event_pos[e_id] for e_id in rsvp.get(member, ()) if e_id in event_pos]
+            y[row, cols] = 1
+        return y
 
-        X = np.column_stack(features)
-        y = np.asarray(labels)
-        return X, y
+    @staticmethod
+    def _subplot(row: int | None, algo_list: List[str]) -> int | None:
+        """Рядок графіку → код subplot (2 рядки, 3 — якщо є gbm)."""
+        if not row:
+            return None
+        rows = 3 if "gbm" in algo_list else 2
+        return rows * 100 + 10 + row
+
+    @staticmethod
+    def _feature_importances(clf) -> np.ndarray | None:
+        """coef_ (лінійні моделі) або feature_importances_ (дерева)."""
+        if hasattr(clf, "coef_"):
+            return clf.coef_.ravel()
+        if hasattr(clf, "feature_importances_"):
+            return clf.feature_importances_
+        return None
 
     def _run_classifier(
         self,
@@ -165,39 +276,33 @@ class LearningToRank:
         X_test: np.ndarray,
         y_test: np.ndarray,
         log_fh,
-        feature_names: List[str] | None = None,
-        partition_number: int | None = None,
-        subplot_pos: int | None = None,
-    ) -> None:
-        """Навчання, оцінка та (опціонально) граф важливості ознак."""
-        clf.fit(X_train, y_train)
+        fit_params: Dict[str, Any] | None = None,
+    ) -> Tuple[Tuple[float, float, float], np.ndarray]:
+        """Навчання та оцінка; повертає (метрики, передбачення для X_test)."""
+        from sklearn.metrics import precision_recall_fscore_support
+
+        clf.fit(X_train, y_train, **(fit_params or {}))
         preds = clf.predict(X_test)
         pr, rc, f1, _ = precision_recall_fscore_support(
             y_test, preds, labels=[0, 1]
         )
+        return self._report(name, pr[1], rc[1], f1[1], log_fh), preds
 
-        print(f"{name:<12} →  Precision {pr[1]:.3f}  Recall {rc[1]:.3f}  F1 {f1[1]:.3f}")
-        log_fh.write(
-            f"{name:<12} →  Precision {pr[1]:.3f}  Recall {rc[1]:.3f}  F1 {f1[1]:.3f}\n"
-        )
-        log_fh.flush()
-
-        # ---- важливість ознак (тільки SVM (coef_) чи RF (feature_importances_)) ----
-        if feature_names and partition_number and subplot_pos:
-            if hasattr(clf, "coef_"):
-                importances = clf.coef_.ravel()
-            elif hasattr(clf, "feature_importances_"):
-                importances = clf.feature_importances_
-            else:
-                return
-
-            ax = plt.subplot(subplot_pos)
-            ax.set_title(f"{name} – feature importance")
-            bars = ax.bar(
-                np.arange(len(importances)),
-                importances,
-                color="steelblue",
-            )
-            ax.set_xticks(np.arange(len(importances)))
-            ax.set_xticklabels(feature_names, rotation=60, ha="right")
-            ax.bar_label(bars, fmt="%.2f")
+    @staticmethod
+    def _report(name: str, pr: float, rc: float, f1: float, log_fh) -> Tuple[float, float, float]:
+        line = f"{name:<12} →  Precision {pr:.3f}  Recall {rc:.3f}  F1 {f1:.3f}"
+        print(line)
+        if log_fh is not None:
+            log_fh.write(line + "\n")
+            log_fh.flush()
+        return float(pr), float(rc), float(f1)
+
+    def _save_figure(self, partition_number: int, panels: List[Panel]) -> None:
+        """Bar-chart важливості ознак (SVM (coef_), RF / GBM (feature_importances_))."""
+        if not panels:
+            return
+        path = figure_path(partition_number)
+        if self.plotter is not None:
+            self.plotter.submit(path, panels)
+        else:
+            render_importances(path, panels)
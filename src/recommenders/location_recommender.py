@@ -1,11 +1,27 @@
-from typing import Dict, List, Literal
+from collections import Counter, defaultdict
+from typing import DefaultDict, Dict, List, Literal, Tuple
 
 import numpy as np
 from sklearn.neighbors import KernelDensity
 
+from ..quantize import RaggedArray
+
+# RSVP у буфері, після яких він зливається з точками навіть без оцінювання
+_MIN_COMPACT = 4096
+
 
 class LocationRecommender:
-    """KDE-рекомендації за геолокацією користувача та його минулих подій."""
+    """
+    KDE-рекомендації за геолокацією користувача та його минулих подій.
+
+    Точки всіх користувачів — один float32 RaggedArray (рядок = користувач:
+    «домашні» координати, далі відвідані події в порядку рядків Catalog) і
+    паралельний масив рядків подій (-1 — дім).  RSVP додаються й
+    вилучаються по одному (`add_rsvp` / `expire_rsvp`, амортизовано O(1))
+    через буфер змін, який зливається з точками перед оцінюванням; `fit`
+    проходить той самий шлях, тож потоковий стан дає ті самі score, що й
+    fit на тому ж вікні.
+    """
 
     def __init__(
         self,
@@ -14,33 +30,110 @@ class LocationRecommender:
     ) -> None:
         self.kernel = kernel
         self.bandwidth = bandwidth
-        self.training_vecs: Dict[str, np.ndarray] = {}
+        self.catalog = None
+        # звідки брати «домашні» координати нових користувачів
+        self.members_info = None
+        self._reset()
+
+    def _reset(self) -> None:
+        # member_id -> рядок у self.points
+        self.member_index: Dict[str, int] = {}
+        self.points = RaggedArray.from_arrays([], dim=2)
+        self.point_events = np.empty(0, dtype=np.int64)
+        # рядок користувача → [(рядок події, ±1), …], ще не злиті з points
+        self._pending: DefaultDict[int, List[Tuple[int, int]]] = defaultdict(list)
+        self._n_pending = 0
 
     # ------------------------------------------------------------------ #
-    # 1. Навчання: збір (lat, lon) усіх відвіданих користувачем подій
+    # 1. Потокові оновлення історії
     # ------------------------------------------------------------------ #
-    def fit(
-        self,
-        train_events: Dict[str, List[str]],
-        repo: Dict[str, Dict],
-    ) -> None:
-        """Формує матриці [n_events × 2] для кожного користувача."""
-        events_info = repo["events_info"]
-        members_info = repo["members_info"]
+    def _buffer(self, row: int, event_id: str, sign: int) -> None:
+        self._pending[row].append((int(self.catalog.event_rows([event_id])[0]), sign))
+        self._n_pending += 1
+        if self._n_pending >= max(_MIN_COMPACT, len(self.point_events)):
+            self._compact()
+
+    def add_rsvp(self, member_id: str, event_id: str) -> None:
+        """Додає точку події до історії користувача."""
+        row = self.member_index.setdefault(member_id, len(self.member_index))
+        self._buffer(row, event_id, +1)
+
+    def expire_rsvp(self, member_id: str, event_id: str) -> None:
+        """Вилучає RSVP, що випав з вікна; невідомі RSVP пропускаються при злитті."""
+        row = self.member_index.get(member_id)
+        if row is not None:
+            self._buffer(row, event_id, -1)
+
+    def flush(self) -> None:
+        """Зливає накопичені оновлення зараз (score_matrix робить це сам)."""
+        self._compact()
+
+    def _compact(self) -> None:
+        """Перебудовує рядки змінених користувачів і зливає їх з рештою точок."""
+        if not self._pending:
+            return
+        n_old = len(self.points)
+        offsets = self.points.offsets
+        labels = np.repeat(np.arange(n_old), np.diff(offsets))
+        dirty = np.zeros(len(self.member_index), dtype=bool)
+        dirty[list(self._pending)] = True
+        keep = ~dirty[labels]
+
+        new_labels, new_events, new_coords = [], [], []
+        member_ids = list(self.member_index)
+        for row, ops in self._pending.items():
+            if row < n_old:
+                start, end = offsets[row], offsets[row + 1]
+                home = self.points.values[start:start + 1]
+                history = Counter(self.point_events[start + 1:end].tolist())
+            else:
+                home = self.members_info.coords(self.members_info.rows([member_ids[row]]))
+                history = Counter()
+            for event_row, sign in ops:
+                if sign > 0 or history[event_row] > 0:
+                    history[event_row] += sign
+            events = np.array(sorted(history.elements()), dtype=np.int64)
+            new_labels.append(np.full(len(events) + 1, row, dtype=np.int64))
+            new_events.append(np.concatenate(([-1], events)))
+            new_coords.append(
+                np.vstack((home, self.catalog.events.coords(events))).astype(np.float32)
+            )
+
+        all_labels = np.concatenate([labels[keep], *new_labels])
+        order = np.argsort(all_labels, kind="stable")
+        self.point_events = np.concatenate([self.point_events[keep], *new_events])[order]
+        values = np.concatenate([self.points.values[keep], *new_coords])[order]
+        new_offsets = np.zeros(len(self.member_index) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(all_labels, minlength=len(self.member_index)), out=new_offsets[1:])
+        self.points = RaggedArray(values, new_offsets)
+        self._pending.clear()
+        self._n_pending = 0
 
+    # ------------------------------------------------------------------ #
+    # 2. Навчання: збір (lat, lon) усіх відвіданих користувачем подій
+    # ------------------------------------------------------------------ #
+    def fit(self, train_view: Dict) -> None:
+        """
+        Формує точки [1 + n_events × 2] для кожного користувача
+        (рівнозначно add_rsvp для кожного RSVP вікна).  Для потокових
+        оновлень members_info має містити й нових користувачів.
+        """
+        train_events = train_view["members_events"]
+        self.members_info = train_view["members_info"]
+        self.catalog = train_view["catalog"]
+        self._reset()
         for member_id, event_ids in train_events.items():
-            coords = [
-                (members_info[member_id]["lat"], members_info[member_id]["lon"]),
-                *[
-                    (events_info[e_id]["lat"], events_info[e_id]["lon"])
-                    for e_id in event_ids
-                ],
-            ]
-            self.training_vecs[member_id] = np.asarray(coords)
+            for e_id in event_ids:
+                self.add_rsvp(member_id, e_id)
+        self._compact()
 
     # ------------------------------------------------------------------ #
-    # 2. Інференс: оцінка правдоподібності KDE для candidate-подій
+    # 3. Інференс: оцінка правдоподібності KDE для candidate-подій
     # ------------------------------------------------------------------ #
+    def _has_history(self, member_id: str) -> bool:
+        row = self.member_index.get(member_id)
+        return row is not None and len(self.points[row]) > 1
+
     def score_candidates(
         self,
         member_id: str,
@@ -49,21 +142,32 @@ class LocationRecommender:
         sim_scores: Dict[str, Dict[str, float]],
     ) -> None:
         """Записує KDE-score у sim_scores[member_id][event_id]."""
-        if member_id not in self.training_vecs:
+        self._compact()
+        if not self._has_history(member_id):
             # нема історії – нічим навчати розподіл
             return
 
-        member_coords = self.training_vecs[member_id]
-        kde = KernelDensity(kernel=self.kernel, bandwidth=self.bandwidth).fit(
-            member_coords
-        )
-
-        events_info = repo["events_info"]
+        densities = self.score_matrix(
+            self.catalog.member_rows([member_id]), self.catalog.event_rows(candidate_events)
+        )[0]
         user_dict = sim_scores.setdefault(member_id, {})
+        for e_id, density in zip(candidate_events, densities):
+            user_dict[e_id] = float(density)
 
-        for e_id in candidate_events:
-            lat, lon = events_info[e_id]["lat"], events_info[e_id]["lon"]
-            # KDE повертає log-density → перетворюємо в density через exp
-            user_dict[e_id] = float(
-                np.exp(kde.score_samples([[lat, lon]])[0])
-            )
+    def score_matrix(self, member_idx: np.ndarray, event_idx: np.ndarray) -> np.ndarray:
+        """float32 [members × events]; користувачі без історії → 0."""
+        self._compact()
+        points = self.catalog.events.coords(event_idx)
+
+        scores = np.zeros((len(member_idx), len(event_idx)), dtype=np.float32)
+        for row, member_id in enumerate(self.catalog.members(member_idx)):
+            if self._has_history(member_id):
+                scores[row] = self._densities(member_id, points)
+        return scores
+
+    def _densities(self, member_id: str, points: np.ndarray) -> np.ndarray:
+        kde = KernelDensity(kernel=self.kernel, bandwidth=self.bandwidth).fit(
+            self.points[self.member_index[member_id]]
+        )
+        # KDE повертає log-density → перетворюємо в density через exp
+        return np.exp(kde.score_samples(points))
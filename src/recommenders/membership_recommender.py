@@ -0,0 +1,44 @@
+from typing import Dict, List
+
+import numpy as np
+
+from ..membership import MembershipIndex
+
+
+class GroupMembershipRecommender:
+    """
+    Соціальна ознака: чи складається користувач у групі, що проводить подію.
+
+    Кожна подія належить рівно одній групі, тож «скільки груп користувача
+    проводять подію» збігається з індикатором членства (0 / 1).
+    """
+
+    def __init__(self) -> None:
+        self.index: MembershipIndex | None = None
+        self.catalog = None
+
+    def fit(self, train_view: Dict) -> None:
+        """Індекс будується один раз на місто; тут лише беремо посилання."""
+        self.index = train_view["membership"]
+        self.catalog = train_view["catalog"]
+
+    def score_matrix(self, member_idx: np.ndarray, event_idx: np.ndarray) -> np.ndarray:
+        """float32 [members × events] з 0 / 1."""
+        group_cols = self.index.group_cols(self.catalog.event_groups(event_idx))
+        member_rows = self.index.member_rows(self.catalog.members(member_idx))
+        return self.index.lookup(member_rows, group_cols).astype(np.float32)
+
+    def score_candidates(
+        self,
+        member_id: str,
+        candidate_events: List[str],
+        repo: Dict[str, Dict],
+        sim_scores: Dict[str, Dict[str, float]],
+    ) -> None:
+        """Записує індикатор членства у sim_scores[member_id][event_id]."""
+        scores = self.score_matrix(
+            self.catalog.member_rows([member_id]), self.catalog.event_rows(candidate_events)
+        )[0]
+        user_dict = sim_scores.setdefault(member_id, {})
+        for e_id, score in zip(candidate_events, scores):
+            user_dict[e_id] = float(score)
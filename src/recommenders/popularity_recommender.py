@@ -0,0 +1,45 @@
+from typing import Dict, Literal
+
+import numpy as np
+
+from ..popularity import PopularityIndex
+
+
+class PopularityRecommender:
+    """
+    Популярність групи, що проводить подію (однакова для всіх користувачів).
+
+    • kind="count" — log(1 + RSVP подій групи за train-вікно);
+    • kind="trend" — log((1 + RSVP за train-вікно) / (1 + RSVP за вікно
+      тієї ж довжини перед ним)).
+
+    Обидві — два пошуки в PopularityIndex на групу, тож fit не сканує RSVP.
+    """
+
+    def __init__(self, kind: Literal["count", "trend"] = "count") -> None:
+        if kind not in ("count", "trend"):
+            raise ValueError(f"Unknown popularity kind: {kind}")
+        self.kind = kind
+        self.index: PopularityIndex | None = None
+        # група → score
+        self.group_scores: np.ndarray | None = None
+        self.catalog = None
+
+    def fit(self, train_view: Dict) -> None:
+        self.index = train_view["popularity"]
+        self.catalog = train_view["catalog"]
+        start, end = train_view["window"]
+
+        groups = np.arange(len(self.index.group_index))
+        recent = self.index.rsvps(groups, start, end)
+        if self.kind == "count":
+            self.group_scores = np.log1p(recent).astype(np.float32)
+        else:
+            prior = self.index.rsvps(groups, 2 * start - end, start - 1)
+            self.group_scores = np.log((1.0 + recent) / (1.0 + prior)).astype(np.float32)
+
+    def score_matrix(self, member_idx: np.ndarray, event_idx: np.ndarray) -> np.ndarray:
+        """float32 [members × events]: рядок подій, повторений для кожного користувача."""
+        group_cols = self.index.group_cols(self.catalog.event_groups(event_idx))
+        row = np.where(group_cols >= 0, self.group_scores[group_cols], 0.0).astype(np.float32)
+        return np.tile(row, (len(member_idx), 1))
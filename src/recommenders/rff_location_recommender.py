@@ -0,0 +1,140 @@
+from typing import Dict, Literal
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.stats import norm, qmc
+
+from .location_recommender import LocationRecommender
+
+# точок в одному блоці при обчисленні ознак історії
+_CHUNK = 4096
+
+
+class RFFLocationRecommender:
+    """
+    Наближення гаусового KDE LocationRecommender випадковими ознаками Фурʼє.
+
+    k_h(x − y) = exp(−|x − y|² / 2h²) = E_ω[cos ω·(x − y)], ω ~ N(0, I / h²);
+    cos ω·(x − y) = cos ωx · cos ωy + sin ωx · sin ωy, тож
+
+        density_m(x) ≈ φ(x) · u_m,   φ(x) = [cos Ωx, sin Ωx] ∈ R^{2D},
+
+    де u_m — сума φ по точках історії користувача (дім + події) з
+    нормуванням KDE.  Bandwidth "scott" / "silverman" залежить від кількості
+    точок користувача, тому частоти Ω спільні: вибрані з N(0, I / h_q²) для
+    найменшої bandwidth h_q, а кожен користувач зважує їх відношенням
+    густин p_h(ω) / q(ω) ≤ (h / h_q)^d (importance sampling).  Частоти за
+    замовчуванням — scrambled Sobol (sampling="qmc"): у 2-D це на 1–2
+    порядки точніше за псевдовипадкові при тому ж D.  Усі score блоку —
+    один добуток [members × 2D] · [2D × events].
+
+    n_components (D) — компроміс розмір / точність; похибку відносно
+    точного KDE видно в `scripts/benchmarks.py location-rff`.
+    """
+
+    def __init__(
+        self,
+        n_components: int = 256,
+        bandwidth: float | str = "scott",
+        sampling: Literal["qmc", "random"] = "qmc",
+        seed: int = 0,
+    ) -> None:
+        if sampling not in ("qmc", "random"):
+            raise ValueError(f"Unknown sampling: {sampling}")
+        self.n_components = n_components
+        self.bandwidth = bandwidth
+        self.sampling = sampling
+        self.seed = seed
+        self.member_index: Dict[str, int] = {}
+        # members × 2D: вектори історій (float32)
+        self.embeddings: np.ndarray | None = None
+        self.frequencies: np.ndarray | None = None      # [D × 2]
+        self.center = np.zeros(2)
+        self.catalog = None
+        # останній блок candidate-подій для score_matrix
+        self._block_idx: np.ndarray | None = None
+        self._block_features: np.ndarray | None = None
+
+    def _bandwidths(self, n_points: np.ndarray) -> np.ndarray:
+        """Bandwidth KernelDensity для історії з n_points точок (d = 2)."""
+        if self.bandwidth == "scott":
+            return n_points ** (-1 / 6)
+        if self.bandwidth == "silverman":
+            return (n_points * (2 + 2) / 4) ** (-1 / 6)
+        if isinstance(self.bandwidth, str):
+            raise ValueError(f"Unknown bandwidth: {self.bandwidth}")
+        return np.full(len(n_points), float(self.bandwidth))
+
+    def _normal(self, shape: tuple[int, int]) -> np.ndarray:
+        """N(0, I): scrambled Sobol + обернена CDF (qmc) або псевдовипадкові."""
+        if self.sampling == "random":
+            return np.random.default_rng(self.seed).normal(size=shape)
+        sobol = qmc.Sobol(d=shape[1], scramble=True, seed=self.seed)
+        return norm.ppf(sobol.random(shape[0]))
+
+    def _features(self, coords: np.ndarray) -> np.ndarray:
+        """φ(x) = [cos Ωx, sin Ωx] (float64, [n × 2D])."""
+        phase = (coords - self.center) @ self.frequencies.T
+        return np.hstack((np.cos(phase), np.sin(phase)))
+
+    # ------------------------------------------------------------------ #
+    # 1. Навчання: вектор фіксованої довжини на користувача
+    # ------------------------------------------------------------------ #
+    def fit(self, train_view: Dict) -> None:
+        # ті самі точки (дім + події), що й у точного KDE
+        exact = LocationRecommender(kernel="gaussian", bandwidth=self.bandwidth)
+        exact.fit(train_view)
+        points = exact.points
+        self.member_index = exact.member_index
+        self.catalog = train_view["catalog"]
+        self._block_idx = None
+
+        n_members, dim = len(points), 2
+        n_points = np.diff(points.offsets).astype(np.float64)
+        h = self._bandwidths(n_points)
+        h_q = h.min() if n_members else 1.0
+        self.frequencies = self._normal((self.n_components, dim)) / h_q
+        self.center = points.values.mean(axis=0) if len(points.values) else np.zeros(dim)
+
+        # суми φ по точках кожного користувача
+        sums = np.zeros((n_members, 2 * self.n_components))
+        labels = np.repeat(np.arange(n_members), n_points.astype(np.int64))
+        for start in range(0, len(labels), _CHUNK):
+            chunk = labels[start:start + _CHUNK]
+            owners = sp.csr_matrix(
+                (np.ones(len(chunk)), (chunk, np.arange(len(chunk)))),
+                shape=(n_members, len(chunk)),
+            )
+            sums += owners @ self._features(points.values[start:start + _CHUNK])
+
+        # density = (2πh²)^(-d/2) · mean_i k_h(x − x_i);  вага ω_j: p_h / q
+        sq_norm = (self.frequencies ** 2).sum(axis=1)
+        ratio = (h[:, None] / h_q) ** dim * np.exp(
+            -(h[:, None] ** 2 - h_q ** 2) * sq_norm[None, :] / 2
+        )
+        scale = (2 * np.pi * h ** 2) ** (-dim / 2) / (n_points * self.n_components)
+        weights = ratio * scale[:, None]
+        self.embeddings = (sums * np.hstack((weights, weights))).astype(np.float32)
+
+    # ------------------------------------------------------------------ #
+    # 2. Інференс: один матричний добуток на блок
+    # ------------------------------------------------------------------ #
+    def score_matrix(self, member_idx: np.ndarray, event_idx: np.ndarray) -> np.ndarray:
+        """float32 [members × events]; користувачі без історії → 0, density ≥ 0."""
+        if self._block_idx is None or not np.array_equal(event_idx, self._block_idx):
+            self._block_idx = event_idx
+            self._block_features = self._features(
+                self.catalog.events.coords(event_idx)
+            ).astype(np.float32)
+
+        rows = np.fromiter(
+            (self.member_index.get(m_id, -1) for m_id in self.catalog.members(member_idx)),
+            dtype=np.int64,
+            count=len(member_idx),
+        )
+        scores = np.zeros((len(member_idx), len(event_idx)), dtype=np.float32)
+        known = np.flatnonzero(rows >= 0)
+        if len(known):
+            block = self.embeddings[rows[known]] @ self._block_features.T
+            scores[known] = np.maximum(block, 0.0)
+        return scores
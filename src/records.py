@@ -0,0 +1,244 @@
+"""
+Компактні записи подій і користувачів.
+
+Замість dict-of-dicts ({event_id: {"time", "lat", "lon", "description"}})
+дані зберігаються у паралельних NumPy-колонках:
+
+• time  – int64;
+• lat / lon – float32;
+• description – індекс в пулі унікальних (інтернованих) описів.
+
+Таблиці поводяться як read-only Mapping (event_id → запис), тож старий
+код на кшталт `events_info[e_id]["time"]` працює без змін, а «гарячі»
+місця (partition, KDE, best-users) читають колонки напряму.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List
+
+import numpy as np
+
+_EVENT_FIELDS = frozenset(("time", "lat", "lon", "description"))
+_MEMBER_FIELDS = frozenset(("lat", "lon"))
+
+
+# ──────────────────────────────────────────────────────────────
+# 1. Тонкі accessor-и (один рядок таблиці)
+# ──────────────────────────────────────────────────────────────
+class EventRecord:
+    """Подія як обʼєкт з атрибутами; не копіює дані з таблиці."""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: "EventTable", row: int) -> None:
+        self._table = table
+        self._row = row
+
+    @property
+    def time(self) -> int:
+        return int(self._table.time[self._row])
+
+    @property
+    def lat(self) -> float:
+        return float(self._table.lat[self._row])
+
+    @property
+    def lon(self) -> float:
+        return float(self._table.lon[self._row])
+
+    @property
+    def description(self) -> str:
+        return self._table.descriptions[self._table.desc_idx[self._row]]
+
+    def __getitem__(self, key: str):
+        """Сумісність зі старим доступом `info["time"]`."""
+        if key not in _EVENT_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __repr__(self) -> str:
+        return (
+            f"EventRecord(time={self.time}, lat={self.lat:.5f}, "
+            f"lon={self.lon:.5f}, description={self.description!r})"
+        )
+
+
+class MemberRecord:
+    """Координати користувача як обʼєкт з атрибутами."""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: "MemberTable", row: int) -> None:
+        self._table = table
+        self._row = row
+
+    @property
+    def lat(self) -> float:
+        return float(self._table.lat[self._row])
+
+    @property
+    def lon(self) -> float:
+        return float(self._table.lon[self._row])
+
+    def __getitem__(self, key: str):
+        if key not in _MEMBER_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __repr__(self) -> str:
+        return f"MemberRecord(lat={self.lat:.5f}, lon={self.lon:.5f})"
+
+
+# ──────────────────────────────────────────────────────────────
+# 2. Базова колонкова таблиця (id → рядок)
+# ──────────────────────────────────────────────────────────────
+class _Table(Mapping):
+    """Спільна логіка: список id, лінивий індекс id → рядок."""
+
+    __slots__ = ("ids", "_index")
+
+    def __init__(self, ids: List[str]) -> None:
+        self.ids = ids
+        self._index: Dict[str, int] | None = None
+
+    @property
+    def index(self) -> Dict[str, int]:
+        if self._index is None:
+            self._index = {id_: row for row, id_ in enumerate(self.ids)}
+        return self._index
+
+    def rows(self, ids: Iterable[str], skip_missing: bool = False) -> np.ndarray:
+        """Номери рядків для id (KeyError для невідомих, якщо не skip_missing)."""
+        index = self.index
+        if skip_missing:
+            return np.fromiter(
+                (index[i] for i in ids if i in index), dtype=np.int64
+            )
+        return np.fromiter((index[i] for i in ids), dtype=np.int64)
+
+    # ---- Mapping-протокол -------------------------------------------
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, id_: object) -> bool:
+        return id_ in self.index
+
+
+# ──────────────────────────────────────────────────────────────
+# 3. Події
+# ──────────────────────────────────────────────────────────────
+class EventTable(_Table):
+    """Події міста: паралельні колонки + пул описів."""
+
+    __slots__ = ("time", "lat", "lon", "desc_idx", "descriptions")
+
+    def __init__(
+        self,
+        ids: List[str],
+        time: np.ndarray,
+        lat: np.ndarray,
+        lon: np.ndarray,
+        desc_idx: np.ndarray,
+        descriptions: List[str],
+    ) -> None:
+        super().__init__(ids)
+        self.time = time
+        self.lat = lat
+        self.lon = lon
+        self.desc_idx = desc_idx
+        self.descriptions = descriptions
+
+    @classmethod
+    def from_dict(cls, events_info: Dict[str, Dict]) -> "EventTable":
+        """Будує таблицю з json-структури {event_id: {time, lat, lon, description}}."""
+        n = len(events_info)
+        time = np.empty(n, dtype=np.int64)
+        lat = np.empty(n, dtype=np.float32)
+        lon = np.empty(n, dtype=np.float32)
+        desc_idx = np.empty(n, dtype=np.int32)
+        pool: Dict[str, int] = {}
+
+        for row, info in enumerate(events_info.values()):
+            time[row] = info["time"]
+            lat[row] = info["lat"]
+            lon[row] = info["lon"]
+            desc_idx[row] = pool.setdefault(info["description"], len(pool))
+
+        return cls(list(events_info), time, lat, lon, desc_idx, list(pool))
+
+    def __getitem__(self, event_id: str) -> EventRecord:
+        return EventRecord(self, self.index[event_id])
+
+    # ---- вибірки ----------------------------------------------------
+    def take(self, rows: np.ndarray) -> "EventTable":
+        """Підтаблиця за номерами рядків (пул описів спільний)."""
+        return EventTable(
+            [self.ids[r] for r in rows],
+            self.time[rows],
+            self.lat[rows],
+            self.lon[rows],
+            self.desc_idx[rows],
+            self.descriptions,
+        )
+
+    def window_mask(self, start: int, end: int) -> np.ndarray:
+        """Булева маска подій з часом у [start, end]."""
+        return (self.time >= start) & (self.time <= end)
+
+    def window(self, start: int, end: int) -> "EventTable":
+        return self.take(np.flatnonzero(self.window_mask(start, end)))
+
+    def coords(self, rows: np.ndarray) -> np.ndarray:
+        """Матриця [len(rows) × 2] з (lat, lon)."""
+        return np.column_stack((self.lat[rows], self.lon[rows]))
+
+    def texts(self, event_ids: Iterable[str]) -> List[str]:
+        descriptions, desc_idx = self.descriptions, self.desc_idx
+        return [descriptions[desc_idx[r]] for r in self.rows(event_ids)]
+
+    @property
+    def nbytes(self) -> int:
+        """Приблизний обсяг колонок (без списку id та пулу описів)."""
+        return sum(a.nbytes for a in (self.time, self.lat, self.lon, self.desc_idx))
+
+
+# ──────────────────────────────────────────────────────────────
+# 4. Користувачі
+# ──────────────────────────────────────────────────────────────
+class MemberTable(_Table):
+    """Домашні координати користувачів."""
+
+    __slots__ = ("lat", "lon")
+
+    def __init__(self, ids: List[str], lat: np.ndarray, lon: np.ndarray) -> None:
+        super().__init__(ids)
+        self.lat = lat
+        self.lon = lon
+
+    @classmethod
+    def from_dict(cls, members_info: Dict[str, Dict]) -> "MemberTable":
+        n = len(members_info)
+        lat = np.empty(n, dtype=np.float32)
+        lon = np.empty(n, dtype=np.float32)
+        for row, info in enumerate(members_info.values()):
+            lat[row] = info["lat"]
+            lon[row] = info["lon"]
+        return cls(list(members_info), lat, lon)
+
+    def __getitem__(self, member_id: str) -> MemberRecord:
+        return MemberRecord(self, self.index[member_id])
+
+    def take(self, rows: np.ndarray) -> "MemberTable":
+        return MemberTable([self.ids[r] for r in rows], self.lat[rows], self.lon[rows])
+
+    def coords(self, rows: np.ndarray) -> np.ndarray:
+        return np.column_stack((self.lat[rows], self.lon[rows]))
+
+    @property
+    def nbytes(self) -> int:
+        return self.lat.nbytes + self.lon.nbytes
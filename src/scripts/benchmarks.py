@@ -0,0 +1,538 @@
+#!/usr/bin/env python3.10
+"""
+Вимірювання пропускної здатності та точності оптимізованих шляхів.
+
+    python -m src.scripts.benchmarks content-stream --city LCHICAGO
+    python -m src.scripts.benchmarks l2r --city LCHICAGO --members 100
+    python -m src.scripts.benchmarks load --city LCHICAGO --scale 20
+    python -m src.scripts.benchmarks state --city LCHICAGO
+    python -m src.scripts.benchmarks online --city LCHICAGO --repeat 3
+    python -m src.scripts.benchmarks location-rff --city LCHICAGO
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Tuple
+
+import numpy as np
+
+from sklearn.metrics import precision_recall_fscore_support
+
+from src.activity import ActivityIndex
+from src.features import FEATURES, feature_matrix, score_ids
+from src.main import DATA_DIR, load_repo
+from src.preprocessing import (
+    RsvpIndex,
+    load_events,
+    load_groups,
+    load_members,
+    load_rsvps,
+)
+from src.partition import TRAIN_INTERVAL, WindowEngine, get_timestamps
+from src.recommenders.hybrid_recommender import LearningToRank, make_model
+from src.recommenders.content_recommender import ContentRecommender
+from src.recommenders.grp_freq_recommender import GroupFrequencyRecommender
+from src.recommenders.location_recommender import LocationRecommender
+from src.recommenders.rff_location_recommender import RFFLocationRecommender
+from src.recommenders.hashed_content_recommender import HashedContentRecommender
+
+
+# ────────────────────────────────────────────────────────────────────
+def _rate(count: int, seconds: float) -> str:
+    return f"{count / seconds:,.0f}/s" if seconds > 0 else "n/a"
+
+
+def _event_members(members_events: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    out: Dict[str, List[str]] = defaultdict(list)
+    for m_id, events in members_events.items():
+        for e_id in events:
+            out[e_id].append(m_id)
+    return out
+
+
+# ────────────────────────────────────────────────────────────────────
+# content-stream: HashedContentRecommender як потокова модель
+# ────────────────────────────────────────────────────────────────────
+def bench_content_stream(repo: Dict, args: argparse.Namespace) -> None:
+    """
+    Події надходять у порядку часу пачками по `--batch`; вікно — останні
+    TRAIN_INTERVAL секунд (старіші події expire).  Наприкінці потоковий
+    стан порівнюється з fit на тому ж вікні та з TF-IDF ContentRecommender.
+    """
+    events_info = repo["events_info"]
+    attendees = _event_members(repo["members_events"])
+    order = np.argsort(events_info.time, kind="stable")
+    times = events_info.time[order]
+    event_ids = [events_info.ids[row] for row in order.tolist()]
+
+    rec = HashedContentRecommender(n_features=args.n_features)
+    expired_upto = 0
+    spent = {"add": 0.0, "rsvp": 0.0, "expire": 0.0}
+    counts = {"add": 0, "rsvp": 0, "expire": 0}
+
+    for start in range(0, len(event_ids), args.batch):
+        batch = event_ids[start:start + args.batch]
+
+        t0 = time.perf_counter()
+        rec.add_events(batch, repo)
+        t1 = time.perf_counter()
+        n_rsvp = 0
+        for e_id in batch:
+            for m_id in attendees.get(e_id, ()):
+                rec.add_rsvp(m_id, e_id)
+                n_rsvp += 1
+        t2 = time.perf_counter()
+
+        horizon = times[min(start + args.batch, len(times)) - 1] - TRAIN_INTERVAL
+        old_end = int(np.searchsorted(times, horizon, side="left"))
+        rec.expire_events(event_ids[expired_upto:old_end])
+        t3 = time.perf_counter()
+
+        spent["add"] += t1 - t0
+        spent["rsvp"] += t2 - t1
+        spent["expire"] += t3 - t2
+        counts["add"] += len(batch)
+        counts["rsvp"] += n_rsvp
+        counts["expire"] += max(old_end - expired_upto, 0)
+        expired_upto = max(expired_upto, old_end)
+
+    print(f"n_features        {rec.n_features}  (df: {rec.df.nbytes / 1024:.0f} KiB)")
+    for kind in ("add", "rsvp", "expire"):
+        print(f"{kind:<17} {counts[kind]:>9,}  {_rate(counts[kind], spent[kind])}")
+    print(f"live events       {rec.n_docs:,}  profiles {rec.n_profiles:,}")
+
+    # ── потоковий стан == fit на тому ж вікні ───────────────────────
+    live_ids = set(event_ids[expired_upto:])
+    window_events = {
+        m_id: kept
+        for m_id, events in repo["members_events"].items()
+        if (kept := [e_id for e_id in events if e_id in live_ids])
+    }
+    refit = HashedContentRecommender(n_features=args.n_features)
+    refit.fit({**repo, "members_events": window_events})
+    refit.add_events(event_ids[expired_upto:], repo)     # події без RSVP теж у корпусі
+    members = sorted(window_events)[: args.members]
+    probe = sorted(live_ids)[: args.events]
+    catalog = repo["catalog"]
+    streamed = score_ids(rec, catalog, members, probe)
+    fitted = score_ids(refit, catalog, members, probe)
+    print(f"stream vs refit   max |Δ| {np.abs(streamed - fitted).max():.2e}")
+
+    # ── hashed vs словниковий TF-IDF на partition ───────────────────
+    ts = int(times[-1]) - TRAIN_INTERVAL
+    train_repo, test_repo = WindowEngine(repo).partition(ts)
+    members = sorted(train_repo["members_events"])[: args.members]
+    candidates = list(test_repo["events_info"])[: args.events]
+    exact = ContentRecommender()
+    exact.fit(train_repo)
+    hashed = HashedContentRecommender(n_features=args.n_features)
+    hashed.fit(train_repo)
+    a = score_ids(exact, catalog, members, candidates).ravel()
+    b = score_ids(hashed, catalog, members, candidates).ravel()
+    corr = np.corrcoef(a, b)[0, 1] if a.std() and b.std() else float("nan")
+    print(f"hashed vs tfidf   corr {corr:.4f}  mean |Δ| {np.abs(a - b).mean():.4f}")
+
+
+# ────────────────────────────────────────────────────────────────────
+# l2r: час навчання мета-моделей і F1 на тих самих матрицях
+# ────────────────────────────────────────────────────────────────────
+L2R_VARIANTS = {
+    "rf": ("rf", {}),
+    "mlp": ("mlp", {}),
+    "gbm": ("gbm", {}),
+    "gbm-rank": ("gbm", {"rank_by_member": True}),
+}
+
+
+def bench_l2r(repo: Dict, args: argparse.Namespace) -> None:
+    """
+    Для кожної partition: базові ознаки для top-`--members` користувачів,
+    розбиття 80/20 як у LearningToRank.learn, потім fit + predict кожного
+    варіанту.  Друкує сумарний час навчання і середній F1 класу 1.
+    """
+    windows = WindowEngine(repo)
+    spent = {name: 0.0 for name in L2R_VARIANTS}
+    f1s: Dict[str, List[float]] = {name: [] for name in L2R_VARIANTS}
+
+    for ts in sorted(get_timestamps(1_262_304_000, 1_388_534_400), reverse=True):
+        train_repo, test_repo = windows.partition(ts)
+        activity = repo["activity"]
+        members = activity.with_history(
+            activity.top(ts - TRAIN_INTERVAL, ts + TRAIN_INTERVAL, args.members),
+            ts - TRAIN_INTERVAL,
+            ts,
+        )
+        events = list(test_repo["events_info"])
+        simscores = {
+            name: feature_matrix(name, train_repo, test_repo, members, events)
+            for name in FEATURES
+        }
+        train_size = int(0.8 * args.members)
+        rsvp = test_repo["members_events"]
+        X_train, y_train = LearningToRank._build_matrix(
+            members[:train_size], events, {f: m[:train_size] for f, m in simscores.items()}, rsvp
+        )
+        X_test, y_test = LearningToRank._build_matrix(
+            members[train_size:], events, {f: m[train_size:] for f, m in simscores.items()}, rsvp
+        )
+        if not len(X_test):
+            continue
+
+        for name, (algo, params) in L2R_VARIANTS.items():
+            clf = make_model(algo, params)
+            fit_params = {"group_size": len(events)} if params.get("rank_by_member") else {}
+            start = time.perf_counter()
+            clf.fit(X_train, y_train, **fit_params)
+            spent[name] += time.perf_counter() - start
+            _, _, f1, _ = precision_recall_fscore_support(
+                y_test, clf.predict(X_test), labels=[0, 1], zero_division=0
+            )
+            f1s[name].append(f1[1])
+
+    print(f"{'model':<10} {'fit, s':>8} {'mean F1':>8}")
+    for name in L2R_VARIANTS:
+        print(f"{name:<10} {spent[name]:>8.2f} {np.mean(f1s[name]):>8.3f}")
+
+
+# ────────────────────────────────────────────────────────────────────
+def _traced(fn: Callable[[], Any]) -> Tuple[Any, float, int, int]:
+    """
+    (результат, секунди, пік памʼяті, памʼять результату), памʼять — байти
+    tracemalloc; час міряється окремим запуском без трасування.
+    """
+    start = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    result = fn()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak, retained
+
+
+def _load_rsvps_dict(rsvp_path: Path) -> Dict[str, List[str]]:
+    """Попередній load_rsvps: увесь json у dict, потім інверсія."""
+    member_to_events: Dict[str, List[str]] = defaultdict(list)
+    for event_id, member_ids in json.loads(rsvp_path.read_text(encoding="utf-8")).items():
+        for member_id in member_ids:
+            member_to_events[member_id].append(event_id)
+    return member_to_events
+
+
+def _scaled_rsvps(rsvp_path: Path, scale: int, out_dir: Path) -> Path:
+    """rsvp_events.json, повторений `scale` разів (id подій і користувачів з суфіксом)."""
+    event_members = json.loads(rsvp_path.read_text(encoding="utf-8"))
+    out = out_dir / "rsvp_events.json"
+    with open(out, "w", encoding="utf-8") as fh:
+        json.dump(
+            {
+                f"{e_id}_{copy}": [f"{m_id}_{copy}" for m_id in member_ids]
+                for copy in range(scale)
+                for e_id, member_ids in event_members.items()
+            },
+            fh,
+        )
+    return out
+
+
+def bench_load(repo: Dict, args: argparse.Namespace) -> None:
+    """
+    Завантаження RSVP: json.load + інверсія проти потокового RsvpIndex
+    (час, пік памʼяті, памʼять результату), і час розбору файлів міста
+    та повного load_repo.
+    """
+    city_dir = DATA_DIR / args.city
+    with tempfile.TemporaryDirectory() as tmp:
+        rsvp_path = city_dir / "rsvp_events.json"
+        if args.scale > 1:
+            rsvp_path = _scaled_rsvps(rsvp_path, args.scale, Path(tmp))
+        size = rsvp_path.stat().st_size
+        index = RsvpIndex.from_json(rsvp_path)
+        print(
+            f"{rsvp_path.name}: {size / 2 ** 20:.1f} MiB, {len(index.event_ids):,} events, "
+            f"{len(index.member_ids):,} members, {len(index.event_members):,} RSVPs"
+        )
+
+        old, *old_stats = _traced(lambda: _load_rsvps_dict(rsvp_path))
+        index, *index_stats = _traced(lambda: RsvpIndex.from_json(rsvp_path))
+        new, *new_stats = _traced(lambda: load_rsvps(rsvp_path))
+        assert list(old.items()) == list(new.items())
+        del old, new
+
+    print(f"{'loader':<26} {'time, s':>8} {'peak, MiB':>10} {'result, MiB':>12}")
+    for name, (seconds, peak, retained) in (
+        ("json.load + inversion", old_stats),
+        ("RsvpIndex (CSR int32)", index_stats),
+        ("load_rsvps (streaming)", new_stats),
+    ):
+        print(f"{name:<26} {seconds:>8.3f} {peak / 2 ** 20:>10.1f} {retained / 2 ** 20:>12.1f}")
+
+    # файли міста (як у load_repo, без індексів)
+    loaders = [
+        (load_groups, city_dir / "group_members.json", city_dir / "group_events.json"),
+        (load_events, city_dir / "events_info.json"),
+        (load_members, city_dir / "members_info.json"),
+        (RsvpIndex.from_json, city_dir / "rsvp_events.json"),
+    ]
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for fn, *paths in loaders:
+            fn(*paths)
+    parse = (time.perf_counter() - start) / args.repeat
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        load_repo(city_dir)
+    full = (time.perf_counter() - start) / args.repeat
+    print(
+        f"city files {parse:.3f} s;  load_repo with indexes {full:.3f} s"
+    )
+
+
+# ────────────────────────────────────────────────────────────────────
+def _retained(fn: Callable[[], Any]) -> Tuple[Any, int]:
+    """(результат, байти, що лишилися виділеними після fn) — tracemalloc."""
+    tracemalloc.start()
+    result = fn()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained
+
+
+def bench_state(repo: Dict, args: argparse.Namespace) -> None:
+    """
+    Памʼять навченого стану content / location (профілі на всій історії
+    міста): попереднє зберігання (окрема 1×d float64 CSR / float32-масив
+    на користувача) проти однієї квантованої CSR і RaggedArray; точність
+    score_matrix int8 / float16 відносно float32 на останній partition.
+    """
+    train_view = {**repo, "window": None}
+    exact = ContentRecommender(profile_dtype="float32")
+    exact.fit(train_view)
+    rows = np.arange(len(exact.member_index))
+    profiles = exact.profiles.rows(rows).astype(np.float64)
+
+    print(f"{len(rows):,} member profiles, {profiles.nnz:,} non-zeros")
+    print(f"{'state':<34} {'MiB':>8}")
+    legacy, legacy_bytes = _retained(lambda: [profiles[[row]] for row in rows.tolist()])
+    print(f"{'content: 1×d float64 CSR per member':<34} {legacy_bytes / 2 ** 20:>8.2f}")
+    del legacy
+    for dtype in ("float32", "float16", "int8"):
+        rec = ContentRecommender(profile_dtype=dtype)
+        rec.fit(train_view)
+        print(f"{f'content: one CSR, {dtype}':<34} {rec.profiles.nbytes / 2 ** 20:>8.2f}")
+
+    location = LocationRecommender()
+    location.fit(train_view)
+    legacy, legacy_bytes = _retained(
+        lambda: [location.points[row].copy() for row in range(len(location.points))]
+    )
+    print(f"{'location: array per member':<34} {legacy_bytes / 2 ** 20:>8.2f}")
+    print(f"{'location: RaggedArray float32':<34} {location.points.nbytes / 2 ** 20:>8.2f}")
+    del legacy
+
+    # точність: score_matrix останньої partition
+    windows = WindowEngine(repo)
+    ts = max(get_timestamps(1_262_304_000, 1_388_534_400))
+    train_repo, test_repo = windows.partition(ts)
+    catalog = repo["catalog"]
+    member_idx = catalog.member_rows(list(train_repo["members_events"])[:args.members])
+    event_idx = catalog.event_rows(list(test_repo["events_info"])[:args.events])
+    reference = ContentRecommender(profile_dtype="float32")
+    reference.fit(train_repo)
+    expected = reference.score_matrix(member_idx, event_idx)
+    k = min(10, len(event_idx))
+    expected_top = np.argsort(-expected, axis=1, kind="stable")[:, :k]
+
+    print(f"{'profile dtype':<14} {'max |Δ|':>9} {'mean |Δ|':>9} {f'top-{k} overlap':>13}")
+    for dtype in ("float16", "int8"):
+        rec = ContentRecommender(profile_dtype=dtype)
+        rec.fit(train_repo)
+        got = rec.score_matrix(member_idx, event_idx)
+        top = np.argsort(-got, axis=1, kind="stable")[:, :k]
+        overlap = np.mean([len(set(a) & set(b)) / k for a, b in zip(expected_top, top)])
+        err = np.abs(got - expected)
+        print(f"{dtype:<14} {err.max():>9.5f} {err.mean():>9.6f} {overlap:>13.3f}")
+
+
+# ────────────────────────────────────────────────────────────────────
+# online: add_rsvp / expire_rsvp для location і group
+# ────────────────────────────────────────────────────────────────────
+def bench_online(repo: Dict, args: argparse.Namespace) -> None:
+    """
+    RSVP надходять у порядку часу подій; вікно — останні TRAIN_INTERVAL
+    секунд (RSVP старіших подій expire).  Потік проганяється `--repeat`
+    разів поспіль (час подій зсувається на тривалість потоку); наприкінці
+    стан порівнюється з fit на живому вікні — score мають збігатися точно.
+    """
+    events_info = repo["events_info"]
+    catalog = repo["catalog"]
+    attendees = _event_members(repo["members_events"])
+    order = np.argsort(events_info.time, kind="stable")
+    times = events_info.time[order]
+    event_ids = [events_info.ids[row] for row in order.tolist()]
+    stream = [(e_id, m_id) for e_id in event_ids for m_id in attendees.get(e_id, ())]
+    stream_times = np.repeat(times, [len(attendees.get(e_id, ())) for e_id in event_ids])
+    span = int(times[-1] - times[0]) + 1 if len(times) else 0
+
+    init_view = {**repo, "members_events": {}}
+    for name, rec in (("location", LocationRecommender()), ("group", GroupFrequencyRecommender())):
+        rec.fit(init_view)
+        live: Deque[Tuple[int, str, str]] = deque()
+        added = expired = 0
+        start = time.perf_counter()
+        for rep in range(args.repeat):
+            offset = rep * span
+            for (e_id, m_id), ts in zip(stream, stream_times.tolist()):
+                now = ts + offset
+                while live and live[0][0] < now - TRAIN_INTERVAL:
+                    _, old_e, old_m = live.popleft()
+                    rec.expire_rsvp(old_m, old_e)
+                    expired += 1
+                rec.add_rsvp(m_id, e_id)
+                live.append((now, e_id, m_id))
+                added += 1
+        rec.flush()                 # останнє злиття — теж частина оновлень
+        seconds = time.perf_counter() - start
+        print(
+            f"{name:<9} {added:>9,} add  {expired:>9,} expire  "
+            f"{_rate(added + expired, seconds)} RSVP updates"
+        )
+
+        # стан == fit на живому вікні
+        window: Dict[str, List[str]] = {}
+        for _, e_id, m_id in live:
+            window.setdefault(m_id, []).append(e_id)
+        refit = type(rec)()
+        refit.fit({**repo, "members_events": window})
+        member_idx = catalog.member_rows(sorted(window)[: args.members])
+        event_idx = catalog.event_rows(event_ids[-args.events:])
+        diff = np.abs(rec.score_matrix(member_idx, event_idx) - refit.score_matrix(member_idx, event_idx))
+        print(f"{'':<9} stream vs refit max |Δ| {diff.max():.1e}  ({len(window):,} live members)")
+
+
+# ────────────────────────────────────────────────────────────────────
+# location-rff: ознаки Фурʼє проти точного KDE
+# ────────────────────────────────────────────────────────────────────
+def bench_location_rff(repo: Dict, args: argparse.Namespace) -> None:
+    """
+    Остання partition: усі train-користувачі × усі test-події.  Час і
+    похибка RFFLocationRecommender (псевдовипадкові / Sobol частоти, різні
+    n_components) відносно LocationRecommender (gaussian, scott).
+    """
+    ts = max(get_timestamps(1_262_304_000, 1_388_534_400))
+    train_repo, test_repo = WindowEngine(repo).partition(ts)
+    catalog = repo["catalog"]
+    member_idx = catalog.member_rows(list(train_repo["members_events"]))
+    event_idx = catalog.event_rows(list(test_repo["events_info"]))
+    k = min(10, len(event_idx))
+
+    def timed(rec) -> Tuple[np.ndarray, float, float]:
+        start = time.perf_counter()
+        rec.fit(train_repo)
+        fitted = time.perf_counter()
+        scores = rec.score_matrix(member_idx, event_idx)
+        return scores, fitted - start, time.perf_counter() - fitted
+
+    exact, fit_s, score_s = timed(LocationRecommender())
+    exact_top = np.argsort(-exact, axis=1, kind="stable")[:, :k]
+    print(f"{len(member_idx):,} members × {len(event_idx):,} events, exact density max {exact.max():.3f}")
+    print(
+        f"{'model':<12} {'fit, s':>7} {'score, s':>9} {'max |Δ|':>8} {'mean |Δ|':>9} "
+        f"{'corr':>7} {f'top-{k}':>6}"
+    )
+    print(f"{'kde':<12} {fit_s:>7.2f} {score_s:>9.3f}")
+    for sampling in ("random", "qmc"):
+        for n_components in (64, 256, 1024, 4096):
+            approx, fit_s, score_s = timed(
+                RFFLocationRecommender(n_components=n_components, sampling=sampling)
+            )
+            top = np.argsort(-approx, axis=1, kind="stable")[:, :k]
+            overlap = np.mean([len(set(a) & set(b)) / k for a, b in zip(exact_top, top)])
+            err = np.abs(approx - exact)
+            corr = np.corrcoef(approx.ravel(), exact.ravel())[0, 1]
+            print(
+                f"{f'{sampling}-{n_components}':<12} {fit_s:>7.2f} {score_s:>9.3f} {err.max():>8.5f} "
+                f"{err.mean():>9.6f} {corr:>7.4f} {overlap:>6.3f}"
+            )
+
+
+# ────────────────────────────────────────────────────────────────────
+# activity: вибір test-користувачів з ActivityIndex проти сканування історій
+# ────────────────────────────────────────────────────────────────────
+def _scan_test_members(repo: Dict, train_repo: Dict, ts: int, k: int) -> List[str]:
+    """Попередній шлях: лічильники кожного користувача по його подіях + фільтр train."""
+    members_events, events_info = repo["members_events"], repo["events_info"]
+    start, end = ts - TRAIN_INTERVAL, ts + TRAIN_INTERVAL
+    counts = {}
+    for m_id, events in members_events.items():
+        times = events_info.time[events_info.rows(events, skip_missing=True)]
+        counts[m_id] = int(np.count_nonzero((times >= start) & (times <= end)))
+    best = sorted(counts, key=counts.get, reverse=True)[:k]
+    return [m for m in best if m in train_repo["members_events"]]
+
+
+def bench_activity(repo: Dict, args: argparse.Namespace) -> None:
+    """
+    Усі partition: top-`--members` користувачів вікна з історією у train —
+    скануванням історій і з ActivityIndex; час побудови індексу окремо.
+    """
+    windows = WindowEngine(repo)
+    start = time.perf_counter()
+    activity = ActivityIndex.build(repo["rsvps"], repo["events_info"])
+    build_s = time.perf_counter() - start
+    scan_s = index_s = 0.0
+    for ts in sorted(get_timestamps(1_262_304_000, 1_388_534_400), reverse=True):
+        train_repo, _ = windows.partition(ts)
+        start = time.perf_counter()
+        old = _scan_test_members(repo, train_repo, ts, args.members)
+        scan_s += time.perf_counter() - start
+        start = time.perf_counter()
+        best = activity.top(ts - TRAIN_INTERVAL, ts + TRAIN_INTERVAL, args.members)
+        new = activity.with_history(best, ts - TRAIN_INTERVAL, ts)
+        index_s += time.perf_counter() - start
+        assert old == new, ts
+    print(
+        f"{len(activity.member_ids):,} members, cum {activity.cum.shape}, "
+        f"{activity.nbytes / 2**10:.0f} KiB, build {build_s * 1e3:.1f} ms"
+    )
+    print(f"scan  {scan_s * 1e3:8.2f} ms\nindex {index_s * 1e3:8.2f} ms  (same members)")
+
+
+BENCHMARKS: Dict[str, Callable[[Dict, argparse.Namespace], None]] = {
+    "content-stream": bench_content_stream,
+    "l2r": bench_l2r,
+    "load": bench_load,
+    "state": bench_state,
+    "online": bench_online,
+    "location-rff": bench_location_rff,
+    "activity": bench_activity,
+}
+
+
+# ────────────────────────────────────────────────────────────────────
+def main() -> None:
+    argp = argparse.ArgumentParser("benchmarks")
+    argp.add_argument("bench", choices=BENCHMARKS)
+    argp.add_argument("--city", default="LCHICAGO", help="LCHICAGO | LSAN JOSE | LPHOENIX")
+    argp.add_argument("--batch", type=int, default=1000, help="Подій у пачці потоку")
+    argp.add_argument("--n-features", type=int, default=2 ** 18)
+    argp.add_argument("--members", type=int, default=200, help="Користувачів у перевірці")
+    argp.add_argument("--events", type=int, default=500, help="Подій у перевірці")
+    argp.add_argument("--scale", type=int, default=1, help="load: копій rsvp_events.json")
+    argp.add_argument("--repeat", type=int, default=3, help="load: повторів load_repo")
+    args = argp.parse_args()
+
+    repo = load_repo(DATA_DIR / args.city)
+    BENCHMARKS[args.bench](repo, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,11 @@
 from __future__ import annotations
 
 import argparse
-import json
-from collections import defaultdict
 from pathlib import Path
-from typing import DefaultDict, Dict, List
 
+from src.activity import ActivityIndex
 from src.partition import TRAIN_INTERVAL, get_timestamps
+from src.preprocessing import RsvpIndex, load_events
 
 # ────────────────────────────────────────────────────────────────────
 # 1. Шляхи
@@ -17,55 +16,15 @@ DATA_DIR = SRC_DIR / "data" / "json_data"       # …/src/data/json_data
 CITIES   = ["LCHICAGO", "LSAN JOSE", "LPHOENIX"]
 
 # ────────────────────────────────────────────────────────────────────
-def read_json(path: Path) -> Dict:
-    try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
-
-
-# ────────────────────────────────────────────────────────────────────
-def init_city(city: str) -> tuple[DefaultDict[str, List[str]], Dict]:
-    """member→events  та  events_info."""
+def init_city(city: str) -> ActivityIndex:
+    """Індекс активності міста (RSVP × час подій)."""
     city_dir = DATA_DIR / city
-    event_members = read_json(city_dir / "rsvp_events.json")
-    member_events: DefaultDict[str, List[str]] = defaultdict(list)
-    for evt, members in event_members.items():
-        for m in members:
-            member_events[m].append(evt)
-
-    events_info = read_json(city_dir / "events_info.json")
-    return member_events, events_info
-
-
-def rsvp_in_window(
-    member_events: DefaultDict[str, List[str]],
-    events_info: Dict,
-    member: str,
-    start_ts: int,
-    end_ts: int,
-) -> int:
-    return sum(
-        start_ts <= events_info[e]["time"] <= end_ts
-        for e in member_events.get(member, [])
-        if e in events_info
+    return ActivityIndex.build(
+        RsvpIndex.from_json(city_dir / "rsvp_events.json"),
+        load_events(city_dir / "events_info.json"),
     )
 
 
-def top_k_users(
-    member_events: DefaultDict[str, List[str]],
-    events_info: Dict,
-    start_ts: int,
-    end_ts: int,
-    k: int,
-) -> List[str]:
-    counts = {
-        m: rsvp_in_window(member_events, events_info, m, start_ts, end_ts)
-        for m in member_events
-    }
-    return sorted(counts, key=counts.get, reverse=True)[:k]
-
-
 # ────────────────────────────────────────────────────────────────────
 def main() -> None:
     argp = argparse.ArgumentParser("extract best users")
@@ -80,17 +39,11 @@ def main() -> None:
 
     ts_start, ts_end = 1_262_304_000, 1_388_534_400    # 01-01-2010 .. 01-01-2014
     for city in CITIES:
-        member_events, events_info = init_city(city)
+        activity = init_city(city)
 
         for ts in sorted(get_timestamps(ts_start, ts_end), reverse=True):
             window_start, window_end = ts - TRAIN_INTERVAL, ts + TRAIN_INTERVAL
-            best_users = top_k_users(
-                member_events,
-                events_info,
-                window_start,
-                window_end,
-                n_best,
-            )
+            best_users = activity.top(window_start, window_end, n_best)
             out_path = (
                 Path(__file__).parent
                 / f"{city}_best_users_{window_start}_{window_end}.txt"
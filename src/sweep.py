@@ -0,0 +1,332 @@
+"""
+Sweep гіперпараметрів зі спільними обчисленнями.
+
+Сітка параметрів (json) розгортається у DAG етапів:
+
+    load(city) → windows(interval) → partition(interval, ts)
+               → feature(name, params, interval, ts) → l2r(точка сітки, ts)
+
+Вузол ідентифікується лише тими параметрами, від яких він залежить, тому
+однакові вузли різних точок сітки рахуються один раз: якщо змінюється
+тільки bandwidth KDE, то завантаження, розбиття, TF-IDF і group-frequency
+спільні для всіх точок.  Незалежні вузли виконуються паралельно у пулі
+потоків, а результат — таблиця метрик (stdout + CSV).
+
+Ключі сітки:
+    "content.<param>", "location.<param>", "group.<param>"  – параметри рекомендерів;
+    "train_interval_days"                                   – довжина вікна;
+    "l2r.<algo>.<param>"                                    – параметри L2R-моделей.
+
+Приклад:
+    {
+        "content.ngram_range": [[1, 1], [1, 2]],
+        "location.bandwidth": ["scott", 0.05],
+        "l2r.rf.n_estimators": [50, 100]
+    }
+
+Запуск:
+    python -m src.sweep --city LCHICAGO --grid grid.json --algo svm rf
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import itertools
+import json
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+import numpy as np
+
+from .features import FEATURES, feature_matrix
+from .main import DATA_DIR, load_repo
+from .partition import WindowEngine, get_timestamps, seconds_in_days
+from .recommenders.hybrid_recommender import LearningToRank
+
+NodeKey = Tuple[Hashable, ...]
+
+DEFAULT_INTERVAL_DAYS = 182
+
+
+# ──────────────────────────────────────────────────────────────
+# 1. DAG етапів
+# ──────────────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class Node:
+    key: NodeKey
+    fn: Callable[..., Any]          # fn(*результати залежностей)
+    deps: Tuple[NodeKey, ...] = ()
+
+
+class StageGraph:
+    """Мемоізований DAG: повторне додавання вузла з тим самим ключем — no-op."""
+
+    def __init__(self) -> None:
+        self.nodes: Dict[NodeKey, Node] = {}
+
+    def add(
+        self, key: NodeKey, fn: Callable[..., Any], deps: Tuple[NodeKey, ...] = ()
+    ) -> NodeKey:
+        """Залежності мають бути додані раніше — тож циклів у графі не буває."""
+        missing = [dep for dep in deps if dep not in self.nodes]
+        if missing:
+            raise ValueError(f"{key}: unknown dependencies {missing}")
+        if key not in self.nodes:
+            self.nodes[key] = Node(key, fn, tuple(deps))
+        return key
+
+    def run(self, max_workers: int | None = None) -> Dict[NodeKey, Any]:
+        """
+        Виконує вузли, щойно готові їхні залежності.  Проміжні результати
+        звільняються, коли їх спожили всі залежні вузли; повертаються лише
+        результати «листків» (вузлів без споживачів).
+        """
+        consumers = Counter(dep for node in self.nodes.values() for dep in node.deps)
+        results: Dict[NodeKey, Any] = {}
+        done_keys: set = set()
+        pending = dict(self.nodes)
+        running: Dict[Any, NodeKey] = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while pending or running:
+                ready = [
+                    node for node in pending.values()
+                    if all(dep in done_keys for dep in node.deps)
+                ]
+                if not ready and not running:
+                    # відсутні залежності або цикл (вузли, додані в обхід add)
+                    raise ValueError(f"Stage graph is stuck at {sorted(pending, key=repr)}")
+                for node in ready:
+                    del pending[node.key]
+                    future = pool.submit(node.fn, *(results[d] for d in node.deps))
+                    running[future] = node.key
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    key = running.pop(future)
+                    results[key] = future.result()
+                    done_keys.add(key)
+                    for dep in self.nodes[key].deps:
+                        consumers[dep] -= 1
+                        if consumers[dep] == 0:
+                            del results[dep]
+
+        return results
+
+
+# ──────────────────────────────────────────────────────────────
+# 2. Етапи пайплайна
+# ──────────────────────────────────────────────────────────────
+def _partition_stage(
+    windows: WindowEngine, ts: int, interval: int, n_members: int
+) -> Tuple[Dict, Dict, List[str]]:
+    """train / test репозиторії та test-користувачі з історією у train."""
+    activity = windows.repo["activity"]
+    train_repo, test_repo = windows.partition(ts, interval)
+    best = activity.top(ts - interval, ts + interval, n_members)
+    members = activity.with_history(best, ts - interval, ts)
+    return train_repo, test_repo, members
+
+
+def _feature_stage(
+    part: Tuple[Dict, Dict, List[str]],
+    name: str,
+    params: Dict[str, Any],
+) -> np.ndarray:
+    train_repo, test_repo, members = part
+    return feature_matrix(name, train_repo, test_repo, members, **params)
+
+
+def _l2r_stage(
+    part: Tuple[Dict, Dict, List[str]],
+    *scores: np.ndarray,
+    feature_names: List[str],
+    algo_list: List[str],
+    model_params: Dict[str, Dict[str, Any]],
+    n_members: int,
+) -> Dict[str, Tuple[float, float, float]]:
+    _, test_repo, members = part
+    return LearningToRank().learn(
+        simscores=dict(zip(feature_names, scores)),
+        test_events=list(test_repo["events_info"]),
+        all_members_rsvp=test_repo["members_events"],
+        test_members=members,
+        log_fh=None,
+        algo_list=algo_list,
+        n_members=n_members,
+        partition_number=0,
+        model_params=model_params,
+        plot=False,
+    )
+
+
+# ──────────────────────────────────────────────────────────────
+# 3. Сітка → граф
+# ──────────────────────────────────────────────────────────────
+def _freeze(value: Any) -> Hashable:
+    """json-значення → hashable (списки стають кортежами)."""
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def expand_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Декартів добуток значень сітки."""
+    keys = list(grid)
+    return [
+        {k: _freeze(v) for k, v in zip(keys, values)}
+        for values in itertools.product(*(grid[k] for k in keys))
+    ]
+
+
+def _split_point(
+    point: Dict[str, Any]
+) -> Tuple[int, Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """Точка сітки → (interval, параметри фіч, параметри L2R-моделей)."""
+    interval = seconds_in_days(point.get("train_interval_days", DEFAULT_INTERVAL_DAYS))
+    feature_params = {name: dict(spec.params) for name, spec in FEATURES.items()}
+    model_params: Dict[str, Dict[str, Any]] = {}
+    for key, value in point.items():
+        scope, _, rest = key.partition(".")
+        if scope in feature_params:
+            feature_params[scope][rest] = value
+        elif scope == "l2r":
+            algo, _, param = rest.partition(".")
+            model_params.setdefault(algo, {})[param] = value
+        elif key != "train_interval_days":
+            raise ValueError(f"Unknown sweep parameter: {key}")
+    return interval, feature_params, model_params
+
+
+def build_graph(
+    city: str,
+    points: List[Dict[str, Any]],
+    algo_list: List[str],
+    n_members: int,
+    ts_start: int,
+    ts_end: int,
+) -> Tuple[StageGraph, List[List[NodeKey]]]:
+    """Повертає граф і, для кожної точки сітки, ключі її l2r-вузлів."""
+    graph = StageGraph()
+    load_key = graph.add(("load", city), partial(load_repo, DATA_DIR / city))
+    feature_names = list(FEATURES)
+
+    point_keys: List[List[NodeKey]] = []
+    for point in points:
+        interval, feature_params, model_params = _split_point(point)
+        keys: List[NodeKey] = []
+        # спільний на всі partition цього interval: сусідні вікна перевикористовуються
+        windows_key = graph.add(
+            ("windows", interval),
+            partial(WindowEngine, capacity=None),
+            (load_key,),
+        )
+        for ts in get_timestamps(ts_start, ts_end, interval):
+            part_key = graph.add(
+                ("partition", interval, ts),
+                partial(_partition_stage, ts=ts, interval=interval, n_members=n_members),
+                (windows_key,),
+            )
+            feature_keys = tuple(
+                graph.add(
+                    ("feature", name, _freeze(feature_params[name]), interval, ts),
+                    partial(_feature_stage, name=name, params=feature_params[name]),
+                    (part_key,),
+                )
+                for name in FEATURES
+            )
+            keys.append(
+                graph.add(
+                    ("l2r", _freeze(point), ts),
+                    partial(
+                        _l2r_stage,
+                        feature_names=feature_names,
+                        algo_list=algo_list,
+                        model_params=model_params,
+                        n_members=n_members,
+                    ),
+                    (part_key, *feature_keys),
+                )
+            )
+        point_keys.append(keys)
+    return graph, point_keys
+
+
+# ──────────────────────────────────────────────────────────────
+# 4. Таблиця результатів
+# ──────────────────────────────────────────────────────────────
+def summarize(
+    points: List[Dict[str, Any]],
+    point_keys: List[List[NodeKey]],
+    results: Dict[NodeKey, Any],
+    algo_list: List[str],
+) -> List[Dict[str, Any]]:
+    """Середні Precision / Recall / F1 по всіх partition для кожної точки й алгоритму."""
+    rows = []
+    for point, keys in zip(points, point_keys):
+        for algo in algo_list:
+            scores = np.array([results[k][algo] for k in keys if algo in results[k]])
+            if not len(scores):
+                continue
+            precision, recall, f1 = scores.mean(axis=0)
+            rows.append(
+                {
+                    **{k: json.dumps(v) for k, v in point.items()},
+                    "algo": algo,
+                    "precision": round(float(precision), 4),
+                    "recall": round(float(recall), 4),
+                    "f1": round(float(f1), 4),
+                    "partitions": len(scores),
+                }
+            )
+    return rows
+
+
+def main() -> None:
+    argp = argparse.ArgumentParser("Event recommender — hyperparameter sweep")
+    argp.add_argument("--city", required=True, help="LCHICAGO | LSAN JOSE | LPHOENIX")
+    argp.add_argument("--grid", type=Path, required=True, help="json-файл з сіткою")
+    argp.add_argument("--algo", nargs="+", default=["svm", "rf"], help="l2r: svm mlp nb rf gbm")
+    argp.add_argument("--members", type=int, default=100, help="Top-N members to test")
+    argp.add_argument("--jobs", type=int, default=None, help="Кількість потоків")
+    argp.add_argument("--out", type=Path, default=Path("sweep_results.csv"))
+    args = argp.parse_args()
+
+    grid = json.loads(args.grid.read_text(encoding="utf-8"))
+    points = expand_grid(grid)
+
+    ts_start, ts_end = 1_262_304_000, 1_388_534_400        # 2010-01-01 .. 2014-01-01
+    graph, point_keys = build_graph(
+        args.city, points, args.algo, args.members, ts_start, ts_end
+    )
+    stages = Counter(key[0] for key in graph.nodes)
+    print(f"{len(points)} grid points → {len(graph.nodes)} stages {dict(stages)}")
+
+    results = graph.run(max_workers=args.jobs)
+    rows = summarize(points, point_keys, results, args.algo)
+    if not rows:
+        print("No results.")
+        return
+
+    columns = list(rows[0])
+    widths = {c: max(len(c), *(len(str(r[c])) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(str(row[c]).ljust(widths[c]) for c in columns))
+
+    with open(args.out, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.DictWriter(fh, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"\nResults written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
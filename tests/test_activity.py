@@ -0,0 +1,129 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from src.activity import ActivityIndex
+from src.preprocessing import RsvpIndex
+from src.records import EventTable
+
+STEP, ORIGIN = 100, 0
+
+
+def _index(seed: int = 0):
+    rng = np.random.default_rng(seed)
+    n_events, n_members = 120, 15
+    # частина подій рівно на межах сітки
+    times = rng.integers(1_050, 2_000, n_events)
+    times[::7] = rng.integers(11, 20, len(times[::7])) * STEP
+    events_info = EventTable.from_dict({
+        f"e{i}": {"time": int(t), "lat": 0.0, "lon": 0.0, "description": ""}
+        for i, t in enumerate(times)
+    })
+    # RSVP на події, яких нема в events_info, не рахуються
+    event_ids = list(events_info) + ["ghost1", "ghost2"]
+    event_members, event_ptr = [], [0]
+    for _ in event_ids:
+        event_members.extend(rng.choice(n_members, size=rng.integers(0, 5), replace=False))
+        event_ptr.append(len(event_members))
+    rsvps = RsvpIndex(
+        [f"m{m}" for m in range(n_members)],
+        event_ids,
+        np.array(event_ptr, dtype=np.int64),
+        np.array(event_members, dtype=np.int32),
+    )
+    index = ActivityIndex.build(rsvps, events_info, step=STEP, origin=ORIGIN)
+    return index, rsvps, events_info
+
+
+def _brute(rsvps, events_info, start, end, rows):
+    out = []
+    for row in rows:
+        if row < 0:
+            out.append(0)
+            continue
+        count = 0
+        for e in rsvps.member_events[rsvps.member_ptr[row]:rsvps.member_ptr[row + 1]]:
+            e_id = rsvps.event_ids[e]
+            if e_id in events_info and start <= events_info[e_id].time <= end:
+                count += 1
+        out.append(count)
+    return np.array(out)
+
+
+def test_grid_windows_match_brute_force():
+    index, rsvps, events_info = _index()
+    rows = np.arange(len(rsvps.member_ids))
+    edges = index.edges.tolist()
+
+    for start, end in itertools.combinations_with_replacement(edges, 2):
+        assert index._edge(start) >= 0 and index._edge(end) >= 0
+        np.testing.assert_array_equal(
+            index.counts(start, end), _brute(rsvps, events_info, start, end, rows), (start, end)
+        )
+
+
+@pytest.mark.parametrize(
+    "start, end",
+    [
+        (1_234, 1_567),         # обидві межі поза сіткою
+        (1_100, 1_567),         # одна межа на сітці
+        (1_234, 1_900),
+        (1_500, 1_500),         # точка
+        (1_100, 1_100),         # точка на межі
+        (0, 1_400),             # починається до t0
+        (-500, 5_000),          # усе
+        (0, 500),               # закінчується до t0
+        (1_900, 1_200),         # end < start
+        (1_999, 10_000),        # після останньої межі
+    ],
+)
+def test_off_grid_windows_match_brute_force(start, end):
+    index, rsvps, events_info = _index()
+    rows = np.array([3, -1, 0, 14, -1, 7, 3])
+
+    np.testing.assert_array_equal(
+        index.counts(start, end, rows), _brute(rsvps, events_info, start, end, rows)
+    )
+    all_rows = np.arange(len(rsvps.member_ids))
+    np.testing.assert_array_equal(
+        index.counts(start, end), _brute(rsvps, events_info, start, end, all_rows)
+    )
+
+
+def test_grid_rows_with_unknown_members():
+    index, rsvps, events_info = _index()
+    rows = index.rows(["m2", "unknown", "m9"])
+
+    assert rows.tolist() == [2, -1, 9]
+    for start, end in ((1_100, 1_500), (1_234, 1_567)):
+        np.testing.assert_array_equal(
+            index.counts(start, end, rows), _brute(rsvps, events_info, start, end, rows)
+        )
+    assert not index.counts(1_100, 1_500, np.array([-1, -1])).any()
+
+
+def test_top_history_and_active_follow_counts():
+    index, rsvps, events_info = _index()
+    start, end = 1_200, 1_700
+    counts = _brute(rsvps, events_info, start, end, np.arange(len(rsvps.member_ids)))
+
+    top = index.top(start, end, 5)
+    assert [counts[int(m_id[1:])] for m_id in top] == sorted(counts, reverse=True)[:5]
+
+    members, active_counts = index.active(start, end)
+    assert [int(m_id[1:]) for m_id in members] == np.flatnonzero(counts).tolist()
+    np.testing.assert_array_equal(active_counts, counts[counts > 0])
+
+    assert index.with_history(["m14", "unknown", "m0"], start, end) == [
+        m_id for m_id in ("m14", "m0") if counts[int(m_id[1:])]
+    ]
+
+
+def test_empty_index():
+    events_info = EventTable.from_dict({})
+    rsvps = RsvpIndex([], [], np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int32))
+    index = ActivityIndex.build(rsvps, events_info, step=STEP, origin=ORIGIN)
+
+    assert index.counts(0, 1_000).shape == (0,)
+    assert index.top(0, 1_000, 3) == []
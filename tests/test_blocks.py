@@ -0,0 +1,86 @@
+from functools import partial
+
+import numpy as np
+import pytest
+
+from src.blocks import BlockEngine
+from src.features import Catalog, score_ids
+from src.recommenders.grp_freq_recommender import GroupFrequencyRecommender
+from src.recommenders.hashed_content_recommender import HashedContentRecommender
+from src.recommenders.hybrid_recommender import LearningToRank
+from src.recommenders.location_recommender import LocationRecommender
+from src.records import EventTable, MemberTable
+
+WORDS = "python data music hiking chess yoga film dance poker beer coffee books".split()
+
+
+def _fitted(seed: int = 0):
+    rng = np.random.default_rng(seed)
+    n_events, n_members = 50, 23
+    events_info = EventTable.from_dict({
+        f"e{i}": {
+            "time": i,
+            "lat": float(rng.uniform(41.8, 42.0)),
+            "lon": float(rng.uniform(-87.8, -87.6)),
+            "description": " ".join(rng.choice(WORDS, size=4)),
+        }
+        for i in range(n_events)
+    })
+    member_ids = [f"m{m}" for m in range(n_members)]
+    members_info = MemberTable(
+        member_ids,
+        rng.uniform(41.8, 42.0, n_members).astype(np.float32),
+        rng.uniform(-87.8, -87.6, n_members).astype(np.float32),
+    )
+    members_events = {
+        m_id: [f"e{i}" for i in sorted(rng.choice(n_events, size=rng.integers(1, 6), replace=False))]
+        for m_id in member_ids[:18]                 # частина користувачів без історії
+    }
+    event_group = {f"e{i}": f"g{i % 3}" for i in range(n_events) if i % 4}
+    repo = {
+        "events_info": events_info,
+        "members_info": members_info,
+        "members_events": members_events,
+        "catalog": Catalog(events_info, member_ids, event_group),
+    }
+    recs = {
+        "content": HashedContentRecommender(n_features=2 ** 10),
+        "location": LocationRecommender(),
+        "group": GroupFrequencyRecommender(),
+    }
+    for rec in recs.values():
+        rec.fit(repo)
+    return repo, recs
+
+
+@pytest.mark.parametrize("member_block, event_block", [(5, 7), (4, 50), (23, 11), (100, 100)])
+def test_blocks_reassemble_full_score_matrices(member_block, event_block):
+    repo, recs = _fitted()
+    catalog = repo["catalog"]
+    members, events = list(catalog.member_ids), list(repo["events_info"])
+    engine = BlockEngine(
+        {name: partial(score_ids, rec, catalog) for name, rec in recs.items()},
+        member_block=member_block,
+        event_block=event_block,
+    )
+
+    X_full = np.empty((len(members), len(events), len(recs)), dtype=np.float32)
+    y_full = np.empty((len(members), len(events)), dtype=np.int64)
+    blocks = engine.blocks(members, events, repo["members_events"])
+    for e_start in range(0, len(events), event_block):
+        e_end = min(e_start + event_block, len(events))
+        for m_start in range(0, len(members), member_block):
+            m_end = min(m_start + member_block, len(members))
+            X, y = next(blocks)
+            X_full[m_start:m_end, e_start:e_end] = X.reshape(m_end - m_start, e_end - e_start, -1)
+            y_full[m_start:m_end, e_start:e_end] = y.reshape(m_end - m_start, e_end - e_start)
+    assert next(blocks, None) is None
+
+    member_idx, event_idx = catalog.member_rows(members), catalog.event_rows(events)
+    for col, rec in enumerate(recs.values()):
+        assert X_full[:, :, col].any()
+        np.testing.assert_array_equal(X_full[:, :, col], rec.score_matrix(member_idx, event_idx))
+    np.testing.assert_array_equal(
+        y_full, LearningToRank._labels(members, events, repo["members_events"])
+    )
+    assert y_full.any()
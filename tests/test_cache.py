@@ -0,0 +1,89 @@
+import os
+
+import numpy as np
+
+from src.cache import ScoreCache, make_key
+
+MEMBERS = ["m1", "m2", "m3"]
+EVENTS = ["e1", "e2"]
+
+
+def _matrix(n_members: int = 3, n_events: int = 2) -> np.ndarray:
+    return np.arange(n_members * n_events, dtype=np.float32).reshape(n_members, n_events)
+
+
+def test_hit_returns_rows_for_member_subset(tmp_path):
+    cache = ScoreCache(tmp_path)
+    cache.put("k", MEMBERS, EVENTS, _matrix())
+
+    got = cache.get("k", ["m3", "m1"], EVENTS)
+
+    np.testing.assert_array_equal(got, _matrix()[[2, 0]])
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_miss_when_events_differ(tmp_path):
+    cache = ScoreCache(tmp_path)
+    cache.put("k", MEMBERS, EVENTS, _matrix())
+
+    assert cache.get("k", MEMBERS, ["e2", "e1"]) is None
+    assert cache.get("k", MEMBERS, ["e1"]) is None
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_miss_for_unknown_member_or_key(tmp_path):
+    cache = ScoreCache(tmp_path)
+    cache.put("k", MEMBERS, EVENTS, _matrix())
+
+    assert cache.get("k", ["m1", "m4"], EVENTS) is None
+    assert cache.get("other", MEMBERS, EVENTS) is None
+
+
+def test_eviction_keeps_total_under_max_bytes(tmp_path):
+    cache = ScoreCache(tmp_path, max_bytes=1 << 30)
+    for i, key in enumerate(("old", "mid", "new")):
+        cache.put(key, MEMBERS, EVENTS, _matrix())
+        os.utime(tmp_path / f"{key}.npz", (1_000 + i, 1_000 + i))
+    entry_size = (tmp_path / "new.npz").stat().st_size
+
+    # місце рівно на два файли: витісняється найдавніше використаний
+    cache.max_bytes = 2 * entry_size
+    cache._evict()
+
+    assert sorted(p.stem for p in tmp_path.glob("*.npz")) == ["mid", "new"]
+
+
+def test_get_refreshes_lru_order(tmp_path):
+    cache = ScoreCache(tmp_path, max_bytes=1 << 30)
+    for i, key in enumerate(("a", "b")):
+        cache.put(key, MEMBERS, EVENTS, _matrix())
+        os.utime(tmp_path / f"{key}.npz", (1_000 + i, 1_000 + i))
+    entry_size = (tmp_path / "a.npz").stat().st_size
+
+    assert cache.get("a", MEMBERS, EVENTS) is not None
+    cache.max_bytes = entry_size
+    cache._evict()
+
+    assert [p.stem for p in tmp_path.glob("*.npz")] == ["a"]
+
+
+def test_key_depends_on_params_and_fingerprint():
+    base = make_key("LCHICAGO", 0, 10, "Rec", {"a": 1}, "fp")
+    assert base == make_key("LCHICAGO", 0, 10, "Rec", {"a": 1}, "fp")
+    assert base != make_key("LCHICAGO", 0, 10, "Rec", {"a": 2}, "fp")
+    assert base != make_key("LCHICAGO", 0, 10, "Rec", {"a": 1}, "fp2")
+
+
+def test_approx_sample_gets_its_own_key(tmp_path):
+    exact = make_key("LCHICAGO", 0, 10, "Rec", {"a": 1}, "fp")
+    approx = make_key("LCHICAGO", 0, 10, "Rec", {"a": 1}, "fp", sample=[300, 0.25, 0])
+    assert exact == make_key("LCHICAGO", 0, 10, "Rec", {"a": 1}, "fp", sample=None)
+    assert approx != exact
+    assert approx != make_key("LCHICAGO", 0, 10, "Rec", {"a": 1}, "fp", sample=[300, 0.25, 1])
+
+    # точний і --approx запуски більше не перезаписують записи один одного
+    cache = ScoreCache(tmp_path)
+    cache.put(exact, MEMBERS, EVENTS, _matrix())
+    cache.put(approx, ["m2"], ["e2"], _matrix(1, 1))
+    np.testing.assert_array_equal(cache.get(exact, MEMBERS, EVENTS), _matrix())
+    np.testing.assert_array_equal(cache.get(approx, ["m2"], ["e2"]), _matrix(1, 1))
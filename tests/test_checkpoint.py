@@ -0,0 +1,80 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.checkpoint import CheckpointMismatch, PartitionCheckpoint
+
+CONFIG = {
+    "city": "LCHICAGO",
+    "algo": ["rf"],
+    "members": 100,
+    "features": [["content", {"ngram_range": (1, 1)}]],
+}
+METRICS = {"rf": [0.5, 0.25, 1 / 3]}
+IMPORTANCES = {"rf": [0.7, 0.3]}
+
+
+def test_save_load_round_trip(tmp_path):
+    checkpoint = PartitionCheckpoint(tmp_path, "fp", CONFIG)
+    scores = {"content": np.arange(6, dtype=np.float64).reshape(2, 3)}
+    checkpoint.save(1, 100, METRICS, IMPORTANCES, scores, ["m1", "m2"], ["e1", "e2", "e3"])
+
+    record = checkpoint.load(1, 100)
+    assert record == {"ts": 100, "metrics": METRICS, "importances": IMPORTANCES}
+    with np.load(tmp_path / "partition_1.npz") as npz:
+        assert npz["members"].tolist() == ["m1", "m2"]
+        assert npz["events"].tolist() == ["e1", "e2", "e3"]
+        assert npz["content"].dtype == np.float32
+        np.testing.assert_array_equal(npz["content"], scores["content"])
+    # атомарний запис: тимчасових файлів не лишається
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_unfinished_or_other_ts_is_not_loaded(tmp_path):
+    checkpoint = PartitionCheckpoint(tmp_path, "fp", CONFIG)
+    checkpoint.save(1, 100, METRICS, IMPORTANCES)
+
+    assert checkpoint.load(2, 200) is None
+    assert checkpoint.load(1, 999) is None
+    # обірваний запис (лише .tmp) не вважається завершеною partition
+    (tmp_path / "partition_2.json.tmp").write_text("{", encoding="utf-8")
+    assert checkpoint.load(2, 200) is None
+
+
+def test_resume_keeps_finished_partitions(tmp_path):
+    PartitionCheckpoint(tmp_path, "fp", CONFIG).save(1, 100, METRICS, IMPORTANCES)
+
+    resumed = PartitionCheckpoint(tmp_path, "fp", json.loads(json.dumps(CONFIG)), resume=True)
+
+    assert resumed.load(1, 100)["metrics"] == METRICS
+    assert resumed.load(2, 200) is None
+
+
+def test_new_run_discards_old_partitions(tmp_path):
+    PartitionCheckpoint(tmp_path, "fp", CONFIG).save(1, 100, METRICS, IMPORTANCES)
+
+    fresh = PartitionCheckpoint(tmp_path, "fp", CONFIG)
+
+    assert fresh.load(1, 100) is None
+    assert not list(tmp_path.glob("partition_*"))
+
+
+@pytest.mark.parametrize(
+    "fingerprint, config",
+    [("other", CONFIG), ("fp", {**CONFIG, "members": 200}), ("fp", {**CONFIG, "epochs": 2})],
+)
+def test_resume_with_changed_input_raises(tmp_path, fingerprint, config):
+    PartitionCheckpoint(tmp_path, "fp", CONFIG).save(1, 100, METRICS, IMPORTANCES)
+
+    with pytest.raises(CheckpointMismatch):
+        PartitionCheckpoint(tmp_path, fingerprint, config, resume=True)
+    # невдалий resume нічого не стирає
+    assert PartitionCheckpoint(tmp_path, "fp", CONFIG, resume=True).load(1, 100) is not None
+
+
+def test_resume_without_manifest_starts_fresh(tmp_path):
+    checkpoint = PartitionCheckpoint(tmp_path / "new", "fp", CONFIG, resume=True)
+
+    assert checkpoint.load(1, 100) is None
+    assert (tmp_path / "new" / "manifest.json").exists()
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from src.recommenders import coattendance_recommender as coattendance
+
+
+def _random_csr(n_rows: int = 60, n_cols: int = 80, seed: int = 0) -> sp.csr_matrix:
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(0, 40, n_rows)
+    rows = np.repeat(np.arange(n_rows), lengths)
+    cols = np.concatenate([rng.choice(n_cols, n, replace=False) for n in lengths])
+    # значення без повторів — top-k однозначний
+    data = rng.permutation(len(rows)).astype(np.float64) + 1.0
+    return sp.csr_matrix((data, (rows, cols)), shape=(n_rows, n_cols))
+
+
+@pytest.mark.parametrize("k", [1, 5, 20, 100])
+def test_top_k_per_row_matches_per_row_sort(k, monkeypatch):
+    matrix = _random_csr()
+    # маленький блок — кілька ітерацій по довгих рядках
+    monkeypatch.setattr(coattendance, "_BLOCK_CELLS", 64)
+
+    got = coattendance._top_k_per_row(matrix, k)
+
+    assert got.dtype == np.float32
+    for row in range(matrix.shape[0]):
+        dense = matrix[row].toarray().ravel()
+        expected = np.zeros_like(dense)
+        top = np.argsort(-dense, kind="stable")[: min(k, matrix[row].nnz)]
+        expected[top] = dense[top]
+        np.testing.assert_array_equal(got[row].toarray().ravel(), expected)
+
+
+def test_top_k_per_row_zero_keeps_nothing():
+    assert coattendance._top_k_per_row(_random_csr(), 0).nnz == 0
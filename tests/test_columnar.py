@@ -0,0 +1,64 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.columnar import PartitionMatrices, iter_partitions, write_partition
+
+MEMBERS = [f"m{i}" for i in range(7)]
+EVENTS = [f"e{j}" for j in range(5)]
+RSVP = {"m0": ["e1", "e4"], "m3": ["e0"], "m6": ["e2", "ghost"]}
+
+
+def _simscores(seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return {
+        name: rng.random((len(MEMBERS), len(EVENTS)))
+        for name in ("content", "location", "group")
+    }
+
+
+def test_exported_columns_reload_with_matching_shapes(tmp_path):
+    simscores = {part_no: _simscores(part_no) for part_no in (1, 2)}
+    for part_no, scores in simscores.items():
+        write_partition(
+            tmp_path, part_no, 100 * part_no, MEMBERS, EVENTS, scores, RSVP,
+            train_members=5, meta={"city": "LCHICAGO"},
+        )
+    # обірваний запис не вважається partition
+    (tmp_path / "partition_3.tmp").mkdir()
+
+    parts = list(iter_partitions(tmp_path))
+
+    assert [part.schema["partition"] for part in parts] == [1, 2]
+    n_rows = len(MEMBERS) * len(EVENTS)
+    for part, scores in zip(parts, simscores.values()):
+        assert len(part) == n_rows and part.train_rows == 5 * len(EVENTS)
+        assert part.features == list(scores) and part.schema["city"] == "LCHICAGO"
+        assert part.members == MEMBERS and part.events == EVENTS
+        assert part.X.shape == (n_rows, len(scores)) and part.X.dtype == np.float32
+        assert part.X.flags.f_contiguous and isinstance(part.X, np.memmap)
+        for name in ("y", "member_idx", "event_idx"):
+            assert part.columns[name].shape == (n_rows,)
+        assert part.y.dtype == np.int8
+        assert part.member_idx.dtype == part.event_idx.dtype == np.int32
+
+        # рядок → (користувач, подія) і назад до матриць ознак
+        rows, cols = part.member_idx, part.event_idx
+        for col, matrix in enumerate(scores.values()):
+            expected = matrix.astype(np.float32)[rows, cols]
+            np.testing.assert_array_equal(part.X[:, col], expected)
+        expected_y = [
+            int(EVENTS[e] in RSVP.get(MEMBERS[m], ())) for m, e in zip(rows, cols)
+        ]
+        np.testing.assert_array_equal(part.y, expected_y)
+        assert part.y.sum() == 4           # ghost — не серед подій partition
+
+
+def test_rejects_foreign_schema(tmp_path):
+    path = write_partition(tmp_path, 1, 100, MEMBERS, EVENTS, _simscores(), RSVP)
+    schema = json.loads((path / "schema.json").read_text(encoding="utf-8"))
+    (path / "schema.json").write_text(json.dumps({**schema, "version": 0}), encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        PartitionMatrices(path)
@@ -0,0 +1,69 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.export import TopKFile, TopKWriter, score_blocks, sidecar_path, top_k
+
+MEMBERS = [f"m{i}" for i in range(10)]
+EVENTS = [f"e{j}" for j in range(13)]
+
+
+class _SumModel:
+    def decision_function(self, X):
+        return X.sum(axis=1)
+
+
+def _scores(seed: int = 0) -> np.ndarray:
+    # різні значення — порядок top-k однозначний
+    return np.random.default_rng(seed).permutation(len(MEMBERS) * len(EVENTS)).reshape(
+        len(MEMBERS), len(EVENTS)
+    ).astype(np.float32)
+
+
+def _write(path, best_idx, best, block: int = 3):
+    with TopKWriter(path, len(MEMBERS), best_idx.shape[1]) as writer:
+        for start in range(0, len(MEMBERS), block):
+            writer.write(best_idx[start:start + block], best[start:start + block])
+    sidecar_path(path).write_text(json.dumps({"members": MEMBERS, "events": EVENTS}), encoding="utf-8")
+
+
+@pytest.mark.parametrize("k", [1, 4, 20])
+def test_written_blocks_read_back_as_top_k(tmp_path, k):
+    scores = _scores()
+    best_idx, best = top_k(scores, k)
+    path = tmp_path / "top.bin"
+    _write(path, best_idx.astype(np.int32), best)
+
+    topk = TopKFile(path)
+
+    assert len(topk) == len(MEMBERS) and topk.k == best_idx.shape[1]
+    for row, m_id in enumerate(MEMBERS):
+        got = topk[m_id]
+        assert [e_id for e_id, _ in got] == [EVENTS[j] for j in best_idx[row]]
+        np.testing.assert_array_equal([s for _, s in got], best[row])
+        # за спаданням і справді найбільші в рядку
+        assert [s for _, s in got] == sorted(scores[row], reverse=True)[:min(k, len(EVENTS))]
+
+
+def test_score_blocks_match_full_matrix_top_k():
+    scores = _scores(1)
+    row = {m_id: i for i, m_id in enumerate(MEMBERS)}
+    col = {e_id: j for j, e_id in enumerate(EVENTS)}
+
+    def scorer(members, events):
+        return scores[np.ix_([row[m] for m in members], [col[e] for e in events])]
+
+    expected_idx, expected = top_k(scores, 5)
+    blocks = list(score_blocks({"s": scorer}, _SumModel(), MEMBERS, EVENTS, 5, 3, 4))
+
+    np.testing.assert_array_equal(np.vstack([idx for idx, _ in blocks]), expected_idx)
+    np.testing.assert_array_equal(np.vstack([best for _, best in blocks]), expected)
+
+
+def test_rejects_foreign_file(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"\0" * 64)
+
+    with pytest.raises(ValueError):
+        TopKFile(path)
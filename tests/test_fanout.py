@@ -0,0 +1,92 @@
+import numpy as np
+
+from src.fanout import FanoutIndex, FanoutScorer
+from src.features import Catalog
+from src.recommenders.hashed_content_recommender import HashedContentRecommender
+from src.records import EventTable, MemberTable
+
+WORDS = "python data music hiking chess yoga film dance poker beer coffee books".split()
+
+
+class _SumModel:
+    """Мета-модель: score — сума ознак."""
+
+    def decision_function(self, X):
+        return X.sum(axis=1)
+
+
+def _setup(max_postings: int = 5):
+    rng = np.random.default_rng(0)
+    n_events, n_members = 40, 30
+    events_info = EventTable.from_dict({
+        f"e{i}": {
+            "time": i,
+            "lat": float(rng.uniform(41.8, 42.0)),
+            "lon": float(rng.uniform(-87.8, -87.6)),
+            "description": " ".join(rng.choice(WORDS, size=4)),
+        }
+        for i in range(n_events)
+    })
+    member_ids = [f"m{m}" for m in range(n_members)]
+    members_info = MemberTable(
+        member_ids,
+        rng.uniform(41.8, 42.0, n_members).astype(np.float32),
+        rng.uniform(-87.8, -87.6, n_members).astype(np.float32),
+    )
+    members_events = {
+        m_id: [f"e{i}" for i in sorted(rng.choice(20, size=3, replace=False))]
+        for m_id in member_ids[:20]
+    }
+    group_members = {"g0": member_ids[:10], "g1": member_ids[10:]}
+    event_group = {f"e{i}": f"g{i % 2}" for i in range(n_events)}
+    catalog = Catalog(events_info, member_ids, event_group)
+    train_repo = {
+        "events_info": events_info,
+        "members_info": members_info,
+        "members_events": members_events,
+        "group_members": group_members,
+        "catalog": catalog,
+    }
+    content = HashedContentRecommender(n_features=2 ** 10)
+    content.fit(train_repo)
+    index = FanoutIndex(catalog, max_postings=max_postings, cell_deg=0.05).build(train_repo, content)
+    return index, FanoutScorer(index, {"content": content}, _SumModel())
+
+
+def test_candidates_are_bounded_union_of_postings():
+    index, _ = _setup()
+
+    for e_id in ("e20", "e21", "e35"):
+        rows = index.candidates(e_id)
+        assert len(rows) == len(np.unique(rows))
+        assert len(rows) <= (10 + index.n_terms) * index.max_postings
+        group = index.by_group[index.group_index[index.catalog.event_group[e_id]]]
+        assert set(group.tolist()) <= set(rows.tolist())
+
+
+def test_top_members_reuses_precomputed_shortlist(monkeypatch):
+    index, scorer = _setup()
+    rows = index.candidates("e25")
+    expected = scorer.top_members("e25", 5)
+
+    calls = []
+    monkeypatch.setattr(index, "candidates", lambda e_id: calls.append(e_id) or rows)
+    assert scorer.top_members("e25", 5, rows) == expected
+    assert calls == []
+
+
+def test_top_members_are_best_of_shortlist():
+    index, scorer = _setup()
+    rows = index.candidates("e30")
+    scores = scorer.score_rows(rows, "e30")
+
+    top = scorer.top_members("e30", 4, rows)
+
+    assert [score for _, score in top] == sorted(scores.tolist(), reverse=True)[:4]
+    assert {m_id for m_id, _ in top} <= set(index.catalog.members(rows))
+
+
+def test_empty_shortlist_gives_no_members():
+    index, scorer = _setup()
+
+    assert scorer.top_members("e0", 5, np.empty(0, dtype=np.int64)) == []
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from src.features import Catalog, score_ids
+from src.recommenders import hashed_content_recommender
+from src.recommenders.hashed_content_recommender import HashedContentRecommender
+from src.records import EventTable
+
+WORDS = "python data music hiking chess yoga film dance poker beer coffee books".split()
+
+
+def _repo(n_events: int = 60, n_members: int = 25, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    events_info = EventTable.from_dict({
+        f"e{i}": {
+            "time": 1000 * i,
+            "lat": 0.0,
+            "lon": 0.0,
+            "description": " ".join(rng.choice(WORDS, size=rng.integers(2, 7))),
+        }
+        for i in range(n_events)
+    })
+    members_events = {}
+    for m in range(n_members):
+        picked = rng.choice(n_events, size=rng.integers(1, 8), replace=False)
+        members_events[f"m{m}"] = [f"e{i}" for i in sorted(picked)]
+    catalog = Catalog(events_info, [f"m{m}" for m in range(n_members)], {})
+    return {"events_info": events_info, "members_events": members_events, "catalog": catalog}
+
+
+def _attendees(members_events: dict) -> dict:
+    out = {}
+    for m_id, events in members_events.items():
+        for e_id in events:
+            out.setdefault(e_id, []).append(m_id)
+    return out
+
+
+@pytest.mark.parametrize("min_compact", [4096, 3])
+def test_stream_matches_refit_on_final_window(monkeypatch, min_compact):
+    monkeypatch.setattr(hashed_content_recommender, "_MIN_COMPACT", min_compact)
+    repo = _repo()
+    event_ids = list(repo["events_info"])
+    attendees = _attendees(repo["members_events"])
+
+    rec = HashedContentRecommender(n_features=2 ** 10)
+    for start in range(0, len(event_ids), 10):
+        batch = event_ids[start:start + 10]
+        rec.add_events(batch, repo)
+        for e_id in batch:
+            for m_id in attendees.get(e_id, ()):
+                rec.add_rsvp(m_id, e_id)
+        if start >= 20:
+            rec.expire_events(event_ids[start - 20:start - 10])
+
+    live = set(event_ids[40:])
+    window = {
+        m_id: kept
+        for m_id, events in repo["members_events"].items()
+        if (kept := [e_id for e_id in events if e_id in live])
+    }
+    refit = HashedContentRecommender(n_features=2 ** 10)
+    refit.fit({**repo, "members_events": window})
+    refit.add_events(event_ids[40:], repo)
+
+    assert rec.n_docs == refit.n_docs == 20
+    np.testing.assert_array_equal(rec.df, refit.df)
+    assert rec.n_profiles == refit.n_profiles == len(window)
+    members = sorted(repo["members_events"])
+    np.testing.assert_allclose(
+        score_ids(rec, repo["catalog"], members, event_ids),
+        score_ids(refit, repo["catalog"], members, event_ids),
+        atol=1e-6,
+    )
+
+
+def test_profile_is_sum_of_event_counts():
+    repo = _repo()
+    rec = HashedContentRecommender(n_features=2 ** 10)
+    rec.fit(repo)
+
+    for m_id, events in repo["members_events"].items():
+        expected = rec._hash(events, repo).sum(axis=0).A1
+        row = repo["catalog"].member_index[m_id]
+        np.testing.assert_array_equal(rec.profiles[row].toarray().ravel(), expected)
+
+
+def test_members_without_profile_score_zero():
+    repo = _repo()
+    rec = HashedContentRecommender(n_features=2 ** 10)
+    rec.fit({**repo, "members_events": {"m0": repo["members_events"]["m0"]}})
+    rec.expire_events(repo["members_events"]["m0"])
+
+    scores = score_ids(rec, repo["catalog"], ["m0", "m1"], list(repo["events_info"]))
+
+    assert rec.n_profiles == 0
+    assert not scores.any()
+
+
+def test_rsvp_for_event_outside_corpus_raises():
+    repo = _repo()
+    rec = HashedContentRecommender(n_features=2 ** 10)
+    rec.add_events(["e0"], repo)
+
+    with pytest.raises(KeyError):
+        rec.add_rsvp("m0", "e1")
@@ -0,0 +1,61 @@
+import numpy as np
+
+from src.features import Catalog
+from src.membership import MembershipIndex
+from src.recommenders.membership_recommender import GroupMembershipRecommender
+from src.records import EventTable
+
+
+def _group_members(seed: int = 0):
+    rng = np.random.default_rng(seed)
+    members = [f"m{m}" for m in range(30)]
+    group_members = {
+        f"g{g}": rng.choice(members, size=rng.integers(0, 12), replace=False).tolist()
+        for g in range(8)
+    }
+    group_members["g0"] += group_members["g0"][:2]  # дублікати в json
+    return group_members
+
+
+def _brute(group_members, member_id, group_id):
+    return member_id in group_members.get(group_id, ())
+
+
+def test_lookups_match_group_members():
+    group_members = _group_members()
+    index = MembershipIndex.from_group_members(group_members)
+    members = [f"m{m}" for m in range(30)] + ["unknown"]
+    groups = list(group_members) + ["unknown", None]
+
+    for m_id in members:
+        for g_id in groups:
+            assert index.is_member(m_id, g_id) == _brute(group_members, m_id, g_id), (m_id, g_id)
+        own = [g_id for g_id in group_members if _brute(group_members, m_id, g_id)]
+        assert index.groups_of(m_id).tolist() == sorted(index.group_cols(own).tolist())
+
+    got = index.lookup(index.member_rows(members), index.group_cols(groups))
+    expected = [[_brute(group_members, m, g) for g in groups] for m in members]
+    np.testing.assert_array_equal(got, expected)
+    assert index.matrix.max() == 1
+
+
+def test_recommender_scores_match_group_members():
+    group_members = _group_members(1)
+    events_info = EventTable.from_dict({
+        f"e{i}": {"time": i, "lat": 0.0, "lon": 0.0, "description": ""} for i in range(20)
+    })
+    # частина подій без групи, g8 — поза group_members
+    event_group = {f"e{i}": f"g{i % 9}" for i in range(20) if i % 5}
+    member_ids = [f"m{m}" for m in range(35)]
+    catalog = Catalog(events_info, member_ids, event_group)
+    rec = GroupMembershipRecommender()
+    rec.fit({"membership": MembershipIndex.from_group_members(group_members), "catalog": catalog})
+
+    scores = rec.score_matrix(np.arange(len(member_ids)), np.arange(len(events_info)))
+
+    expected = [
+        [float(_brute(group_members, m_id, event_group.get(e_id))) for e_id in events_info]
+        for m_id in member_ids
+    ]
+    assert scores.dtype == np.float32 and scores.any()
+    np.testing.assert_array_equal(scores, expected)
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from src.features import Catalog
+from src.membership import MembershipIndex
+from src.partition import WindowEngine, get_partitioned_repo_wrapper, get_timestamps
+from src.popularity import PopularityIndex
+from src.records import EventTable, MemberTable
+
+INTERVAL = 100
+
+
+def _repo(seed: int = 0):
+    rng = np.random.default_rng(seed)
+    n_events, n_members = 80, 20
+    times = rng.integers(0, 1_000, n_events)
+    times[:5] = [100, 200, 300, 400, 500]       # події рівно на межах вікон
+    events_info = EventTable.from_dict({
+        f"e{i}": {"time": int(t), "lat": 0.0, "lon": 0.0, "description": f"d{i % 7}"}
+        for i, t in enumerate(times)
+    })
+    member_ids = [f"m{m}" for m in range(n_members)]
+    members_info = MemberTable(
+        member_ids, np.zeros(n_members, np.float32), np.zeros(n_members, np.float32)
+    )
+    members_events = {
+        m_id: [f"e{i}" for i in rng.choice(n_events, size=rng.integers(1, 12), replace=False)]
+        for m_id in member_ids
+    }
+    event_group = {f"e{i}": f"g{i % 5}" for i in range(n_events) if i % 6}
+    group_events = {}
+    for e_id, g_id in event_group.items():
+        group_events.setdefault(g_id, []).append(e_id)
+    group_members = {f"g{g}": member_ids[g::5] for g in range(5)}
+    return {
+        "events_info": events_info,
+        "members_info": members_info,
+        "members_events": members_events,
+        "group_events": group_events,
+        "group_members": group_members,
+        "event_group": event_group,
+        "membership": MembershipIndex.from_group_members(group_members),
+        "catalog": Catalog(events_info, member_ids, event_group),
+        "popularity": PopularityIndex.build(events_info, members_events, event_group),
+    }
+
+
+def _assert_same(got, expected):
+    assert got.keys() == expected.keys()
+    for key in ("events_info", "members_info"):
+        assert got[key].ids == expected[key].ids
+    np.testing.assert_array_equal(got["events_info"].time, expected["events_info"].time)
+    for key in ("members_events", "group_events", "event_group"):
+        assert dict(got[key]) == dict(expected[key])
+    assert got["window"] == expected["window"]
+    # незалежні від часу дані спільні, а не скопійовані
+    for key in ("group_members", "membership", "catalog", "popularity", "tokens"):
+        assert got[key] is expected[key]
+
+
+@pytest.mark.parametrize("order", [1, -1])
+def test_engine_matches_baseline_partition(order):
+    repo = _repo()
+    timestamps = get_timestamps(100, 1_000, INTERVAL)[::order]
+    engine = WindowEngine(repo)
+
+    for ts in timestamps:
+        train, test = engine.partition(ts, INTERVAL)
+        expected_train, expected_test = get_partitioned_repo_wrapper(ts, repo, INTERVAL)
+        _assert_same(train, expected_train)
+        _assert_same(test, expected_test)
+        assert train["events_info"].ids and test["events_info"].ids
+
+    # test-вікно однієї partition — train-вікно сусідньої
+    assert engine.built == len(timestamps) + 1
+    assert engine.reused == len(timestamps) - 1
+
+
+def test_engine_evicts_beyond_capacity():
+    repo = _repo()
+    engine = WindowEngine(repo, capacity=2)
+
+    first, _ = engine.partition(300, INTERVAL)
+    engine.partition(500, INTERVAL)
+    again, _ = engine.partition(300, INTERVAL)
+
+    assert engine.built == 6 and engine.reused == 0
+    assert again is not first
+    _assert_same(again, first)
+    # без обмеження кожне вікно будується один раз
+    unbounded = WindowEngine(repo, capacity=None)
+    for ts in (300, 500, 300, 400):
+        unbounded.partition(ts, INTERVAL)
+    assert unbounded.built == 4 and unbounded.reused == 4
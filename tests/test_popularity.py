@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from src.features import Catalog
+from src.popularity import PopularityIndex
+from src.recommenders.popularity_recommender import PopularityRecommender
+from src.records import EventTable
+
+BOUNDARIES = (1_000, 1_300, 1_600)
+
+
+def _city(seed: int = 0):
+    rng = np.random.default_rng(seed)
+    n_events = 60
+    times = rng.integers(900, 1_700, n_events)
+    times[:9] = np.repeat(BOUNDARIES, 3)           # події рівно на межах вікон
+    events_info = EventTable.from_dict({
+        f"e{i}": {"time": int(t), "lat": 0.0, "lon": 0.0, "description": ""}
+        for i, t in enumerate(times)
+    })
+    # кожна шоста подія без групи
+    event_group = {f"e{i}": f"g{i % 4}" for i in range(n_events) if i % 6}
+    members_events = {
+        f"m{m}": [f"e{i}" for i in rng.choice(n_events, size=rng.integers(1, 10), replace=False)]
+        for m in range(25)
+    }
+    members_events["m0"].append("ghost")            # подія поза events_info
+    return events_info, members_events, event_group
+
+
+def _brute(events_info, members_events, event_group, group, start, end):
+    return sum(
+        1
+        for events in members_events.values()
+        for e_id in events
+        if e_id in events_info
+        and event_group.get(e_id) == group
+        and start <= events_info[e_id].time <= end
+    )
+
+
+@pytest.mark.parametrize(
+    "start, end",
+    [
+        (1_000, 1_300),         # обидві межі — часи подій
+        (1_300, 1_600),
+        (1_001, 1_299),         # межі одразу всередині
+        (1_300, 1_300),         # точка
+        (0, 1_000),             # починається до t0
+        (0, 899),               # закінчується до t0
+        (1_600, 10_000),
+        (1_500, 1_400),         # end < start
+    ],
+)
+def test_window_counts_match_brute_force(start, end):
+    events_info, members_events, event_group = _city()
+    index = PopularityIndex.build(events_info, members_events, event_group)
+    groups = ["g0", "g1", "g2", "g3", None, "unknown"]
+    cols = index.group_cols(groups)
+
+    got = index.rsvps(cols[cols >= 0], start, end)
+
+    expected = [_brute(events_info, members_events, event_group, g, start, end) for g in groups[:4]]
+    assert got.tolist() == expected
+    assert cols[4:].tolist() == [-1, -1]
+
+
+@pytest.mark.parametrize("kind", ["count", "trend"])
+def test_recommender_scores_match_brute_force(kind):
+    events_info, members_events, event_group = _city()
+    catalog = Catalog(events_info, members_events, event_group)
+    start, end = BOUNDARIES[1], BOUNDARIES[2]
+    rec = PopularityRecommender(kind)
+    rec.fit({
+        "popularity": PopularityIndex.build(events_info, members_events, event_group),
+        "catalog": catalog,
+        "window": (start, end),
+    })
+
+    event_idx = np.arange(len(events_info))
+    scores = rec.score_matrix(np.arange(3), event_idx)
+
+    expected = []
+    for e_id in events_info.ids:
+        group = event_group.get(e_id)
+        if group is None:
+            expected.append(0.0)
+            continue
+        recent = _brute(events_info, members_events, event_group, group, start, end)
+        prior = _brute(events_info, members_events, event_group, group, 2 * start - end, start - 1)
+        expected.append(np.log1p(recent) if kind == "count" else np.log((1 + recent) / (1 + prior)))
+    assert scores.shape == (3, len(events_info))
+    np.testing.assert_allclose(scores, np.tile(expected, (3, 1)), rtol=1e-6)
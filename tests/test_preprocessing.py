@@ -0,0 +1,85 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.preprocessing import RsvpIndex, iter_json_object
+
+DOC = {
+    "e1": ["m1", "m2", "m3"],
+    "e2": [],
+    "long_key_with_escapes \"\\\u00e9": {"nested": [1, 2.5, -3e2, None, True, False]},
+    "e3": 1234567890,
+    "e4": "рядок з юнікодом",
+    "e5": ["m2"],
+}
+
+
+def _write(tmp_path, text: str):
+    path = tmp_path / "doc.json"
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("indent", [None, 3])
+def test_every_chunk_boundary_matches_json_load(tmp_path, indent):
+    text = json.dumps(DOC, indent=indent, ensure_ascii=False)
+    path = _write(tmp_path, text)
+
+    # кожен розмір шматка ставить межу в іншому місці ключів / значень
+    for chunk_size in range(1, len(text) + 2):
+        assert dict(iter_json_object(path, chunk_size)) == DOC, chunk_size
+
+
+def test_whitespace_and_commas_at_boundaries(tmp_path):
+    text = ' \n {\t"a" \n:\r\n [1 , 2]  ,\n\n "b"  :  12 ,"c":{"d" : "e"}\n\t}  \n'
+    path = _write(tmp_path, text)
+
+    for chunk_size in range(1, len(text) + 2):
+        assert list(iter_json_object(path, chunk_size)) == list(json.loads(text).items())
+
+
+def test_value_larger_than_chunk(tmp_path):
+    doc = {"big": [f"m{i}" for i in range(5000)], "small": 1, "number": 10 ** 40}
+    path = _write(tmp_path, json.dumps(doc))
+
+    assert dict(iter_json_object(path, chunk_size=16)) == doc
+
+
+def test_empty_missing_and_broken_files(tmp_path):
+    assert list(iter_json_object(_write(tmp_path, " {} "))) == []
+    assert list(iter_json_object(_write(tmp_path, ""))) == []
+    assert list(iter_json_object(tmp_path / "missing.json")) == []
+    for broken in ('{"a": [1, 2}', '{"a" 1}', '{"a": 1', "[1, 2]"):
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_object(_write(tmp_path, broken), chunk_size=4))
+
+
+def test_rsvp_index_matches_json_load(tmp_path):
+    rng = np.random.default_rng(0)
+    rsvps = {
+        f"e{e}": [f"m{m}" for m in rng.choice(50, size=rng.integers(0, 10), replace=False)]
+        for e in range(200)
+    }
+    path = _write(tmp_path, json.dumps(rsvps))
+
+    index = RsvpIndex.from_json(path)
+
+    assert index.event_ids == list(rsvps)
+    assert index.rsvp_counts.tolist() == [len(members) for members in rsvps.values()]
+    for row, (e_id, members) in enumerate(rsvps.items()):
+        got = index.event_members[index.event_ptr[row]:index.event_ptr[row + 1]]
+        assert [index.member_ids[m] for m in got] == members
+    # member → events: ті самі пари, події в порядку файлу
+    expected = {}
+    for e_id, members in rsvps.items():
+        for m_id in members:
+            expected.setdefault(m_id, []).append(e_id)
+    assert dict(index.members_events()) == expected
+
+
+def test_rsvp_index_broken_json_is_empty(tmp_path):
+    index = RsvpIndex.from_json(_write(tmp_path, '{"e1": ["m1"], "e2": ['))
+
+    assert index.event_ids == [] and index.member_ids == []
+    assert len(index.event_members) == 0
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from src.features import FEATURES, make_recommender
+from src.quantize import QuantizedRows, RaggedArray
+from src.recommenders.content_recommender import ContentRecommender
+
+
+def _profiles(seed: int = 0) -> sp.csr_matrix:
+    matrix = sp.random(40, 300, density=0.05, format="csr", random_state=seed, dtype=np.float64)
+    matrix.data[matrix.indptr[3]:matrix.indptr[4]] = 0      # порожній рядок
+    matrix.eliminate_zeros()
+    return matrix
+
+
+def test_float32_is_the_lossless_default():
+    matrix = _profiles()
+    rows = QuantizedRows.from_csr(matrix)
+
+    assert rows.data.dtype == np.float32 and rows.scale is None
+    np.testing.assert_array_equal(rows.rows(np.arange(40)).toarray(), matrix.toarray().astype(np.float32))
+
+
+@pytest.mark.parametrize("dtype, atol", [("float16", 1e-3), ("int8", None)])
+def test_compact_dtypes_stay_within_rounding(dtype, atol):
+    matrix = _profiles()
+    rows = QuantizedRows.from_csr(matrix, dtype)
+    got = rows.rows(np.arange(40)).toarray()
+
+    if atol is None:
+        # int8: похибка не більша за половину кроку (max |x| рядка / 127)
+        atol = np.abs(matrix).max(axis=1).toarray() / 127 / 2 + 1e-7
+    assert np.all(np.abs(got - matrix.toarray()) <= atol)
+    assert rows.nbytes < QuantizedRows.from_csr(matrix).nbytes
+
+
+def test_rows_selects_in_requested_order():
+    matrix = _profiles()
+    rows = QuantizedRows.from_csr(matrix, "int8")
+    picked = np.array([5, 3, 5, 0])
+
+    np.testing.assert_array_equal(
+        rows.rows(picked).toarray(), rows.rows(np.arange(40)).toarray()[picked]
+    )
+    assert rows.rows(np.empty(0, dtype=np.int64)).shape == (0, 300)
+
+
+def test_unknown_dtype_raises():
+    with pytest.raises(ValueError):
+        QuantizedRows.from_csr(_profiles(), "int4")
+
+
+def test_ragged_rows():
+    arrays = [np.ones((2, 2)), np.empty((0, 2)), np.arange(6).reshape(3, 2)]
+    ragged = RaggedArray.from_arrays(arrays, dim=2)
+
+    assert len(ragged) == 3
+    for row, expected in enumerate(arrays):
+        np.testing.assert_array_equal(ragged[row], expected)
+
+
+def test_content_feature_keeps_float32_unless_requested():
+    assert ContentRecommender().profile_dtype == "float32"
+    assert "profile_dtype" not in FEATURES["content"].params
+    int8 = make_recommender("content", {**FEATURES["content"].params, "profile_dtype": "int8"})
+    assert int8.profile_dtype == "int8"
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from src.records import EventTable, MemberTable
+
+WORDS = "python data music hiking chess".split()
+
+
+def _events_dict(seed: int = 0, n_events: int = 40):
+    rng = np.random.default_rng(seed)
+    times = rng.integers(1_000, 2_000, n_events)
+    times[:6] = [1_200, 1_200, 1_500, 1_500, 1_000, 1_999]  # події рівно на межах вікон
+    return {
+        f"e{i}": {
+            "time": int(t),
+            "lat": float(rng.uniform(41.8, 42.0)),
+            "lon": float(rng.uniform(-87.8, -87.6)),
+            # повторювані описи — спільний пул
+            "description": " ".join(rng.choice(WORDS, size=2)),
+        }
+        for i, t in enumerate(times)
+    }
+
+
+def _same(table, events):
+    assert list(table) == list(events)
+    for e_id, info in events.items():
+        record = table[e_id]
+        assert record.time == info["time"] == record["time"]
+        assert record.lat == np.float32(info["lat"]) and record.lon == np.float32(info["lon"])
+        assert record.description == info["description"] == record["description"]
+
+
+def test_from_dict_keeps_every_field():
+    events = _events_dict()
+    table = EventTable.from_dict(events)
+
+    _same(table, events)
+    assert len(table.descriptions) == len({info["description"] for info in events.values()})
+    assert table.texts(["e3", "e0"]) == [events["e3"]["description"], events["e0"]["description"]]
+    with pytest.raises(KeyError):
+        table["e0"]["name"]
+
+
+@pytest.mark.parametrize(
+    "start, end",
+    [
+        (1_200, 1_500),         # обидві межі — часи подій
+        (1_000, 1_999),
+        (1_500, 1_500),         # точка
+        (0, 999),               # порожнє вікно
+        (1_600, 1_300),         # end < start
+    ],
+)
+def test_window_matches_dict_filter(start, end):
+    events = _events_dict()
+    table = EventTable.from_dict(events)
+
+    window = table.window(start, end)
+
+    _same(window, {e_id: info for e_id, info in events.items() if start <= info["time"] <= end})
+    assert window.descriptions is table.descriptions
+
+
+def test_rows_take_and_coords():
+    events = _events_dict()
+    table = EventTable.from_dict(events)
+    ids = ["e7", "e0", "e39", "e7"]
+
+    rows = table.rows(ids)
+
+    assert rows.tolist() == [list(events).index(e_id) for e_id in ids]
+    _same(table.take(rows[:3]), {e_id: events[e_id] for e_id in ids[:3]})
+    np.testing.assert_array_equal(
+        table.coords(rows), np.float32([[events[e]["lat"], events[e]["lon"]] for e in ids])
+    )
+    assert table.rows(["e1", "ghost", "e2"], skip_missing=True).tolist() == [1, 2]
+    with pytest.raises(KeyError):
+        table.rows(["ghost"])
+    assert "e1" in table and "ghost" not in table
+
+
+def test_member_table_matches_dict():
+    members = {f"m{m}": {"lat": 41.8 + m / 100, "lon": -87.7 - m / 100} for m in range(5)}
+    table = MemberTable.from_dict(members)
+
+    assert list(table) == list(members)
+    for m_id, info in members.items():
+        assert table[m_id].lat == np.float32(info["lat"]) == table[m_id]["lat"]
+        assert table[m_id].lon == np.float32(info["lon"])
+    sub = table.take(table.rows(["m4", "m1"]))
+    assert list(sub) == ["m4", "m1"] and sub["m4"].lat == table["m4"].lat
@@ -0,0 +1,44 @@
+import numpy as np
+
+from src.recommenders.location_recommender import LocationRecommender
+from src.recommenders.rff_location_recommender import RFFLocationRecommender
+from tests.test_blocks import _fitted
+
+
+def _errors(repo, sampling: str, sizes) -> list[float]:
+    catalog = repo["catalog"]
+    member_idx = np.arange(len(catalog.member_ids))
+    event_idx = np.arange(len(repo["events_info"]))
+    exact = LocationRecommender(kernel="gaussian", bandwidth="scott")
+    exact.fit(repo)
+    expected = exact.score_matrix(member_idx, event_idx)
+    assert expected.max() > 0
+
+    errors = []
+    for n_components in sizes:
+        rff = RFFLocationRecommender(n_components=n_components, sampling=sampling)
+        rff.fit(repo)
+        scores = rff.score_matrix(member_idx, event_idx)
+        # користувачі без історії — нулі, як і в точному KDE
+        assert not scores[expected.max(axis=1) == 0].any()
+        errors.append(float(np.abs(scores - expected).max() / expected.max()))
+    return errors
+
+
+def test_qmc_features_converge_to_exact_kde():
+    repo, _ = _fitted()
+
+    errors = _errors(repo, "qmc", (16, 64, 256, 1024))
+
+    # похибка спадає з D і на 1024 ознаках < 0.1% від максимуму
+    assert errors == sorted(errors, reverse=True)
+    assert errors[-1] < 1e-3
+
+
+def test_qmc_beats_random_features():
+    repo, _ = _fitted()
+
+    (qmc,) = _errors(repo, "qmc", (256,))
+    (random,) = _errors(repo, "random", (256,))
+
+    assert qmc < random
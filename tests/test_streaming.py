@@ -0,0 +1,114 @@
+from collections import deque
+
+import numpy as np
+import pytest
+
+from src.features import Catalog
+from src.recommenders import grp_freq_recommender, location_recommender
+from src.recommenders.grp_freq_recommender import GroupFrequencyRecommender
+from src.recommenders.location_recommender import LocationRecommender
+from src.records import EventTable, MemberTable
+
+WINDOW = 25
+
+
+def _repo(n_events: int = 80, n_members: int = 20, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    events_info = EventTable.from_dict({
+        f"e{i}": {
+            "time": i,
+            "lat": float(rng.uniform(41.8, 42.0)),
+            "lon": float(rng.uniform(-87.8, -87.6)),
+            "description": "",
+        }
+        for i in range(n_events)
+    })
+    member_ids = [f"m{m}" for m in range(n_members)]
+    members_info = MemberTable(
+        member_ids,
+        rng.uniform(41.8, 42.0, n_members).astype(np.float32),
+        rng.uniform(-87.8, -87.6, n_members).astype(np.float32),
+    )
+    # кожна п'ята подія без групи
+    event_group = {f"e{i}": f"g{i % 4}" for i in range(n_events) if i % 5}
+    # RSVP у порядку часу подій; частина — повторні
+    stream = []
+    for i in range(n_events):
+        for m in rng.choice(n_members, size=rng.integers(0, 5), replace=False):
+            stream.append((f"m{m}", f"e{i}"))
+            if rng.random() < 0.1:
+                stream.append((f"m{m}", f"e{i}"))
+    repo = {
+        "events_info": events_info,
+        "members_info": members_info,
+        "members_events": {},
+        "catalog": Catalog(events_info, member_ids, event_group),
+    }
+    return repo, stream
+
+
+def _stream(rec, repo, stream):
+    """Ковзне вікно WINDOW подій: RSVP старіших подій expire."""
+    time = repo["events_info"].time
+    index = repo["events_info"].index
+    live = deque()
+    for member_id, event_id in stream:
+        now = time[index[event_id]]
+        while live and time[index[live[0][1]]] < now - WINDOW:
+            rec.expire_rsvp(*live.popleft())
+        rec.add_rsvp(member_id, event_id)
+        live.append((member_id, event_id))
+    # RSVP, якого не було, пропускається
+    rec.expire_rsvp("m0", "e0")
+    rec.expire_rsvp("nobody", "e1")
+
+    window = {}
+    for member_id, event_id in live:
+        window.setdefault(member_id, []).append(event_id)
+    return window
+
+
+@pytest.mark.parametrize(
+    "cls, module",
+    [(LocationRecommender, location_recommender), (GroupFrequencyRecommender, grp_freq_recommender)],
+)
+@pytest.mark.parametrize("min_compact", [4096, 1, 7])
+def test_add_then_expire_matches_refit(monkeypatch, cls, module, min_compact):
+    monkeypatch.setattr(module, "_MIN_COMPACT", min_compact)
+    compactions = []
+    original = cls._compact
+    monkeypatch.setattr(cls, "_compact", lambda self: compactions.append(1) or original(self))
+
+    repo, stream = _repo()
+    rec = cls()
+    rec.fit(repo)
+    compactions.clear()
+    window = _stream(rec, repo, stream)
+    if min_compact < 4096:
+        # буфер зливався посеред потоку, а не лише перед оцінюванням
+        assert compactions
+
+    refit = cls()
+    refit.fit({**repo, "members_events": window})
+
+    catalog = repo["catalog"]
+    member_idx = np.arange(len(catalog.member_ids))
+    event_idx = np.arange(len(catalog.events))
+    np.testing.assert_array_equal(
+        rec.score_matrix(member_idx, event_idx), refit.score_matrix(member_idx, event_idx)
+    )
+
+
+def test_fully_expired_member_scores_zero():
+    repo, _ = _repo()
+    catalog = repo["catalog"]
+    for rec in (LocationRecommender(), GroupFrequencyRecommender()):
+        rec.fit(repo)
+        rec.add_rsvp("m1", "e1")
+        rec.add_rsvp("m1", "e2")
+        rec.expire_rsvp("m1", "e1")
+        rec.expire_rsvp("m1", "e2")
+        rec.flush()
+
+        scores = rec.score_matrix(catalog.member_rows(["m1"]), np.arange(len(catalog.events)))
+        assert not scores.any()
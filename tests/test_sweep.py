@@ -0,0 +1,41 @@
+import pytest
+
+from src.sweep import Node, StageGraph
+
+
+def test_shared_nodes_run_once_and_leaves_are_returned():
+    calls = []
+    graph = StageGraph()
+    a = graph.add(("a",), lambda: calls.append("a") or 1)
+    b = graph.add(("b",), lambda x: x + 1, (a,))
+    c = graph.add(("c",), lambda x: x * 10, (a,))
+    assert graph.add(("a",), lambda: calls.append("again") or 2) == a
+    d = graph.add(("d",), lambda x, y: x + y, (b, c))
+
+    assert graph.run(max_workers=2) == {d: 12}
+    assert calls == ["a"]
+
+
+def test_add_rejects_unknown_dependency():
+    graph = StageGraph()
+
+    with pytest.raises(ValueError, match="missing"):
+        graph.add(("x",), lambda dep: dep, (("missing",),))
+    assert graph.nodes == {}
+
+
+@pytest.mark.parametrize(
+    "nodes",
+    [
+        [Node(("x",), lambda dep: dep, (("missing",),))],
+        [Node(("x",), lambda y: y, (("y",),)), Node(("y",), lambda x: x, (("x",),))],
+    ],
+)
+def test_run_raises_instead_of_spinning(nodes):
+    graph = StageGraph()
+    graph.add(("root",), lambda: 0)
+    for node in nodes:
+        graph.nodes[node.key] = node
+
+    with pytest.raises(ValueError, match="stuck"):
+        graph.run(max_workers=1)